@@ -9,16 +9,29 @@ from selenium.webdriver.support import expected_conditions as EC  # Imports expe
 from webdriver_manager.chrome import ChromeDriverManager  # Imports ChromeDriverManager to automatically manage ChromeDriver binaries.
 import time  # Imports the time module for adding delays.
 import re  # Imports the regular expression module for pattern matching.
+import queue  # Imports queue for the pool of idle WebDriver instances.
+import threading  # Imports threading to guard the pool's bookkeeping.
+import atexit  # Imports atexit to shut the shared pool down when the program exits.
+import logging  # Imports logging for the leveled progress messages.
+from concurrent.futures import ThreadPoolExecutor  # Imports the thread pool used for batch lookups.
+from contextlib import contextmanager  # Imports contextmanager to lend drivers out of the pool.
+from functools import lru_cache  # Imports lru_cache so the ChromeDriver binary is resolved only once.
+from link_cache import get_default_cache  # Imports the persistent product name -> links cache.
+from pipeline_metrics import get_metrics, profiled  # Imports the stage timers, counters and profiling hook.
 
-def get_product_links(product_name, max_retries=5):
-    """Search Google for Flipkart product links and extract the first few."""
-    # Define a function to get product links, taking product name and max retries as input.
-    links = []  # Initialize an empty list to store found links.
-    search_query = f"{product_name} site:flipkart.com"  # Constructs the Google search query to specifically search Flipkart.
-    url = f"https://www.google.com/search?q={search_query.replace(' ', '+')}"  # Formats the search query into a Google search URL.
+logger = logging.getLogger(__name__)  # Progress messages; silence with REVIEW_LOG_LEVEL=WARNING.
+metrics = get_metrics()  # Search timings and link counters.
 
-    print(f"Searching Google with query: {search_query}")  # Prints the search query for debugging.
 
+# -------------------- WEBDRIVER POOL --------------------
+
+@lru_cache(maxsize=1)
+def chromedriver_path():
+    """Download/locate the ChromeDriver binary once per process."""
+    return ChromeDriverManager().install()  # Automatically downloads and sets up ChromeDriver.
+
+def chrome_options():
+    """Build the Chrome options used for Google searches."""
     options = Options()  # Initializes an Options object for Chrome browser configuration.
     options.add_argument("--headless=new")  # Configures Chrome to run in headless mode (without a GUI).
     options.add_argument("--no-sandbox")  # Disables the sandbox, often needed in containerized environments.
@@ -29,72 +42,203 @@ def get_product_links(product_name, max_retries=5):
     options.add_argument("--disable-blink-features=AutomationControlled") # Prevents detection as an automated browser.
     options.add_argument("--disable-extensions")  # Disables browser extensions.
     options.add_argument(f"user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/132.0.6834.111 Safari/537.36")  # Sets a custom User-Agent header to mimic a real browser.
+    return options
+
+def create_chrome_driver():
+    """Default driver factory: a new headless Chrome WebDriver."""
+    driver = webdriver.Chrome(  # Creates a new Chrome WebDriver instance.
+        service=Service(chromedriver_path()),  # Reuses the ChromeDriver binary resolved on first use.
+        options=chrome_options()  # Applies the configured options.
+    )
+    driver.set_page_load_timeout(30)  # Sets a timeout for page loading.
+    logger.debug("Chrome WebDriver initialized successfully")  # Confirms WebDriver initialization.
+    metrics.inc('webdrivers_started')
+    return driver
+
+class DriverPool:
+    """Bounded pool of long-lived WebDrivers.
+
+    Drivers are created lazily by `factory` (any callable returning an object with the
+    WebDriver interface, so tests can pass a fake), health-checked before being lent
+    out, and recycled after `max_uses` lookups. Use as a context manager, or call
+    close() when done.
+    """
+
+    def __init__(self, factory=create_chrome_driver, size=2, max_uses=25):
+        self.factory = factory  # Creates a new driver when the pool needs one.
+        self.size = size  # Maximum number of drivers alive at once.
+        self.max_uses = max_uses  # Lookups served before a driver is replaced.
+        self.idle = queue.LifoQueue()  # Idle (driver, uses) pairs; LIFO keeps the warmest driver busy.
+        self.slots = threading.BoundedSemaphore(size)  # One slot per driver that may exist.
+        self.lock = threading.Lock()  # Guards the bookkeeping below.
+        self.drivers = set()  # Every live driver, idle or lent out.
+        self.closed = False
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    @staticmethod
+    def is_healthy(driver):
+        """A driver whose session still answers a trivial command is healthy."""
+        try:
+            driver.current_url  # Round-trip to the browser; raises if the session died.
+            return True
+        except Exception:
+            return False
+
+    def _discard(self, driver):
+        with self.lock:
+            self.drivers.discard(driver)
+        try:
+            driver.quit()  # Closes the browser and quits the WebDriver session.
+            logger.debug("Chrome WebDriver closed successfully")  # Confirms WebDriver closure.
+        except Exception as e:  # Catches errors during driver closure.
+            logger.warning("Error closing driver: %s", e)  # Logs the error message.
+
+    @contextmanager
+    def driver(self):
+        """Lend a healthy driver for the duration of the with-block."""
+        if self.closed:
+            raise RuntimeError("DriverPool is closed")
+        self.slots.acquire()  # Waits until a driver is free or may be created.
+        try:
+            driver, uses = None, 0
+            while driver is None:
+                try:
+                    driver, uses = self.idle.get_nowait()  # Reuses an idle driver when there is one.
+                except queue.Empty:
+                    driver, uses = self.factory(), 0  # Otherwise starts a new one.
+                    with self.lock:
+                        self.drivers.add(driver)
+                    break
+                if not self.is_healthy(driver):  # Dead sessions are replaced instead of lent out.
+                    self._discard(driver)
+                    driver = None
+            broken = False
+            try:
+                yield driver
+            except Exception:
+                broken = not self.is_healthy(driver)  # Failures that killed the session must not be reused.
+                raise
+            finally:
+                uses += 1
+                if broken or self.closed or uses >= self.max_uses:  # Recycles worn-out or broken drivers.
+                    self._discard(driver)
+                else:
+                    self.idle.put((driver, uses))
+        finally:
+            self.slots.release()
+
+    def close(self):
+        """Quit every driver; drivers still lent out are quit when returned."""
+        self.closed = True
+        while True:
+            try:
+                driver, _ = self.idle.get_nowait()
+            except queue.Empty:
+                break
+            self._discard(driver)
+
+
+_default_pool = None  # Shared pool used when callers do not pass their own.
+_default_pool_lock = threading.Lock()
+
+def get_default_pool():
+    """Return the process-wide DriverPool, creating it on first use."""
+    global _default_pool
+    with _default_pool_lock:
+        if _default_pool is None or _default_pool.closed:
+            _default_pool = DriverPool()
+            atexit.register(_default_pool.close)  # Quits the browsers when the program exits.
+        return _default_pool
+
+@profiled('get_product_links')
+def get_product_links(product_name, max_retries=5, pool=None, cache=None, use_cache=True):
+    """Search Google for Flipkart product links and extract the first few."""
+    # Define a function to get product links, taking product name and max retries as input.
+    links = []  # Initialize an empty list to store found links.
+    search_query = f"{product_name} site:flipkart.com"  # Constructs the Google search query to specifically search Flipkart.
+    url = f"https://www.google.com/search?q={search_query.replace(' ', '+')}"  # Formats the search query into a Google search URL.
+
+    if use_cache:  # Answers from the on-disk cache first; a hit never launches a browser.
+        cache = cache or get_default_cache()
+        cached = cache.get(product_name)
+        if cached is not None:
+            logger.info("Using %d cached Flipkart links for: %s", len(cached), product_name)
+            metrics.inc('link_cache_hits')
+            return cached
+
+    logger.info("Searching Google with query: %s", search_query)  # Logs the search query for debugging.
+    metrics.inc('link_searches')
+    search_started = time.perf_counter()
+    pool = pool or get_default_pool()  # Uses the shared long-lived driver pool unless one is given.
 
     for attempt in range(max_retries):  # Loops through a number of retries in case of failure.
-        driver = None  # Initializes driver to None for proper cleanup.
         try:
-            # Initialize ChromeDriver
-            driver = webdriver.Chrome(  # Creates a new Chrome WebDriver instance.
-                service=Service(ChromeDriverManager().install()),  # Automatically downloads and sets up ChromeDriver.
-                options=options  # Applies the configured options.
-            )
-            
-            # Set page load timeout
-            driver.set_page_load_timeout(30)  # Sets a timeout for page loading.
-            print("Chrome WebDriver initialized successfully")  # Confirms WebDriver initialization.
-            
-            # Navigate to Google search URL
-            print(f"Navigating to Google search URL: {url}")  # Prints the URL being navigated to.
-            driver.get(url)  # Opens the Google search URL in the browser.
-            time.sleep(5)  # Pauses execution for 5 seconds to allow content to load.
+            # Borrow a warm ChromeDriver from the pool instead of launching a new browser.
+            with pool.driver() as driver:
+                # Navigate to Google search URL
+                logger.debug("Navigating to Google search URL: %s", url)  # Logs the URL being navigated to.
+                driver.get(url)  # Opens the Google search URL in the browser.
 
-            # Wait for and find search results
-            wait = WebDriverWait(driver, 20)  # Initializes a WebDriverWait with a 20-second timeout.
-            search_results = wait.until(  # Waits until the specified condition is met.
-                EC.presence_of_all_elements_located((By.CSS_SELECTOR, "div.tF2Cxc"))  # Waits for search result elements.
-            )
+                # Wait for and find search results
+                # The explicit wait returns as soon as results are present, so no fixed sleep is needed.
+                wait = WebDriverWait(driver, 20)  # Initializes a WebDriverWait with a 20-second timeout.
+                search_results = wait.until(  # Waits until the specified condition is met.
+                    EC.presence_of_all_elements_located((By.CSS_SELECTOR, "div.tF2Cxc"))  # Waits for search result elements.
+                )
 
-            print(f"Found {len(search_results)} search results")  # Reports the number of search results found.
+                logger.debug("Found %d search results", len(search_results))  # Reports the number of search results found.
 
-            for result in search_results:  # Iterates through each found search result element.
-                try:
-                    link_element = result.find_element(By.CSS_SELECTOR, "a")  # Finds the anchor tag (link) within the result.
-                    link = link_element.get_attribute('href')  # Extracts the 'href' attribute (URL) from the link.
+                for result in search_results:  # Iterates through each found search result element.
+                    try:
+                        link_element = result.find_element(By.CSS_SELECTOR, "a")  # Finds the anchor tag (link) within the result.
+                        link = link_element.get_attribute('href')  # Extracts the 'href' attribute (URL) from the link.
 
-                    # Flipkart URL pattern matching
-                    if re.search(r'flipkart\.com.*?/p/', link) and "google.com" not in link:  # Checks if the link is a valid Flipkart product page.
-                        links.append(link)  # Adds the valid Flipkart link to the list.
-                        print(f"Found valid Flipkart link: {link}")  # Confirms a valid Flipkart link was found.
-                except Exception as e:  # Catches any errors during link extraction for a single result.
-                    print(f"Error extracting link from result: {str(e)}")  # Prints the error message.
-                    continue  # Continues to the next search result.
+                        # Flipkart URL pattern matching
+                        if re.search(r'flipkart\.com.*?/p/', link) and "google.com" not in link:  # Checks if the link is a valid Flipkart product page.
+                            links.append(link)  # Adds the valid Flipkart link to the list.
+                            logger.debug("Found valid Flipkart link: %s", link)  # Confirms a valid Flipkart link was found.
+                    except Exception as e:  # Catches any errors during link extraction for a single result.
+                        logger.warning("Error extracting link from result: %s", e)  # Logs the error message.
+                        continue  # Continues to the next search result.
 
-                if len(links) >= 5:  # Checks if 5 or more links have been found.
-                    break  # Exits the loop if enough links are found.
+                    if len(links) >= 5:  # Checks if 5 or more links have been found.
+                        break  # Exits the loop if enough links are found.
 
             if links:  # Checks if any links were found in the current attempt.
                 break  # Exits the retry loop if links were successfully found.
             
         except Exception as e:  # Catches any general exceptions during the scraping process for an attempt.
-            print(f"Attempt {attempt + 1} failed: {str(e)}")  # Prints the failure message for the current attempt.
+            logger.warning("Attempt %d failed: %s", attempt + 1, e)  # Logs the failure message for the current attempt.
+            metrics.inc('link_search_retries')
             if attempt == max_retries - 1:  # Checks if it's the last retry attempt.
-                print("Failed to fetch product links after maximum retries")  # Informs about total failure.
+                logger.error("Failed to fetch product links after maximum retries")  # Informs about total failure.
+                metrics.inc('link_search_failures')
+                metrics.add_time('link_search', time.perf_counter() - search_started)
                 return []  # Returns an empty list if all retries fail.
             time.sleep(2 * (attempt + 1))  # Adds an increasing delay before the next retry.
-            
-        finally:  # Ensures cleanup code runs regardless of success or failure.
-            if driver:  # Checks if the WebDriver instance was created.
-                try:
-                    driver.quit()  # Closes the browser and quits the WebDriver session.
-                    print("Chrome WebDriver closed successfully")  # Confirms WebDriver closure.
-                except Exception as e:  # Catches errors during driver closure.
-                    print(f"Error closing driver: {str(e)}")  # Prints the error message.
 
-    print(f"\nTotal Flipkart links found: {len(links)}")  # Prints the total number of unique links found.
-    for i, link in enumerate(links, 1):  # Iterates through the found links to print them.
-        print(f"{i}. {link}")  # Prints each found link with its sequential number.
+    metrics.add_time('link_search', time.perf_counter() - search_started)
+    metrics.inc('links_found', len(links))
+    if use_cache:  # Remembers the result, including "no links found" (negative caching).
+        cache.put(product_name, links)
+
+    logger.info("Total Flipkart links found: %d", len(links))  # Logs the total number of unique links found.
+    for i, link in enumerate(links, 1):  # Iterates through the found links to log them.
+        logger.info("%d. %s", i, link)  # Logs each found link with its sequential number.
 
     return links  # Returns the list of extracted Flipkart product links.
 
+def get_product_links_batch(product_names, max_retries=5, pool=None, cache=None, use_cache=True):
+    """Look up many product names concurrently, sharing one pool of drivers."""
+    pool = pool or get_default_pool()  # All lookups share the same bounded set of browsers.
+    with ThreadPoolExecutor(max_workers=pool.size) as executor:  # One worker per driver the pool allows.
+        results = executor.map(lambda name: get_product_links(name, max_retries, pool, cache, use_cache), product_names)
+        return dict(zip(product_names, results))  # Maps each product name to its list of links.
+
  # Prompts user for a product name to search.
 
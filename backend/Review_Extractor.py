@@ -1,31 +1,29 @@
 from datetime import datetime # Imports the datetime module to work with dates and times (e.g., for timestamps).
-import time # Imports the time module for adding delays in execution.
+import logging # Imports logging for the leveled progress messages.
 import re # Imports the regular expression module for pattern matching and text manipulation.
-import random # Imports the random module to generate random numbers (used for random delays).
 import os # Imports the os module for interacting with the operating system (e.g., creating directories).
-import requests # Imports the requests library for making HTTP requests to fetch web page content.
 import pandas as pd # Imports the pandas library, commonly used for data manipulation and analysis, especially with DataFrames.
 from bs4 import BeautifulSoup # Imports BeautifulSoup for parsing HTML and XML documents.
-import nltk # Imports the Natural Language Toolkit (NLTK) for various NLP operations.
-from nltk.corpus import stopwords # Imports stopwords from NLTK, common words to be filtered out.
-from nltk.stem import WordNetLemmatizer # Imports WordNetLemmatizer from NLTK for lemmatization.
-from nltk.tokenize import sent_tokenize # Imports sent_tokenize from NLTK for splitting text into sentences.
+import nlp_resources # Imports the shared, lazily loaded NLTK resources and text cleaning.
 from Link_Extractor import get_product_links # Imports the get_product_links function from your custom linkExtractor module.
+from http_session import get_session # Imports the shared pooled HTTP session (keep-alive, compression, retries, timeouts).
+from review_parser import extract_reviews_from_soup, get_parser, parse_reviews # Imports the selector-compiled review parser backends.
+from page_fetcher import fetch_pages, iter_pages # Imports the concurrent, rate-limited page fetch engine.
+from review_watermarks import ReviewWatermark # Imports the per-product record of already-stored reviews.
+from review_storage import REVIEWS_DIR, STORAGE_ENV, get_storage # Imports the CSV/Parquet storage backends.
+from review_dedupe import ReviewSetDeduper # Imports the cross-link review set and content-hash dedupe.
+from pipeline_metrics import export_metrics, get_metrics, profiled, setup_logging # Imports the stage timers, counters and profiling hook.
 
-# Download necessary NLTK datasets
-# These lines ensure that the required NLTK data (stopwords, WordNet, and tokenizers)
-# are available for the text preprocessing steps. They will download if not already present.
-nltk.download('stopwords')
-nltk.download('wordnet')
-nltk.download('punkt')
-
-# Headers to avoid request blocking
-headers = {
-    # This dictionary defines HTTP headers to be sent with requests.
-    # A User-Agent header makes the request appear as if it's coming from a web browser,
-    # which can help in bypassing some basic bot detection mechanisms.
-    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-}
+logger = logging.getLogger(__name__) # Progress messages; silence with REVIEW_LOG_LEVEL=WARNING.
+metrics = get_metrics() # Stage timers and counters (pages, reviews, dropped rows).
+
+# NLTK data (stopwords and WordNet) is loaded by nlp_resources on first use and only
+# downloaded when it is missing; set REVIEW_NLP_OFFLINE=1 to fail fast instead.
+
+# Raw scraped reviews are saved in review_storage.REVIEWS_DIR (data/reviews), where
+# combine_preprocess_reviews reads them.
+# Per-product watermarks (fingerprints of stored reviews) used by incremental mode.
+WATERMARKS_DIR = os.path.join(REVIEWS_DIR, ".watermarks")
 
 # -------------------- REVIEW EXTRACTION --------------------
 def modify_reviews_url(reviews_url):
@@ -36,131 +34,129 @@ def modify_reviews_url(reviews_url):
 
 def get_reviews_from_page(html):
     """Extract reviews from a single Flipkart page."""
-    reviews_data = [] # Initializes an empty list to store dictionaries of extracted review data.
-    # Finds all HTML div elements with the class 'cPHDOP'. This class is assumed to be
-    # the container for individual reviews on Flipkart's review pages.
-    review_containers = html.find_all('div', {'class': 'cPHDOP'})
-    
-    for container in review_containers: # Loops through each identified review container.
-        try:
-            # Extract rating
-            # Attempts to find a div with specific classes for the rating.
-            rating_div = container.find('div', {'class': 'XQDdHH Ga3i8K'})
-            # Extracts the text content of the rating div, strips whitespace,
-            # and defaults to 'N/A' if not found.
-            rating = rating_div.text.strip() if rating_div else 'N/A'
-            
-            # Extract review title
-            # Finds a paragraph tag with the class 'z9E0IG' for the review title.
-            title_div = container.find('p', {'class': 'z9E0IG'})
-            # Extracts and cleans the title text.
-            title = title_div.text.strip() if title_div else 'N/A'
-            
-            # Extract review text
-            # Finds a div with class 'ZmyHeo' for the main review text.
-            review_div = container.find('div', {'class': 'ZmyHeo'})
-            # Extracts the text from the first child div within review_div, cleans it.
-            review_text = review_div.find('div').text.strip() if review_div and review_div.find('div') else 'N/A'
-            
-            # Extract reviewer name
-            # Finds a paragraph tag with specific classes for the reviewer's name.
-            name_div = container.find('p', {'class': '_2NsDsF AwS1CA'})
-            # Extracts and cleans the name text.
-            name = name_div.text.strip() if name_div else 'N/A'
-            
-            # Extract review date
-            # Finds a paragraph tag with class '_2NsDsF' for the review date.
-            # It also checks to ensure it's not the same element as the name_div.
-            date_div = container.find('p', {'class': '_2NsDsF'})
-            date = date_div.text.strip() if date_div and not date_div.get('class') == '_2NsDsF AwS1CA' else 'N/A'
-            
-            # Extract certified buyer status
-            # Finds a paragraph tag with class 'MztJPv' to check for "Certified Buyer".
-            certified_div = container.find('p', {'class': 'MztJPv'})
-            # Sets 'Yes' or 'No' based on whether "Certified Buyer" text is present.
-            is_certified = 'Yes' if certified_div and 'Certified Buyer' in certified_div.text else 'No'
-            
-            # Get helpful votes
-            # Finds a span tag with class 'tl9VpF' for helpful votes.
-            helpful_div = container.find('span', {'class': 'tl9VpF'})
-            # Extracts and cleans the helpful vote count, defaults to '0'.
-            helpful_count = helpful_div.text.strip() if helpful_div else '0'
-            
-            # Appends a dictionary containing all extracted review details to the reviews_data list.
-            reviews_data.append({
-                'Name': name,
-                'Rating': rating,
-                'Title': title,
-                'Description': review_text,
-                'Date': date,
-                'Certified_Buyer': is_certified,
-                'Helpful_Votes': helpful_count
-            })
-            
-        except Exception as e: # Catches any exception that occurs during the extraction of a single review.
-            print(f"Error processing review: {e}") # Prints the error message.
-            continue # Continues to the next review container.
-    
-    return reviews_data # Returns the list of extracted review dictionaries.
-
-def get_reviews(base_url, max_pages=10):
+    # Reference implementation on a BeautifulSoup document. The class selectors it uses
+    # are declared once in review_parser, which also provides the faster lxml backends
+    # that get_reviews uses by default.
+    return extract_reviews_from_soup(html)
+
+def review_page_fetcher(parser=None):
+    """Build the fetch_page(page_url, page) callback page_fetcher uses to scrape one review page."""
+
+    def fetch_page(page_url, page):
+        logger.debug("Fetching reviews from page %d", page) # Logs the current page being fetched.
+
+        # Makes an HTTP GET request through the shared session (pooled connection, retries on 429/5xx).
+        response = get_session().get(page_url)
+        if response.status_code != 200: # Checks if the HTTP request was successful (status code 200).
+            logger.warning("Failed to fetch page %d. Status code: %d", page, response.status_code) # Logs an error if fetching fails.
+            metrics.inc('pages_failed')
+            return None # Ends the listing if a page cannot be fetched.
+
+        logger.debug("Page HTML length: %d", len(response.content))  # Debug info: the size of the HTML content.
+        metrics.inc('pages_fetched')
+        metrics.inc('page_bytes', len(response.content))
+
+        # Get reviews from current page
+        # Parses the page with the selected review_parser backend ('lxml' by default, 'bs4' is the reference).
+        with metrics.timer('parse'):
+            page_reviews = parse_reviews(response.content, parser)
+        metrics.inc('reviews_scraped', len(page_reviews))
+
+        if not page_reviews: # Checks if no reviews were found on the current page.
+            logger.debug("No reviews found on page %d", page) # Logs a message if no reviews are found (suggests end of reviews).
+        else:
+            logger.debug("Successfully scraped %d reviews from page %d", len(page_reviews), page) # Confirms successful scraping for the page.
+            metrics.inc('pages_with_reviews') # Unlike pages_fetched, leaves out the empty page(s) past the end.
+        return page_reviews
+
+    return fetch_page
+
+def get_reviews(base_url, max_pages=10, parser=None, rate=None, burst=None, max_concurrency=None,
+                stop_when=None, start_page=1):
     """Extract reviews from multiple pages."""
-    all_reviews = [] # Initializes an empty list to store reviews from all pages.
-    page = 1 # Starts page counter at 1.
-    
-    while page <= max_pages: # Loops as long as the current page is within the maximum allowed pages.
-        try:
-            # Construct page URL
-            # Builds the URL for the current page, appending '&page={page}' for subsequent pages.
-            page_url = f"{base_url}&page={page}" if page > 1 else base_url
-                
-            print(f"Fetching reviews from page {page}") # Prints the current page being fetched.
-            
-            # Makes an HTTP GET request to the page URL with the defined headers.
-            response = requests.get(page_url, headers=headers)
-            if response.status_code != 200: # Checks if the HTTP request was successful (status code 200).
-                print(f"Failed to fetch page {page}. Status code: {response.status_code}") # Prints an error if fetching fails.
-                break # Exits the loop if a page cannot be fetched.
-                
-            # Parses the content of the fetched page using BeautifulSoup.
-            soup = BeautifulSoup(response.content, 'html.parser')
-            print(f"Page HTML length: {len(response.content)}")  # Debug info: prints the size of the HTML content.
-            
-            # Get reviews from current page
-            page_reviews = get_reviews_from_page(soup) # Calls the helper function to extract reviews from the current page's HTML.
-            
-            if not page_reviews: # Checks if no reviews were found on the current page.
-                print(f"No reviews found on page {page}") # Prints a message if no reviews are found.
-                break # Exits the loop if no reviews are found (suggests end of reviews).
-                
-            all_reviews.extend(page_reviews) # Adds the reviews from the current page to the overall list.
-            print(f"Successfully scraped {len(page_reviews)} reviews from page {page}") # Confirms successful scraping for the page.
-            
-            # Random delay to avoid being blocked
-            time.sleep(random.uniform(2, 4)) # Pauses execution for a random duration to avoid triggering bot detection.
-            page += 1 # Increments the page counter.
-            
-        except Exception as e: # Catches any general exception during the page processing.
-            print(f"Error processing page {page}: {e}") # Prints the error message.
-            break # Exits the loop on error.
-    
-    return all_reviews # Returns the list of all extracted reviews.
-
+    # Pages 1..max_pages are fetched concurrently by page_fetcher, which enforces the
+    # per-host rate limit and concurrency cap (replacing the old fixed 2-4 s sleep after
+    # every page), stops at the first empty page and returns the reviews in page order.
+    # `stop_when(page_reviews)` ends the scrape early, e.g. at the first page of already-seen reviews.
+    # `start_page` skips the pages before it (e.g. when page 1 was already fetched).
+    # `rate`, `burst` and `max_concurrency` change the host's shared limits; None keeps them.
+
+    # Returns the list of all extracted reviews, in page order.
+    return fetch_pages(base_url, max_pages, review_page_fetcher(parser), rate=rate, burst=burst,
+                       max_concurrency=max_concurrency, stop_when=stop_when, start_page=start_page)
+
+def iter_review_pages(base_url, max_pages=10, parser=None, rate=None, burst=None,
+                      max_concurrency=None, stop_when=None, start_page=1, prefetch=None):
+    """Generator version of get_reviews: yields each page's list of reviews as soon as it is parsed."""
+    # Same pages, limits and stop rules as get_reviews, but nothing is accumulated: only
+    # the pages fetched ahead of the consumer (`prefetch`, see page_fetcher.iter_pages)
+    # are held in memory, and a consumer that stops early stops the scrape.
+    for _, page_reviews in iter_pages(base_url, max_pages, review_page_fetcher(parser), rate=rate, burst=burst,
+                                      max_concurrency=max_concurrency, stop_when=stop_when, start_page=start_page,
+                                      prefetch=prefetch):
+        yield page_reviews
+
+def iter_reviews(base_url, max_pages=10, **kwargs):
+    """Generator version of get_reviews yielding review dicts one at a time, in page order."""
+    for page_reviews in iter_review_pages(base_url, max_pages, **kwargs):
+        yield from page_reviews
+
+def iter_reviews_from_page(content):
+    """Generator version of get_reviews_from_page for a page's HTML (bytes or str).
+
+    Reviews come out of the streaming parser as each container closes, so a consumer
+    can start on the first review before the rest of the page is parsed.
+    """
+    yield from get_parser('stream').iter_parse(content)
+
+def get_reviews_for_links(links, max_pages=10, incremental=False, stop_when=None, deduper=None, **limits):
+    """Extract the reviews of several links to one product, fetching each distinct review set once."""
+    # Variants of a product (colour, storage) share one review set. Links with an already
+    # scraped listing id are skipped without a request; the others fetch page 1 first and
+    # are skipped when it matches the page 1 of an earlier link. Reviews already collected
+    # from another link are dropped by content hash as each link's pages arrive.
+    deduper = deduper or ReviewSetDeduper()
+    all_reviews = []
+    for link in links:
+        if not deduper.claim_listing(link): # Same listing id as an earlier link.
+            logger.info("Skipping %s: same listing as an earlier link", link)
+            continue
+        url = modify_reviews_url(link) # Converts the product link to its reviews URL.
+        if incremental: # Newest first, stopping at the first page that holds only stored reviews.
+            url = incremental_reviews_url(url)
+        logger.info("Extracting reviews from: %s", url) # Logs the URL being scraped.
+
+        first_page = get_reviews(url, 1, stop_when=stop_when, **limits)
+        if not first_page: # No reviews (or nothing new) behind this link.
+            continue
+        if not deduper.claim_first_page(first_page): # Same reviews as an earlier link.
+            logger.info("Skipping %s: same reviews as an earlier link", link)
+            continue
+        product_reviews = first_page + get_reviews(url, max_pages, stop_when=stop_when, start_page=2, **limits)
+        all_reviews.extend(deduper.new_reviews(product_reviews)) # Streams out reviews already kept.
+
+    if deduper.skipped_links or deduper.duplicates:
+        logger.info("Skipped %d duplicate links and %d duplicate reviews", deduper.skipped_links, deduper.duplicates)
+        metrics.inc('links_skipped', deduper.skipped_links)
+        metrics.inc('reviews_duplicate', deduper.duplicates)
+    return all_reviews
+
+@metrics.timed('product_details')
 def get_product_details(product_url):
     """Extract product price and image from Flipkart."""
 
     # Checks if the provided URL is a valid string and starts with 'http'.
     if not isinstance(product_url, str) or not product_url.startswith('http'):
-        print(f"Invalid product URL: {product_url}") # Prints an error for invalid URL.
+        logger.warning("Invalid product URL: %s", product_url) # Logs an error for invalid URL.
         return "N/A", "N/A" # Returns 'N/A' for price and image if URL is invalid.
     
-    print(f"\nFetching product details from: {product_url}") # Prints the URL for product details.
+    logger.info("Fetching product details from: %s", product_url) # Logs the URL for product details.
     
     try:
-        # Makes an HTTP GET request to the product URL.
-        response = requests.get(product_url, headers=headers)
+        # Makes an HTTP GET request to the product URL through the shared session.
+        response = get_session().get(product_url)
         if response.status_code != 200: # Checks for successful HTTP response.
-            print(f"Failed to fetch product page. Status code: {response.status_code}") # Prints error if page fetch fails.
+            logger.warning("Failed to fetch product page. Status code: %d", response.status_code) # Logs error if page fetch fails.
             return "N/A", "N/A" # Returns 'N/A' if page cannot be fetched.
         
         # Parses the product page HTML.
@@ -173,7 +169,7 @@ def get_product_details(product_url):
             # Extracts and cleans the price text, defaults to "N/A".
             price = price_div.text.strip() if price_div else "N/A"
         except Exception as e: # Catches errors during price extraction.
-            print(f"Error extracting price: {e}") # Prints the error.
+            logger.warning("Error extracting price: %s", e) # Logs the error.
             price = "N/A" # Sets price to "N/A" on error.
 
         # Extract product image with better error handling
@@ -183,101 +179,170 @@ def get_product_details(product_url):
             # Extracts the 'src' attribute (image URL), defaults to "N/A".
             image_url = img_tag['src'] if img_tag else "N/A"
         except Exception as e: # Catches errors during image extraction.
-            print(f"Error extracting image: {e}") # Prints the error.
+            logger.warning("Error extracting image: %s", e) # Logs the error.
             image_url = "N/A" # Sets image_url to "N/A" on error.
         
         return price, image_url # Returns the extracted price and image URL.
 
     except Exception as e: # Catches any general exception during product details fetching.
-        print(f"Error fetching product details: {e}") # Prints the error.
+        logger.warning("Error fetching product details: %s", e) # Logs the error.
         return "N/A", "N/A" # Returns 'N/A' for both on general error.
 
 # -------------------- PREPROCESSING --------------------
 
 def clean_text(text):
     """Clean the review text."""
-    text = re.sub(r'<[^>]+>', '', text)  # Removes HTML tags from the text.
-    text = re.sub(r'READ MORE', '', text, flags=re.IGNORECASE)  # Removes "READ MORE" (case-insensitive).
-    text = re.sub(r'[^a-zA-Z0-9\s.,!?]', '', text)  # Removes special characters, keeping letters, numbers, spaces, and basic punctuation.
-    text = ' '.join(text.split())  # Normalizes whitespace (replaces multiple spaces with single, removes leading/trailing).
-    return text.strip() # Returns the cleaned text.
+    # Removes HTML tags and "READ MORE", keeps letters, numbers, whitespace and basic punctuation,
+    # and normalizes whitespace (shared implementation in nlp_resources).
+    return nlp_resources.clean_text(text)
 
 def remove_stopwords(text):
     """Remove stopwords from text."""
-    stop_words = set(stopwords.words('english')) # Loads a set of English stopwords for efficient lookup.
-    # Splits the text into words and reconstructs it, excluding any words found in the stop_words set.
-    return ' '.join(word for word in text.split() if word.lower() not in stop_words)
+    return nlp_resources.remove_stopwords(text) # Uses the stopword set loaded once per process.
 
 def lemmatize_text(text):
     """Lemmatize words in text."""
-    lemmatizer = WordNetLemmatizer() # Initializes the WordNetLemmatizer.
-    # Splits the text into words, lemmatizes each word (reduces to base form), and joins them back.
-    return ' '.join(lemmatizer.lemmatize(word) for word in text.split())
-
+    return nlp_resources.lemmatize_text(text) # Uses the lemmatizer created once per process.
+
+def preprocess_review(review):
+    """Preprocess one review description; returns None when fewer than 3 words remain."""
+    cleaned = clean_text(review) # Applies the clean_text function.
+    processed_review = nlp_resources.remove_stopwords_and_lemmatize(cleaned) # Applies stopword removal and lemmatization (cached per token).
+    if len(processed_review.split()) >= 3:  # Keep only meaningful reviews
+        return processed_review
+    return None # Filters out very short or empty reviews.
+
+def preprocess_batch(reviews):
+    """preprocess_review over a page or list of reviews, aligned with the input (None for too-short reviews).
+
+    The clean and lemmatize stages are timed once per batch: per-review timer calls cost
+    more than cleaning a short review.
+    """
+    with metrics.timer('clean'):
+        cleaned = [clean_text(review) for review in reviews]
+    with metrics.timer('lemmatize'):
+        processed = [nlp_resources.remove_stopwords_and_lemmatize(text) for text in cleaned]
+    processed = [text if len(text.split()) >= 3 else None for text in processed]
+    metrics.inc('reviews_too_short', processed.count(None))
+    return processed
+
+@profiled('preprocess_reviews')
 def preprocess_reviews(reviews):
     """Apply preprocessing pipeline to reviews."""
-    processed_reviews = [] # Initializes an empty list for processed reviews.
-    for review in reviews: # Iterates through each raw review description.
-        # Clean text
-        cleaned = clean_text(review) # Applies the clean_text function.
-        # Remove stopwords & lemmatize
-        processed_review = lemmatize_text(remove_stopwords(cleaned)) # Applies stopword removal and lemmatization.
-        if len(processed_review.split()) >= 3:  # Keep only meaningful reviews
-            # Only adds the processed review if it has at least 3 words, filtering out very short or empty reviews.
-            processed_reviews.append(processed_review)
-    
-    return processed_reviews # Returns the list of processed reviews.
+    # Only keeps reviews with at least 3 words, filtering out very short or empty reviews.
+    return [processed_review for processed_review in preprocess_batch(reviews) if processed_review is not None]
+
+# -------------------- INCREMENTAL MODE --------------------
+
+def incremental_reviews_url(url):
+    """Ask Flipkart for the newest reviews first so already-stored reviews are reached early."""
+    return f"{url}{'&' if '?' in url else '?'}sortOrder=MOST_RECENT"
+
+def incremental_reviews_path(product_key):
+    """Where save_new_reviews stores a product's reviews: its growing CSV, or its Parquet partition."""
+    if os.environ.get(STORAGE_ENV, 'csv') == 'parquet':
+        return get_storage('parquet', REVIEWS_DIR).partition(product_key)
+    return os.path.join(REVIEWS_DIR, f"{product_key}_flipkart_reviews.csv")
+
+def save_new_reviews(product_key, reviews, watermark):
+    """Append only reviews not stored before to the product's raw reviews and advance its watermark.
+
+    With REVIEW_STORAGE=parquet they are added to the product's partition of the
+    Parquet dataset (as save_raw_reviews writes), otherwise appended to its CSV.
+    """
+    os.makedirs(REVIEWS_DIR, exist_ok=True) # Creates the reviews directory if it doesn't exist.
+    df_reviews = pd.DataFrame(watermark.new_reviews(reviews), columns=list(reviews[0].keys()) if reviews else None)
+    df_reviews = df_reviews.replace("N/A", pd.NA).dropna() # Same filtering as a full scrape.
+
+    with metrics.timer('save'):
+        if os.environ.get(STORAGE_ENV, 'csv') == 'parquet':
+            # Parquet files cannot grow: each run with new reviews adds a file to the partition.
+            raw_filename = incremental_reviews_path(product_key)
+            if len(df_reviews):
+                raw_filename = get_storage('parquet', REVIEWS_DIR).write_reviews(product_key, df_reviews)
+        else:
+            # One stable file per product that grows over time, instead of a new timestamped copy per run.
+            raw_filename = incremental_reviews_path(product_key)
+            df_reviews.to_csv(raw_filename, mode='a', header=not os.path.exists(raw_filename), index=False)
+    metrics.inc('reviews_saved', len(df_reviews))
+    logger.info("Appended %d new reviews to %s", len(df_reviews), raw_filename) # Confirms saving.
+
+    watermark.add(df_reviews.to_dict('records')) # Remembers what is now stored.
+    watermark.save()
+    return df_reviews
 
 # -------------------- MAIN FUNCTION --------------------
 
-def extractReviews(name, max_pages=15):
-    """Extract Flipkart reviews and product price."""
+@metrics.timed('save')
+def save_raw_reviews(df_reviews, product, raw_filename):
+    # Saves a scrape's raw reviews: to raw_filename as before, or with REVIEW_STORAGE=parquet
+    # into the product's partition of the Parquet dataset. Returns where they were written.
+    metrics.inc('reviews_saved', len(df_reviews))
+    if os.environ.get(STORAGE_ENV, 'csv') == 'parquet':
+        return get_storage('parquet', REVIEWS_DIR).write_reviews(product, df_reviews)
+    df_reviews.to_csv(raw_filename, index=False)
+    return raw_filename
+
+@profiled('extractReviews')
+def extractReviews(name, max_pages=15, incremental=False):
+    """Extract Flipkart reviews and product price.
+
+    With `incremental=True` only reviews newer than the ones already stored for this
+    product are fetched (scraping stops at the first page of known reviews) and they
+    are appended to the product's CSV instead of writing a new timestamped file.
+    """
     links = get_product_links(name) # Calls linkExtractor to get Flipkart product links for the given name.
     
     if not links: # Checks if no product links were found.
-        print("No product links found!") # Prints a message.
+        logger.warning("No product links found!") # Logs a message.
+        export_metrics('extract')
         return [], "N/A", "N/A" # Returns empty lists/N/A if no links.
 
-    all_reviews = [] # Initializes a list to accumulate all reviews.
-    
+    watermark = None
+    if incremental: # Loads the fingerprints of the reviews stored by earlier runs.
+        product_key = sanitize_filename(name)
+        watermark = ReviewWatermark.for_product(WATERMARKS_DIR, product_key)
+
     # Iterate through each product link
-    # The original comment says "Only process first link to avoid duplicates", but the loop iterates.
-    # However, `get_reviews` is called inside the loop. If `get_product_links` returns multiple links
-    # for the same product, this might lead to duplicate reviews.
-    for link in links:
-        url = modify_reviews_url(link) # Converts the product link to its reviews URL.
-        print(f"\nExtracting reviews from: {url}") # Prints the URL being scraped.
-    
-        # Get reviews
-        product_reviews = get_reviews(url, max_pages) # Calls get_reviews to scrape reviews from the current URL.
-        if product_reviews: # If reviews are found for this URL.
-            all_reviews.extend(product_reviews) # Adds them to the overall list.
+    # get_product_links often returns variants of the same product that share one review set;
+    # get_reviews_for_links fetches each distinct set once and drops duplicate reviews.
+    all_reviews = get_reviews_for_links(links, max_pages, incremental,
+                                        stop_when=watermark.page_is_known if incremental else None)
 
     if not all_reviews: # Checks if no reviews were collected after processing all links.
-        print("No reviews found!") # Prints a message.
+        logger.warning("No reviews found!") # Logs a message.
+        export_metrics('extract')
         return [], "N/A", "N/A" # Returns empty lists/N/A.
-    
-    # Save raw reviews
-    save_dir = "C:/Users/eapen/OneDrive/Desktop/automated-review-rating-system/data/reviews"
-    os.makedirs(save_dir, exist_ok=True)
-
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    raw_filename = os.path.join(save_dir, f"{name}_flipkart_reviews{timestamp}.csv")
-    df_reviews = pd.DataFrame(all_reviews)
-    df_reviews = df_reviews.replace("N/A", pd.NA)
-    df_reviews=df_reviews.dropna() # Drops any rows with NaN values in the DataFrame.
-    df_reviews = df_reviews.drop_duplicates() 
-    df_reviews.to_csv(raw_filename, index=False) # Saves the collected reviews to a CSV file.
-    print(f"\nSaved {len(all_reviews)} raw reviews to {raw_filename}") # Confirms saving.
+
+    if incremental: # Appends only the new reviews; raw_reviews below then holds just those.
+        df_reviews = save_new_reviews(product_key, all_reviews, watermark)
+        all_reviews = df_reviews.to_dict('records')
+    else:
+        # Save raw reviews
+        save_dir = REVIEWS_DIR
+        os.makedirs(save_dir, exist_ok=True)
+
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        raw_filename = os.path.join(save_dir, f"{name}_flipkart_reviews{timestamp}.csv")
+        df_reviews = pd.DataFrame(all_reviews)
+        df_reviews = df_reviews.replace("N/A", pd.NA)
+        df_reviews=df_reviews.dropna() # Drops any rows with NaN values in the DataFrame.
+        df_reviews = df_reviews.drop_duplicates() 
+        metrics.inc('reviews_dropped', len(all_reviews) - len(df_reviews)) # Incomplete or duplicate rows.
+        raw_filename = save_raw_reviews(df_reviews, name, raw_filename) # Saves the collected reviews (CSV file by default).
+        logger.info("Saved %d raw reviews to %s", len(all_reviews), raw_filename) # Confirms saving.
 
     # Preprocess review descriptions
     # Extracts the 'Description' column from the DataFrame and preprocesses it.
-    processed_reviews = preprocess_reviews(df_reviews['Description'].tolist())
+    with metrics.timer('preprocess'):
+        processed_reviews = preprocess_reviews(df_reviews['Description'].tolist())
 
     # Fetch product details from the first valid product link
     # Gets price and image URL from the first link found by linkExtractor.
     price, image_url = get_product_details(links[0])
 
+    metrics.log_summary(logger, logging.DEBUG)
+    export_metrics('extract')
     # Returns a dictionary containing raw reviews, processed reviews, price, and image URL.
     return {
         'raw_reviews': all_reviews,
@@ -291,9 +356,11 @@ def sanitize_filename(filename):
     sanitized = re.sub(r'[^a-zA-Z0-9_-]', '_', filename)
     return sanitized[:100]  # Truncates the filename to 100 characters to avoid path issues.
 
-def extractReviewsFromLink(link, max_pages=15):
+@profiled('extractReviewsFromLink')
+def extractReviewsFromLink(link, max_pages=15, incremental=False):
     # This function is similar to extractReviews but takes a direct product link
     # instead of a product name that needs to be searched via Google.
+    # `incremental` works as in extractReviews, keyed by the link's last path segment.
     sanitized_link = sanitize_filename(link) # Sanitizes the full link for use in filename.
 
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S") # Generates a timestamp.
@@ -303,37 +370,51 @@ def extractReviewsFromLink(link, max_pages=15):
     all_reviews = [] # Initializes list for all reviews.
     
     url = modify_reviews_url(link) # Converts the product link to its reviews URL.
-    print(f"\nExtracting reviews from: {url}") # Prints the URL being scraped.
+    logger.info("Extracting reviews from: %s", url) # Logs the URL being scraped.
     
     # Get reviews
-    product_reviews = get_reviews(url, max_pages) # Scrapes reviews from the URL.
+    if incremental: # Newest first, stopping at the first page that holds only stored reviews.
+        product_key = sanitize_filename(link.split("/")[-1])
+        watermark = ReviewWatermark.for_product(WATERMARKS_DIR, product_key)
+        product_reviews = get_reviews(incremental_reviews_url(url), max_pages, stop_when=watermark.page_is_known)
+    else:
+        product_reviews = get_reviews(url, max_pages) # Scrapes reviews from the URL.
     if product_reviews: # If reviews are found.
         all_reviews.extend(product_reviews) # Adds them to the list.
 
     if not all_reviews: # Checks if no reviews were found.
-        print("No reviews found!") # Prints a message.
+        logger.warning("No reviews found!") # Logs a message.
+        export_metrics('extract')
         return [], "N/A", "N/A" # Returns empty lists/N/A.
-    
-    # Save raw reviews
-    save_dir = "C:/Users/eapen/OneDrive/Desktop/automated-review-rating-system/data/reviews" # Directory to save reviews.
-    os.makedirs(save_dir, exist_ok=True) # Creates the 'reviews' directory if it doesn't exist.  
-
-    sanitized_link = sanitize_filename(link.split("/")[-1])
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    raw_filename = os.path.join(save_dir, f"{sanitized_link}_flipkart_reviews{timestamp}.csv")
-    df_reviews = pd.DataFrame(all_reviews)
-    df_reviews = df_reviews.replace("N/A", pd.NA) # Replaces "N/A" strings with pandas' NA.
-    df_reviews=df_reviews.dropna() # Drops any rows with NaN values in the DataFrame.
-    df_reviews = df_reviews.drop_duplicates() # Removes duplicate reviews based on all columns
-    df_reviews.to_csv(raw_filename, index=False)
-    print(f"\nSaved {len(all_reviews)} raw reviews to {raw_filename}") # Confirms saving.
+
+    if incremental: # Appends only the new reviews; raw_reviews below then holds just those.
+        df_reviews = save_new_reviews(product_key, all_reviews, watermark)
+        all_reviews = df_reviews.to_dict('records')
+    else:
+        # Save raw reviews
+        save_dir = REVIEWS_DIR # Directory to save reviews.
+        os.makedirs(save_dir, exist_ok=True) # Creates the 'reviews' directory if it doesn't exist.  
+
+        sanitized_link = sanitize_filename(link.split("/")[-1])
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        raw_filename = os.path.join(save_dir, f"{sanitized_link}_flipkart_reviews{timestamp}.csv")
+        df_reviews = pd.DataFrame(all_reviews)
+        df_reviews = df_reviews.replace("N/A", pd.NA) # Replaces "N/A" strings with pandas' NA.
+        df_reviews=df_reviews.dropna() # Drops any rows with NaN values in the DataFrame.
+        df_reviews = df_reviews.drop_duplicates() # Removes duplicate reviews based on all columns
+        metrics.inc('reviews_dropped', len(all_reviews) - len(df_reviews)) # Incomplete or duplicate rows.
+        raw_filename = save_raw_reviews(df_reviews, sanitized_link, raw_filename)
+        logger.info("Saved %d raw reviews to %s", len(all_reviews), raw_filename) # Confirms saving.
 
     # Preprocess review descriptions
-    processed_reviews = preprocess_reviews(df_reviews['Description'].tolist()) # Preprocesses review descriptions.
+    with metrics.timer('preprocess'):
+        processed_reviews = preprocess_reviews(df_reviews['Description'].tolist()) # Preprocesses review descriptions.
 
     # Fetch product details from the link
     price, image_url = get_product_details(link) # Gets price and image URL directly from the provided link.
 
+    metrics.log_summary(logger, logging.DEBUG)
+    export_metrics('extract')
     # Returns a dictionary with raw reviews, processed reviews, price, and image URL.
     return {
         'raw_reviews': all_reviews,
@@ -344,6 +425,7 @@ def extractReviewsFromLink(link, max_pages=15):
 
 if __name__ == "__main__":
     # Top-level function call to begin the review extraction process
+    setup_logging()
     product_name = input("Enter the product name to search on Flipkart: ")
     
     # Step-by-step call hierarchy:
@@ -352,6 +434,7 @@ if __name__ == "__main__":
     # extractReviews → get_product_details
     
     result = extractReviews(product_name, max_pages=10)
+    metrics.log_summary(logger)
 
     print("\n--- Summary ---")
     print(f"Total Raw Reviews: {len(result['raw_reviews'])}")
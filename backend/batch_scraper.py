@@ -0,0 +1,219 @@
+"""Scrape many products in one run.
+
+Reads a file with one product name or Flipkart product link per line (blank lines
+and lines starting with # are ignored) and runs every product through three stages,
+each on its own bounded worker pool:
+
+    links    get_product_links (skipped for lines that already are links)
+    reviews  get_reviews on each distinct review set, raw reviews saved like extractReviews
+    details  get_product_details on the first link
+
+Products move to the next stage as soon as they finish one, so Google lookups,
+review pages and detail pages overlap. Review and detail pages share the per-host
+limits of page_fetcher, so the whole batch stays within one rate per host. The job
+state is written to disk after every finished stage; running the same command again
+resumes where it stopped.
+
+    python batch_scraper.py products.txt [--state FILE] [--max-pages N] [--retry-failed]
+"""
+import argparse # Imports argparse for the command line options.
+import json # Imports json to persist the job state.
+import logging # Imports logging for the progress messages.
+import os # Imports os for file handling.
+import time # Imports time for throughput reporting.
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait # Imports the stage worker pools.
+import pandas as pd # Imports pandas to save the raw reviews.
+
+from Link_Extractor import DriverPool, get_product_links # Imports the cached, pooled Google lookup.
+from Review_Extractor import (REVIEWS_DIR, WATERMARKS_DIR, get_product_details, get_reviews_for_links,
+                              incremental_reviews_path, sanitize_filename, save_new_reviews,
+                              save_raw_reviews)
+from review_watermarks import ReviewWatermark # Imports the per-product record of already-stored reviews.
+from http_session import get_session # Imports the shared session, whose counters give the pages fetched.
+from pipeline_metrics import export_metrics, get_metrics, setup_logging # Imports the stage metrics and log setup.
+from page_fetcher import DEFAULT_BURST, DEFAULT_MAX_CONCURRENCY, DEFAULT_RATE, get_host_limiter
+
+STAGES = ('links', 'reviews', 'details') # In order; a job's 'stage' is the next one it needs.
+DONE, FAILED = 'done', 'failed'
+DEFAULT_WORKERS = {'links': 2, 'reviews': 4, 'details': 2} # Bounded pool size per stage.
+
+logger = logging.getLogger(__name__)
+
+# -------------------- JOB STATE --------------------
+
+def read_jobs(path):
+    """Product names/links from the input file, without duplicates, in file order."""
+    with open(path, encoding='utf-8') as f:
+        lines = (line.strip() for line in f)
+        return list(dict.fromkeys(line for line in lines if line and not line.startswith('#')))
+
+def new_job(entry):
+    is_link = entry.startswith('http')
+    return {
+        'input': entry,
+        'stage': 'reviews' if is_link else 'links', # Links need no Google lookup.
+        'links': [entry] if is_link else [],
+        # Same key as extractReviews (sanitize_filename(name)), so both write the same files and watermarks.
+        'product_key': sanitize_filename(entry.split('/')[-1] if is_link else entry),
+    }
+
+class JobState:
+    """Per-product progress of a batch, saved as JSON after every finished stage."""
+
+    def __init__(self, path, entries):
+        self.path = path
+        self.jobs = {}
+        if os.path.exists(path):
+            with open(path, encoding='utf-8') as f:
+                self.jobs = json.load(f)['jobs']
+        for entry in entries: # New lines in the input file are added, existing progress is kept.
+            self.jobs.setdefault(entry, new_job(entry))
+        for entry, job in self.jobs.items(): # State saved before names were sanitized gets today's key.
+            job['product_key'] = new_job(entry)['product_key']
+
+    def pending(self, retry_failed=False):
+        if retry_failed:
+            for job in self.jobs.values():
+                if job['stage'] == FAILED:
+                    job['stage'] = job.pop('failed_stage', STAGES[0])
+                    job.pop('error', None)
+        return [job for job in self.jobs.values() if job['stage'] in STAGES]
+
+    def counts(self):
+        counts = {}
+        for job in self.jobs.values():
+            counts[job['stage']] = counts.get(job['stage'], 0) + 1
+        return counts
+
+    def save(self):
+        """Write the state atomically so an interrupted run never corrupts it."""
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'jobs': self.jobs}, f, indent=1)
+        os.replace(tmp_path, self.path)
+
+# -------------------- STAGES --------------------
+
+class BatchScraper:
+    """Runs jobs through the link, review and detail stages on bounded thread pools."""
+
+    def __init__(self, state, max_pages=10, workers=None, rate=DEFAULT_RATE, burst=DEFAULT_BURST,
+                 max_concurrency=DEFAULT_MAX_CONCURRENCY, incremental=False):
+        self.state = state
+        self.max_pages = max_pages
+        self.workers = {**DEFAULT_WORKERS, **(workers or {})}
+        self.limits = {'rate': rate, 'burst': burst, 'max_concurrency': max_concurrency}
+        self.incremental = incremental
+        self.driver_pool = None # One browser per link worker, started on the first lookup.
+        self.pages = 0 # Pages fetched by this run (review and detail pages).
+        self.finished = 0 # Products completed by this run.
+
+    def run_links(self, job):
+        links = get_product_links(job['input'], pool=self.driver_pool)
+        if not links:
+            raise RuntimeError("No product links found")
+        return {'links': links}
+
+    def run_reviews(self, job):
+        watermark = None
+        if self.incremental: # Newest first, stopping at the first page of stored reviews (see extractReviews).
+            watermark = ReviewWatermark.for_product(WATERMARKS_DIR, job['product_key'])
+        # Each distinct review set behind the product's links is fetched once.
+        reviews = get_reviews_for_links(job['links'], self.max_pages, self.incremental,
+                                        stop_when=watermark.page_is_known if watermark else None, **self.limits)
+        if not reviews:
+            raise RuntimeError("No reviews found")
+        if self.incremental:
+            df_reviews = save_new_reviews(job['product_key'], reviews, watermark)
+            return {'reviews': len(df_reviews), 'reviews_file': incremental_reviews_path(job['product_key'])}
+        os.makedirs(REVIEWS_DIR, exist_ok=True)
+        df_reviews = pd.DataFrame(reviews).replace("N/A", pd.NA).dropna().drop_duplicates() # Same filtering as extractReviews.
+        raw_filename = os.path.join(REVIEWS_DIR, f"{job['product_key']}_flipkart_reviews{time.strftime('%Y%m%d_%H%M%S')}.csv")
+        return {'reviews': len(df_reviews), 'reviews_file': save_raw_reviews(df_reviews, job['product_key'], raw_filename)}
+
+    def run_details(self, job):
+        link = job['links'][0]
+        with get_host_limiter(link, **self.limits).slot(): # Detail pages count against the same host limits.
+            price, image_url = get_product_details(link)
+        return {'price': price, 'image_url': image_url}
+
+    def run(self, retry_failed=False):
+        """Process every unfinished job; returns the state counts when all stages are drained."""
+        jobs = self.state.pending(retry_failed)
+        logger.info("📋 %d of %d products to process", len(jobs), len(self.state.jobs))
+        if not jobs:
+            return self.state.counts()
+        self.driver_pool = DriverPool(size=self.workers['links'])
+        requests_before = get_session().stats.summary()['requests']
+        start = time.perf_counter()
+        pools = {stage: ThreadPoolExecutor(max_workers=self.workers[stage], thread_name_prefix=stage) for stage in STAGES}
+        running = {} # Future -> job.
+
+        def submit(job):
+            running[pools[job['stage']].submit(getattr(self, f"run_{job['stage']}"), job)] = job
+
+        try:
+            for job in jobs:
+                submit(job)
+            while running:
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    job = running.pop(future)
+                    stage = job['stage']
+                    try:
+                        job.update(future.result())
+                        job['stage'] = STAGES[STAGES.index(stage) + 1] if stage != STAGES[-1] else DONE
+                    except Exception as e: # One product failing never stops the batch.
+                        logger.error("❌ %s: %s failed: %s", job['input'], stage, e)
+                        get_metrics().inc(f'{stage}_stage_failures')
+                        job.update(stage=FAILED, failed_stage=stage, error=str(e))
+                    self.state.save() # Only this thread touches the state, so no lock is needed.
+                    if job['stage'] == DONE:
+                        self.finished += 1
+                        self.report(start, requests_before, job)
+                    elif job['stage'] != FAILED:
+                        submit(job)
+        finally:
+            for pool in pools.values():
+                pool.shutdown(cancel_futures=True)
+            self.driver_pool.close()
+            self.state.save()
+        self.report(start, requests_before)
+        export_metrics('batch_scraper')
+        return self.state.counts()
+
+    def report(self, start, requests_before, job=None):
+        minutes = max(time.perf_counter() - start, 1e-9) / 60
+        self.pages = get_session().stats.summary()['requests'] - requests_before
+        rates = f"{self.finished / minutes:.1f} products/min, {self.pages / minutes:.1f} pages/min"
+        if job is not None:
+            logger.info("✅ %s: %d reviews, price %s (%s)", job['input'], job.get('reviews', 0), job.get('price'), rates)
+        else:
+            logger.info("📊 %d products and %d pages in %.1f min: %s", self.finished, self.pages, minutes, rates)
+            logger.info("   state: %s", self.state.counts())
+            get_metrics().log_summary(logger)
+
+def main():
+    parser = argparse.ArgumentParser(description="Scrape reviews for every product listed in a file.")
+    parser.add_argument('input', help="file with one product name or Flipkart link per line")
+    parser.add_argument('--state', help="job state file (default: <input>.state.json)")
+    parser.add_argument('--max-pages', type=int, default=10, help="review pages per link (default: 10)")
+    for stage in STAGES:
+        parser.add_argument(f'--{stage}-workers', type=int, default=DEFAULT_WORKERS[stage],
+                            help=f"concurrent products in the {stage} stage (default: {DEFAULT_WORKERS[stage]})")
+    parser.add_argument('--rate', type=float, default=DEFAULT_RATE, help="requests per second per host")
+    parser.add_argument('--burst', type=int, default=DEFAULT_BURST, help="back-to-back requests per host")
+    parser.add_argument('--max-concurrency', type=int, default=DEFAULT_MAX_CONCURRENCY, help="requests in flight per host")
+    parser.add_argument('--incremental', action='store_true', help="only fetch and append reviews not stored yet")
+    parser.add_argument('--retry-failed', action='store_true', help="run failed products again from the stage that failed")
+    args = parser.parse_args()
+    setup_logging()
+
+    state = JobState(args.state or f"{args.input}.state.json", read_jobs(args.input))
+    workers = {stage: getattr(args, f'{stage}_workers') for stage in STAGES}
+    scraper = BatchScraper(state, args.max_pages, workers, args.rate, args.burst, args.max_concurrency, args.incremental)
+    scraper.run(args.retry_failed)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,168 @@
+"""Benchmark MinHash/LSH near-duplicate detection: throughput, memory, scaling and accuracy.
+
+Builds a synthetic corpus of --reviews reviews from the words of
+data/cleaned_dataset/cleaned_data.csv (Cleaned_Description lengths and word
+frequencies), with a share --dup-rate of injected near-duplicates of earlier
+reviews (long ones cut off after 40-90% of their words with a "...READ MORE" tail,
+extra whitespace or one changed word) and a few spam templates posted
+--spam-copies times each, then reports:
+
+    batch      NearDuplicateDetector.filter reviews/sec, and time for 1/4, 1/2 and all of the corpus
+    streaming  NearDuplicateDetector.check microseconds/review
+    memory     bytes held per kept review and peak heap (tracemalloc)
+    accuracy   precision/recall on the injected duplicates (and recall on the truncated ones
+               alone), and agreement with an exact pairwise Jaccard/containment comparison of
+               the first --pairwise reviews (quadratic, extrapolated)
+
+Fails if precision or recall on the injected duplicates, or recall on the truncated
+ones, drops below 0.95 and 0.9.
+
+    python benchmark_near_duplicates.py [--reviews N] [--dup-rate R] [--threshold T] [--pairwise N]
+"""
+import argparse # Imports argparse for the command line options.
+import os # Imports os for the dataset path.
+import random # Imports random for the synthetic corpus.
+import sys # Imports sys to set the exit status.
+import time # Imports time for timing.
+import tracemalloc # Imports tracemalloc for the memory figures.
+import numpy as np # Imports numpy for the result masks.
+import pandas as pd # Imports pandas to load the dataset.
+
+from near_duplicates import (DEFAULT_THRESHOLD, PREFIX_SIZE, SHINGLE_SIZE, NearDuplicateDetector,
+                             normalize_text) # Imports the detector.
+
+DATASET = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'data', 'cleaned_dataset', 'cleaned_data.csv')
+MIN_PRECISION = 0.95
+MIN_RECALL = 0.9
+
+def perturb(text, rng):
+    """(near-duplicate of `text`, True if it was cut off), as Flipkart pages and copy-pasting reviewers produce them."""
+    words = text.split()
+    kind = rng.choice(['read more', 'whitespace', 'word'] if len(words) >= 20 else ['read more', 'whitespace'])
+    if kind == 'read more': # Flipkart cuts long reviews short; short ones only carry the link label.
+        if len(words) < 20:
+            return text + '...READ MORE', False
+        return ' '.join(words[:int(len(words) * rng.uniform(0.4, 0.9))]) + '...READ MORE', True
+    if kind == 'whitespace':
+        return '  '.join(words).upper() + ' ', False
+    words[rng.randrange(len(words))] = rng.choice(words)
+    return ' '.join(words), False
+
+def build_corpus(seed_texts, size, dup_rate, spam_templates, spam_copies, rng):
+    """(texts, is_duplicate list, is_truncated list) with the injected near-duplicates and spam copies marked True."""
+    tokens = [text.split() for text in seed_texts]
+    vocabulary = [word for words in tokens for word in words] # Sampling from it follows word frequencies.
+    lengths = [max(len(words), 5) for words in tokens]
+    texts, duplicate, truncated = [], [], []
+    spam = [' '.join(rng.choices(vocabulary, k=25)) for _ in range(spam_templates)]
+    spam_slots = set(rng.sample(range(size), min(size, spam_templates * spam_copies)))
+    posted = set() # Spam templates already in the corpus: later copies are duplicates of the first.
+    for i in range(size):
+        if i in spam_slots:
+            template = rng.randrange(spam_templates)
+            text, cut = perturb(spam[template], rng) if template in posted else (spam[template], False)
+            texts.append(text)
+            duplicate.append(template in posted)
+            truncated.append(cut)
+            posted.add(template)
+        elif texts and rng.random() < dup_rate:
+            text, cut = perturb(texts[rng.randrange(len(texts))], rng)
+            texts.append(text)
+            duplicate.append(True)
+            truncated.append(cut)
+        else:
+            texts.append(' '.join(rng.choices(vocabulary, k=rng.choice(lengths))))
+            duplicate.append(False)
+            truncated.append(False)
+    return texts, duplicate, truncated
+
+def exact_duplicates(texts, threshold):
+    """Pairwise over the same shingles: True where an earlier text is at least `threshold` similar (Jaccard),
+    or shares its opening and the smaller shingle set is at least `threshold` contained in the larger."""
+    texts = [normalize_text(text) for text in texts]
+    sets = [{text[i:i + SHINGLE_SIZE] for i in range(max(len(text) - SHINGLE_SIZE + 1, 1))} for text in texts]
+
+    def duplicate(i, j):
+        common = len(sets[i] & sets[j])
+        if common >= threshold * len(sets[i] | sets[j]):
+            return True
+        return texts[i][:PREFIX_SIZE] == texts[j][:PREFIX_SIZE] and common >= threshold * min(len(sets[i]), len(sets[j]))
+
+    return np.array([any(duplicate(i, j) for i in range(j)) for j in range(len(texts))])
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    arg_parser.add_argument('--dataset', default=DATASET, help='CSV with a Cleaned_Description column')
+    arg_parser.add_argument('--reviews', type=int, default=100_000, help='synthetic reviews to deduplicate')
+    arg_parser.add_argument('--dup-rate', type=float, default=0.1, help='share of injected near-duplicates')
+    arg_parser.add_argument('--spam-templates', type=int, default=20, help='spam texts posted many times')
+    arg_parser.add_argument('--spam-copies', type=int, default=25, help='copies of each spam text')
+    arg_parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD)
+    arg_parser.add_argument('--pairwise', type=int, default=1000, help='reviews compared exactly, pair by pair')
+    arg_parser.add_argument('--seed', type=int, default=0)
+    args = arg_parser.parse_args()
+
+    seed_texts = pd.read_csv(args.dataset)['Cleaned_Description'].dropna().astype(str).tolist()
+    texts, duplicate, truncated = build_corpus(seed_texts, args.reviews, args.dup_rate, args.spam_templates,
+                                               args.spam_copies, random.Random(args.seed))
+    duplicate, truncated = np.array(duplicate), np.array(truncated)
+    print(f"{len(texts)} reviews from {len(seed_texts)} seed reviews, {duplicate.sum()} injected near-duplicates "
+          f"({truncated.sum()} truncated), threshold {args.threshold}\n")
+
+    # Batch mode, and how the time grows with the corpus.
+    print(f"{'batch filter':<22} {'reviews':>9} {'seconds':>9} {'reviews/s':>10}")
+    for share in (4, 2, 1):
+        subset = texts[:len(texts) // share]
+        detector = NearDuplicateDetector(args.threshold)
+        start = time.perf_counter()
+        keep = detector.filter(subset)
+        seconds = time.perf_counter() - start
+        print(f"{'':<22} {len(subset):>9} {seconds:>9.2f} {len(subset) / seconds:>10.0f}")
+
+    flagged = ~keep
+    true_positives = int((flagged & duplicate).sum())
+    precision = true_positives / max(int(flagged.sum()), 1)
+    recall = true_positives / max(int(duplicate.sum()), 1)
+    truncated_recall = int((flagged & truncated).sum()) / max(int(truncated.sum()), 1)
+    spam = detector.spam_clusters(min_copies=args.spam_copies // 2)
+    print(f"\nflagged {flagged.sum()}: precision {precision:.3f}, recall {recall:.3f} "
+          f"(truncated {truncated_recall:.3f}); "
+          f"{len(spam)} of {args.spam_templates} spam templates found as clusters of {args.spam_copies // 2}+ copies")
+
+    # Streaming mode: one review at a time.
+    sample = texts[:min(len(texts), 20_000)]
+    detector = NearDuplicateDetector(args.threshold)
+    start = time.perf_counter()
+    for text in sample:
+        detector.check(text)
+    print(f"streaming check: {(time.perf_counter() - start) / len(sample) * 1e6:.1f} µs/review over {len(sample)} reviews")
+
+    # Memory held by the index, and the peak while building it.
+    tracemalloc.start()
+    detector = NearDuplicateDetector(args.threshold)
+    detector.filter(texts)
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"memory: {current / detector.kept:.0f} bytes per kept review ({current / 2**20:.1f} MB for "
+          f"{detector.kept} kept), peak heap {peak / 2**20:.1f} MB")
+
+    # Exact pairwise comparison on a sample: the quadratic baseline LSH avoids.
+    sample = texts[:min(len(texts), args.pairwise)]
+    start = time.perf_counter()
+    exact = exact_duplicates(sample, args.threshold)
+    pairwise_seconds = time.perf_counter() - start
+    lsh = ~NearDuplicateDetector(args.threshold).filter(sample)
+    agreement = (exact == lsh).mean()
+    projected = pairwise_seconds * (len(texts) / len(sample)) ** 2
+    print(f"exact pairwise on {len(sample)} reviews: {pairwise_seconds:.2f}s (~{projected / 3600:.1f} h projected "
+          f"for {len(texts)}); LSH agrees on {agreement:.1%} ({int((lsh & ~exact).sum())} extra, "
+          f"{int((exact & ~lsh).sum())} missed)")
+
+    if precision < MIN_PRECISION or min(recall, truncated_recall) < MIN_RECALL:
+        print(f"\n⚠️ Precision or recall below {MIN_PRECISION} / {MIN_RECALL}.")
+        return 1
+    print("\n✅ Injected near-duplicates found.")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
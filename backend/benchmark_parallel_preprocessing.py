@@ -0,0 +1,49 @@
+"""Scaling benchmark for sharded multiprocess preprocessing.
+
+Preprocesses the (scaled-up) descriptions from data/cleaned_dataset/cleaned_data.csv
+with 1..N worker processes, reports rows/sec and speedup over the single-process run,
+and fails if any worker count produces different output.
+
+    python benchmark_parallel_preprocessing.py [--scale N] [--max-workers N] [--chunk-size N]
+"""
+import argparse # Imports argparse for the command line options.
+import os # Imports os for the dataset path and CPU count.
+import sys # Imports sys to set the exit status.
+import time # Imports time for timing.
+import pandas as pd # Imports pandas to load the dataset.
+
+import text_normalizer # Imports the preprocessing engine.
+
+DATASET = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'data', 'cleaned_dataset', 'cleaned_data.csv')
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    arg_parser.add_argument('--dataset', default=DATASET, help='CSV with a Description column')
+    arg_parser.add_argument('--scale', type=int, default=200, help='times to repeat the descriptions')
+    arg_parser.add_argument('--max-workers', type=int, default=os.cpu_count() or 1, help='largest pool to try')
+    arg_parser.add_argument('--chunk-size', type=int, default=text_normalizer.DEFAULT_CHUNK_SIZE, help='rows per shard')
+    args = arg_parser.parse_args()
+
+    descriptions = pd.read_csv(args.dataset)['Description']
+    texts = pd.concat([descriptions] * args.scale, ignore_index=True)
+    print(f"{len(texts)} rows, shards of {args.chunk_size}\n")
+
+    text_normalizer.normalize_token.cache_clear()
+    start = time.perf_counter()
+    reference = text_normalizer.preprocess_series(texts) # Single process, no pool.
+    baseline = time.perf_counter() - start
+    print(f"{'workers':>7} {'rows/s':>10} {'speedup':>8}")
+    print(f"{'serial':>7} {len(texts) / baseline:>10.0f} {1.0:>7.2f}x")
+
+    failures = 0
+    for workers in range(1, args.max_workers + 1):
+        start = time.perf_counter() # Includes pool start-up and per-worker resource loading.
+        result = pd.concat(list(text_normalizer.iter_preprocess_parallel(texts, workers, args.chunk_size)))
+        elapsed = time.perf_counter() - start
+        same = result.equals(reference)
+        failures += not same
+        print(f"{workers:>7} {len(texts) / elapsed:>10.0f} {baseline / elapsed:>7.2f}x{'' if same else '  OUTPUT DIFFERS'}")
+    return 1 if failures else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,85 @@
+"""Benchmark the review parser backends over the saved HTML fixtures.
+
+Reports pages/sec and per-page memory for every backend in review_parser and checks
+that each backend extracts exactly the same reviews as the bs4 reference.
+
+    python benchmark_parsers.py [--fixtures DIR] [--repeat N]
+"""
+import argparse # Imports argparse for the command line options.
+import multiprocessing # Imports multiprocessing to measure each backend's memory in a fresh process.
+import sys # Imports sys to set the exit status.
+import time # Imports time for timing.
+import tracemalloc # Imports tracemalloc to measure Python heap use per page.
+
+try: # resource is POSIX-only; RSS is reported when it is available.
+    import resource
+except ImportError:
+    resource = None
+
+from html_fixtures import HTML_FIXTURES_DIR, load_benchmark_pages # Imports the fixture loaders.
+from review_parser import PARSERS, get_parser # Imports the parser backends.
+
+def _max_rss_kb():
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss if resource else None
+
+def measure_memory(backend, pages):
+    """Runs in a child process: peak Python heap per page and RSS growth over all pages."""
+    parser = get_parser(backend)
+    parser.parse(next(iter(pages.values()))) # Warm-up so imports and caches are not counted.
+    rss_before = _max_rss_kb()
+    heap_peaks = []
+    for content in pages.values():
+        tracemalloc.start()
+        parser.parse(content)
+        heap_peaks.append(tracemalloc.get_traced_memory()[1])
+        tracemalloc.stop()
+    rss_after = _max_rss_kb()
+    rss_growth = (rss_after - rss_before) if rss_before is not None else None
+    return max(heap_peaks), sum(heap_peaks) / len(heap_peaks), rss_growth
+
+def measure_speed(backend, pages, repeat):
+    parser = get_parser(backend)
+    start = time.perf_counter()
+    reviews = 0
+    for _ in range(repeat):
+        for content in pages.values():
+            reviews += len(parser.parse(content))
+    elapsed = time.perf_counter() - start
+    return len(pages) * repeat / elapsed, reviews / elapsed
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    arg_parser.add_argument('--fixtures', default=HTML_FIXTURES_DIR, help='folder of saved review pages (*.html)')
+    arg_parser.add_argument('--repeat', type=int, default=3, help='passes over the fixtures per backend')
+    args = arg_parser.parse_args()
+
+    pages = load_benchmark_pages(args.fixtures)
+    if not pages:
+        print("No fixtures or scraped reviews to build pages from.")
+        return 1
+    print(f"{len(pages)} pages, {sum(map(len, pages.values())) / len(pages) / 1024:.0f} KB/page on average\n")
+
+    # Equivalence: every backend must return exactly what the bs4 reference returns.
+    reference = {name: get_parser('bs4').parse(content) for name, content in pages.items()}
+    mismatches = 0
+    for backend in PARSERS:
+        for name, content in pages.items():
+            if get_parser(backend).parse(content) != reference[name]:
+                print(f"MISMATCH: {backend} differs from bs4 on {name}")
+                mismatches += 1
+
+    context = multiprocessing.get_context('spawn') # Fresh interpreter per backend so RSS numbers do not mix.
+    print(f"{'backend':<8} {'pages/s':>9} {'reviews/s':>10} {'heap/page peak':>15} {'heap/page avg':>14} {'RSS growth':>11}")
+    for backend in PARSERS:
+        pages_per_sec, reviews_per_sec = measure_speed(backend, pages, args.repeat)
+        with context.Pool(1) as pool:
+            heap_peak, heap_avg, rss_growth = pool.apply(measure_memory, (backend, pages))
+        rss = f"{rss_growth / 1024:.1f} MB" if rss_growth is not None else 'n/a'
+        print(f"{backend:<8} {pages_per_sec:>9.1f} {reviews_per_sec:>10.0f} "
+              f"{heap_peak / 1024:>12.0f} KB {heap_avg / 1024:>11.0f} KB {rss:>11}")
+
+    print("\nOutput identical across backends." if not mismatches else f"\n{mismatches} mismatching pages!")
+    return 1 if mismatches else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,55 @@
+"""Benchmark the vectorised preprocessing engine against preprocess_text.
+
+Runs combine_preprocess_reviews.preprocess_text row by row and
+text_normalizer.preprocess_series on the same (scaled-up) descriptions from
+data/cleaned_dataset/cleaned_data.csv, reports rows/sec for both and fails if
+any output differs.
+
+    python benchmark_preprocessing.py [--scale N]
+"""
+import argparse # Imports argparse for the command line options.
+import os # Imports os for the dataset path.
+import sys # Imports sys to set the exit status.
+import time # Imports time for timing.
+import pandas as pd # Imports pandas to load the dataset.
+
+from combine_preprocess_reviews import preprocess_text # Imports the row-by-row reference.
+import text_normalizer # Imports the batched engine.
+
+DATASET = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'data', 'cleaned_dataset', 'cleaned_data.csv')
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    arg_parser.add_argument('--dataset', default=DATASET, help='CSV with a Description column')
+    arg_parser.add_argument('--scale', type=int, default=50, help='times to repeat the descriptions')
+    args = arg_parser.parse_args()
+
+    descriptions = pd.read_csv(args.dataset)['Description']
+    texts = pd.concat([descriptions] * args.scale, ignore_index=True)
+    print(f"{len(texts)} rows ({len(descriptions)} distinct descriptions x {args.scale})\n")
+
+    text_normalizer.normalize_token.cache_clear() # Both runs start with a cold lemma cache.
+    start = time.perf_counter()
+    reference = texts.apply(preprocess_text)
+    reference_time = time.perf_counter() - start
+
+    text_normalizer.normalize_token.cache_clear()
+    start = time.perf_counter()
+    vectorised = text_normalizer.preprocess_series(texts)
+    vectorised_time = time.perf_counter() - start
+
+    print(f"{'preprocess_text (apply)':<26} {len(texts) / reference_time:>10.0f} rows/s")
+    print(f"{'preprocess_series':<26} {len(texts) / vectorised_time:>10.0f} rows/s  "
+          f"({reference_time / vectorised_time:.1f}x)")
+    print(f"lemma cache: {text_normalizer.cache_info()}")
+
+    mismatches = int((reference != vectorised).sum())
+    if mismatches:
+        first = (reference != vectorised).idxmax()
+        print(f"\n{mismatches} rows differ, e.g. row {first}:\n  {reference[first]!r}\n  {vectorised[first]!r}")
+        return 1
+    print("\nOutputs identical.")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,65 @@
+"""Benchmark rating model loading and prediction.
+
+Trains a model on data/cleaned_dataset/cleaned_data.csv (or loads --model), then
+reports artifact load time, single-review latency (p50/p99) and batch throughput
+in reviews/sec for predict() on raw Description texts, preprocessing included.
+
+    python benchmark_rating_model.py [--model PATH] [--batch-sizes 1,32,256,2048] [--samples N]
+"""
+import argparse # Imports argparse for the command line options.
+import os # Imports os for the temp model path.
+import tempfile # Imports tempfile to save the trained model.
+import time # Imports time for timing.
+import numpy as np # Imports numpy for percentiles.
+
+from rating_model import RatingModel, train # Imports the model under test.
+from review_storage import get_storage # Imports the cleaned dataset backends.
+
+def timed(function, repeat):
+    """Milliseconds per call for `repeat` calls."""
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        samples.append((time.perf_counter() - start) * 1000)
+    return np.array(samples)
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    arg_parser.add_argument('--model', help='saved model (default: train one now)')
+    arg_parser.add_argument('--batch-sizes', default='1,32,256,2048', help='comma separated batch sizes')
+    arg_parser.add_argument('--samples', type=int, default=300, help='single-review predictions to time')
+    args = arg_parser.parse_args()
+
+    storage = get_storage()
+    texts = storage.read_cleaned(['Description'])['Description'].dropna().astype(str).tolist()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = args.model
+        if path is None:
+            start = time.perf_counter()
+            model, metrics = train(storage)
+            path = model.save(os.path.join(tmp, 'rating_model.joblib'))
+            print(f"trained in {time.perf_counter() - start:.2f}s, holdout accuracy {metrics.get('accuracy', float('nan')):.3f}")
+        print(f"artifact: {os.path.getsize(path) / 2**20:.1f} MB")
+        for mmap in (True, False):
+            load_ms = timed(lambda: RatingModel.load(path, mmap=mmap), 5).min()
+            print(f"load ({'mmap' if mmap else 'read'}): {load_ms:.1f} ms")
+        model = RatingModel.load(path)
+
+        model.predict(texts[:10]) # Warms the lemma cache and sklearn's code paths.
+        rng = np.random.default_rng(0)
+        picks = rng.integers(0, len(texts), args.samples)
+        latencies = timed(lambda it=iter(picks): model.predict([texts[next(it)]]), args.samples)
+        print(f"\nsingle review: p50 {np.percentile(latencies, 50):.2f} ms, p99 {np.percentile(latencies, 99):.2f} ms")
+
+        print(f"\n{'batch size':>10} {'ms/batch':>10} {'reviews/s':>11}")
+        for batch_size in map(int, args.batch_sizes.split(',')):
+            batch = [texts[i % len(texts)] for i in range(batch_size)]
+            repeat = max(3, min(50, 2000 // batch_size))
+            ms = np.median(timed(lambda: model.predict(batch), repeat))
+            print(f"{batch_size:>10} {ms:>10.2f} {batch_size / ms * 1000:>11.0f}")
+        del model # Releases the memory-mapped weights before the temp folder is removed.
+
+if __name__ == "__main__":
+    main()
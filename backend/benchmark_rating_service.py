@@ -0,0 +1,83 @@
+"""Benchmark the micro-batching rating service against one model call per review.
+
+Several client threads each rate review Descriptions from the cleaned dataset one at
+a time, first by calling RatingModel.predict([text]) directly, then through
+RatingService (cache off, then cache on with the texts repeated). Reports
+reviews/sec, per-review latency percentiles and the service's batch-size histogram.
+
+    python benchmark_rating_service.py [--clients N] [--reviews N] [--max-batch-size N] [--max-wait-ms MS]
+"""
+import argparse # Imports argparse for the command line options.
+import os # Imports os for the temp model path.
+import tempfile # Imports tempfile for the trained model.
+import threading # Imports threading for the client threads.
+import time # Imports time for timing.
+import numpy as np # Imports numpy for percentiles.
+
+from rating_model import RatingModel, train # Imports the model.
+from rating_service import DEFAULT_MAX_BATCH_SIZE, DEFAULT_MAX_WAIT_MS, RatingService # Imports the service under test.
+from review_storage import get_storage # Imports the cleaned dataset backends.
+
+def run_clients(texts, clients, rate_one):
+    """Split texts over client threads calling rate_one(text); returns (seconds, latencies in ms)."""
+    latencies = [[] for _ in range(clients)]
+
+    def client(index):
+        for text in texts[index::clients]:
+            start = time.perf_counter()
+            rate_one(text)
+            latencies[index].append((time.perf_counter() - start) * 1000)
+
+    threads = [threading.Thread(target=client, args=(i,)) for i in range(clients)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return time.perf_counter() - start, np.concatenate([np.array(l) for l in latencies])
+
+def report(label, texts, seconds, latencies):
+    print(f"{label:<22} {len(texts) / seconds:>10.0f} {np.percentile(latencies, 50):>8.2f} "
+          f"{np.percentile(latencies, 99):>8.2f}")
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    arg_parser.add_argument('--model', help='saved model (default: train one now)')
+    arg_parser.add_argument('--clients', type=int, default=16, help='concurrent client threads')
+    arg_parser.add_argument('--reviews', type=int, default=5000, help='reviews rated per run')
+    arg_parser.add_argument('--max-batch-size', type=int, default=DEFAULT_MAX_BATCH_SIZE)
+    arg_parser.add_argument('--max-wait-ms', type=float, default=DEFAULT_MAX_WAIT_MS)
+    args = arg_parser.parse_args()
+
+    storage = get_storage()
+    descriptions = storage.read_cleaned(['Description'])['Description'].dropna().astype(str).tolist()
+    # Distinct texts (a numbered suffix defeats the cache) and the same texts with repeats.
+    unique_texts = [f"{descriptions[i % len(descriptions)]} {i}" for i in range(args.reviews)]
+    repeated_texts = [descriptions[i % len(descriptions)] for i in range(args.reviews)]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        if args.model:
+            model = RatingModel.load(args.model)
+        else:
+            model = RatingModel.load(train(storage)[0].save(os.path.join(tmp, 'rating_model.joblib')), mmap=False)
+        model.predict(descriptions[:50]) # Warms the lemma cache.
+
+        print(f"{args.reviews} reviews, {args.clients} clients, max batch {args.max_batch_size}, "
+              f"max wait {args.max_wait_ms} ms\n")
+        print(f"{'':<22} {'reviews/s':>10} {'p50 ms':>8} {'p99 ms':>8}")
+        report('direct predict', unique_texts, *run_clients(unique_texts, args.clients, lambda t: model.predict([t])))
+
+        with RatingService(model, args.max_batch_size, args.max_wait_ms, cache_size=0) as service:
+            report('service, no cache', unique_texts, *run_clients(unique_texts, args.clients, service.predict))
+            stats = service.stats()
+        with RatingService(model, args.max_batch_size, args.max_wait_ms) as service:
+            report('service, cached', repeated_texts, *run_clients(repeated_texts, args.clients, service.predict))
+            cached_stats = service.stats()
+
+    print(f"\nservice latency (no cache): {stats['latency_ms']}")
+    print(f"batches: {stats['batches']}, mean size {stats['mean_batch_size']}")
+    print(f"batch-size histogram: {stats['batch_size_histogram']}")
+    print(f"cache (repeated texts): {cached_stats['cache']}")
+
+if __name__ == "__main__":
+    main()
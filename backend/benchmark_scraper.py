@@ -0,0 +1,185 @@
+"""End-to-end scraper benchmark against recorded fixtures, with regression thresholds.
+
+Replays a FixtureStore (data/fixtures/http, or pages synthesised from the scraped
+CSVs when it is empty) through a local FixtureServer with injected latency, jitter
+and errors, and measures:
+
+    extract  extractReviewsFromLink end to end: pages/sec, reviews/sec, peak heap, max RSS
+    parse    parse_reviews (default backend) and get_reviews_from_page (bs4) ms/page
+    details  get_product_details ms/call
+    links    get_product_links ms/lookup (Google pages replayed through FixtureDriver)
+
+Each metric is checked against a threshold (DEFAULT_THRESHOLDS, overridden by
+--thresholds FILE); the exit status is 1 when any of them regresses.
+
+    python benchmark_scraper.py [--fixtures DIR] [--latency-ms MS] [--jitter-ms MS] [--error-rate R]
+                                [--runs N] [--thresholds FILE] [--write-results FILE]
+"""
+import argparse # Imports argparse for the command line options.
+import contextlib # Imports contextlib for the ExitStack of temp folders and patches.
+import json # Imports json for thresholds and results files.
+import os # Imports os for the temp review folder.
+import statistics # Imports statistics for the median over runs.
+import sys # Imports sys to set the exit status.
+import tempfile # Imports tempfile for the reviews written by the scraper.
+import time # Imports time for timing.
+import tracemalloc # Imports tracemalloc for peak heap use.
+
+try: # resource is POSIX-only; RSS is reported when it is available.
+    import resource
+except ImportError:
+    resource = None
+
+import Review_Extractor # Imports the scraper; REVIEWS_DIR is pointed at a temp folder.
+from fixture_server import FixtureDriver, FixtureServer # Imports the local stand-in.
+from fixture_store import FIXTURES_DIR, FixtureStore, synthesize # Imports the recorded pages.
+from http_session import HttpSession, set_session # Imports the session swapped in for fast retries.
+from Link_Extractor import DriverPool, get_product_links # Imports the Google lookup.
+from page_fetcher import get_host_limiter, reset_host_limiters # Imports the per-host limiter settings.
+from pipeline_metrics import get_metrics, quiet # Imports the scraper's page counters and the block muting its log records and prints.
+from review_parser import parse_reviews # Imports the default parser backend.
+
+# Lower bounds ('min') for throughputs and upper bounds ('max') for times and memory, at
+# the default settings below. Loose enough for a laptop on battery; tighten with --thresholds.
+DEFAULT_THRESHOLDS = {
+    'pages_per_sec': {'min': 5},
+    'reviews_per_sec': {'min': 40},
+    'parse_ms_per_page': {'max': 30},
+    'peak_heap_mb': {'max': 150},
+    'details_ms': {'max': 500},
+    'links_ms': {'max': 1000},
+}
+
+def max_rss_mb():
+    if resource is None:
+        return None
+    scale = 1024 * 1024 if sys.platform == 'darwin' else 1024 # ru_maxrss is bytes on macOS, KB on Linux.
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / scale
+
+def time_per_call_ms(function, items, repeat=1):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for item in items:
+            function(item)
+    return (time.perf_counter() - start) * 1000 / (len(items) * repeat)
+
+def pages_with_reviews():
+    return get_metrics().snapshot()['counters'].get('pages_with_reviews', 0)
+
+def run_extract(server, product_url, max_pages, limits):
+    """One extractReviewsFromLink run; returns (seconds, pages that returned reviews, raw reviews, peak heap bytes)."""
+    reset_host_limiters()
+    get_host_limiter(server.base_url, **limits) # extractReviewsFromLink passes no limits, so the host keeps these.
+    pages_before = pages_with_reviews()
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = Review_Extractor.extractReviewsFromLink(server.url_for(product_url), max_pages)
+    seconds = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    # Pages that returned reviews: not the product page, the empty page ending the listing
+    # or the pages the prefetch window requested past it.
+    pages = pages_with_reviews() - pages_before
+    reviews = len(result['raw_reviews']) if isinstance(result, dict) else 0
+    return seconds, pages, reviews, peak
+
+def check(results, thresholds):
+    """Print each metric against its threshold; returns the names of those that regressed."""
+    failed = []
+    print(f"\n{'metric':<20} {'value':>10} {'threshold':>12}")
+    for name, value in results.items():
+        bound = thresholds.get(name, {})
+        status = ''
+        if value is not None and 'min' in bound and value < bound['min']:
+            status = f"❌ < {bound['min']}"
+        elif value is not None and 'max' in bound and value > bound['max']:
+            status = f"❌ > {bound['max']}"
+        elif bound:
+            status = '✅ ' + ', '.join(f"{k} {v}" for k, v in bound.items())
+        if status.startswith('❌'):
+            failed.append(name)
+        shown = 'n/a' if value is None else f"{value:.2f}"
+        print(f"{name:<20} {shown:>10} {status:>12}")
+    return failed
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    arg_parser.add_argument('--fixtures', default=FIXTURES_DIR, help='fixture store directory')
+    arg_parser.add_argument('--product', help='recorded product link to scrape (default: the first one)')
+    arg_parser.add_argument('--latency-ms', type=float, default=50, help='server delay per response')
+    arg_parser.add_argument('--jitter-ms', type=float, default=20, help='extra random delay per response')
+    arg_parser.add_argument('--error-rate', type=float, default=0.0, help='share of responses answered with 503')
+    arg_parser.add_argument('--seed', type=int, default=0)
+    arg_parser.add_argument('--rate', type=float, default=50, help='requests per second per host')
+    arg_parser.add_argument('--max-concurrency', type=int, default=4, help='requests in flight per host')
+    arg_parser.add_argument('--runs', type=int, default=3, help='extract runs; the median is reported')
+    arg_parser.add_argument('--thresholds', help='JSON file of {metric: {"min"|"max": value}} overriding the defaults')
+    arg_parser.add_argument('--write-results', help='also write the measured metrics to this JSON file')
+    args = arg_parser.parse_args()
+
+    thresholds = dict(DEFAULT_THRESHOLDS)
+    if args.thresholds:
+        with open(args.thresholds, encoding='utf-8') as f:
+            thresholds.update(json.load(f))
+
+    with contextlib.ExitStack() as stack:
+        store = FixtureStore(args.fixtures)
+        if not store.products:
+            store = FixtureStore(stack.enter_context(tempfile.TemporaryDirectory()))
+            synthesize(store)
+            print("No recorded fixtures; using pages synthesised from the scraped CSVs.")
+        product_url = args.product or store.products[0]
+        pages = store.review_pages(product_url)
+        searches = list(store.searches)
+
+        server = stack.enter_context(FixtureServer(store, args.latency_ms, args.jitter_ms, args.error_rate,
+                                                   seed=args.seed))
+        session = HttpSession(backoff=0.05) # Injected errors are retried without the production backoff.
+        previous_session = set_session(session)
+        stack.callback(set_session, previous_session)
+        reviews_dir = stack.enter_context(tempfile.TemporaryDirectory())
+        saved_reviews_dir, Review_Extractor.REVIEWS_DIR = Review_Extractor.REVIEWS_DIR, reviews_dir
+        stack.callback(setattr, Review_Extractor, 'REVIEWS_DIR', saved_reviews_dir)
+        limits = {'rate': args.rate, 'burst': args.max_concurrency, 'max_concurrency': args.max_concurrency}
+
+        print(f"{product_url}: {len(pages)} review pages, {args.latency_ms:g}+{args.jitter_ms:g} ms latency, "
+              f"{args.error_rate:.0%} errors, {args.rate:g} req/s, {args.max_concurrency} in flight")
+
+        with quiet(): # The scraper logs every page; warnings still get through.
+            Review_Extractor.preprocess_reviews(['warm up the nlp resources before timing']) # Loads NLTK data once.
+            runs = [run_extract(server, product_url, len(pages) + 1, limits) for _ in range(args.runs)]
+            parse_ms = time_per_call_ms(parse_reviews, pages, repeat=3)
+            bs4_ms = time_per_call_ms(lambda content: parse_reviews(content, 'bs4'), pages) # get_reviews_from_page's backend.
+            details_ms = time_per_call_ms(Review_Extractor.get_product_details, [server.url_for(product_url)] * 5)
+            links_ms = None
+            if searches:
+                with DriverPool(factory=lambda: FixtureDriver(server), size=1) as pool:
+                    links_ms = time_per_call_ms(lambda name: get_product_links(name, pool=pool, use_cache=False), searches)
+
+        seconds = statistics.median(run[0] for run in runs)
+        results = {
+            'pages_per_sec': statistics.median(run[1] / run[0] for run in runs),
+            'reviews_per_sec': statistics.median(run[2] / run[0] for run in runs),
+            'parse_ms_per_page': parse_ms,
+            'bs4_parse_ms_per_page': bs4_ms,
+            'peak_heap_mb': max(run[3] for run in runs) / 2**20,
+            'max_rss_mb': max_rss_mb(),
+            'details_ms': details_ms,
+            'links_ms': links_ms,
+        }
+        print(f"extractReviewsFromLink: {seconds:.2f}s median, {runs[0][2]} raw reviews per run")
+        print(f"server: {server.stats()}")
+        print(f"session: {session.stats.summary()}")
+
+    failed = check(results, thresholds)
+    if args.write_results:
+        with open(args.write_results, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+    if failed:
+        print(f"\n⚠️ Regressed: {', '.join(failed)}")
+        return 1
+    print("\n✅ All metrics within thresholds.")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,94 @@
+"""Benchmark the CSV and Parquet storage backends.
+
+Copies the raw review CSVs from data/reviews (repeated --scale times, as extra
+scrapes of each product) and data/cleaned_dataset/cleaned_data.csv into a temp
+folder, migrates them to Parquet, and reports load times and on-disk size for:
+the whole cleaned dataset, only the Rating and Cleaned_Description columns,
+every raw review, and a single product's raw reviews. Fails if a backend loads
+different rows.
+
+    python benchmark_storage.py [--scale N] [--repeat N]
+"""
+import argparse # Imports argparse for the command line options.
+import os # Imports os for paths and file sizes.
+import shutil # Imports shutil to copy the source data.
+import sys # Imports sys to set the exit status.
+import tempfile # Imports tempfile for the scratch folder.
+import time # Imports time for timing.
+import pandas as pd # Imports pandas to scale up the data.
+
+from review_storage import CLEANED_DIR, REVIEWS_DIR, CsvStorage, ParquetStorage, migrate_csv_to_parquet, parse_review_filename
+
+PROJECTED_COLUMNS = ['Rating', 'Cleaned_Description'] # What model training actually reads.
+
+def folder_size(path):
+    return sum(os.path.getsize(os.path.join(root, f)) for root, _, files in os.walk(path) for f in files)
+
+def best_time(function, repeat):
+    """Fastest of `repeat` runs, in ms, and the last result."""
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = function()
+        times.append((time.perf_counter() - start) * 1000)
+    return min(times), result
+
+def same_rows(a, b):
+    key = lambda df: sorted(map(tuple, df.astype(object).where(df.notna(), '').astype(str).values.tolist()))
+    return len(a) == len(b) and key(a) == key(b)
+
+def build_corpus(root, scale):
+    """Scaled copy of the raw and cleaned CSVs under root; returns (reviews_dir, cleaned_dir)."""
+    reviews_dir, cleaned_dir = os.path.join(root, 'reviews'), os.path.join(root, 'cleaned_dataset')
+    os.makedirs(reviews_dir)
+    os.makedirs(cleaned_dir)
+    for file in sorted(os.listdir(REVIEWS_DIR)):
+        if not file.endswith('.csv'):
+            continue
+        product = (parse_review_filename(file) or (os.path.splitext(file)[0],))[0]
+        for copy in range(scale): # One file per simulated scrape.
+            shutil.copy(os.path.join(REVIEWS_DIR, file),
+                        os.path.join(reviews_dir, f"{product}_flipkart_reviews20250101_{copy:06d}.csv"))
+    cleaned = pd.read_csv(os.path.join(CLEANED_DIR, 'cleaned_data.csv'))
+    pd.concat([cleaned] * scale, ignore_index=True).to_csv(os.path.join(cleaned_dir, 'cleaned_data.csv'), index=False)
+    return reviews_dir, cleaned_dir
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    arg_parser.add_argument('--scale', type=int, default=20, help='times to repeat the data')
+    arg_parser.add_argument('--repeat', type=int, default=5, help='runs per measurement (best is reported)')
+    args = arg_parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as root:
+        reviews_dir, cleaned_dir = build_corpus(root, args.scale)
+        migrate_csv_to_parquet(reviews_dir, cleaned_dir)
+        csv, parquet = CsvStorage(reviews_dir, cleaned_dir), ParquetStorage(reviews_dir, cleaned_dir)
+        product = parse_review_filename(csv.review_files()[0])[0]
+
+        cases = [
+            ('cleaned, all columns', lambda s: s.read_cleaned()),
+            ('cleaned, 2 columns', lambda s: s.read_cleaned(PROJECTED_COLUMNS)),
+            ('raw, all products', lambda s: s.read_reviews()),
+            ('raw, one product', lambda s: s.read_reviews(product)),
+        ]
+        print(f"{len(csv.review_files())} raw files, {len(csv.read_cleaned())} cleaned rows (x{args.scale})\n")
+        print(f"{'load':<22} {'csv ms':>9} {'parquet ms':>11} {'speedup':>8}")
+        failures = 0
+        for label, load in cases:
+            csv_ms, csv_df = best_time(lambda: load(csv), args.repeat)
+            parquet_ms, parquet_df = best_time(lambda: load(parquet), args.repeat)
+            identical = same_rows(csv_df, parquet_df)
+            failures += not identical
+            print(f"{label:<22} {csv_ms:>9.1f} {parquet_ms:>11.1f} {csv_ms / parquet_ms:>7.1f}x"
+                  + ("" if identical else "  ROWS DIFFER"))
+
+        print(f"\n{'on disk':<22} {'csv MB':>9} {'parquet MB':>11} {'ratio':>8}")
+        for label, csv_path, parquet_path in [('raw reviews', reviews_dir, parquet.reviews_root),
+                                              ('cleaned dataset', csv.cleaned_file, parquet.cleaned_root)]:
+            csv_size = os.path.getsize(csv_path) if os.path.isfile(csv_path) else folder_size(csv_path)
+            parquet_size = folder_size(parquet_path)
+            print(f"{label:<22} {csv_size / 2**20:>9.2f} {parquet_size / 2**20:>11.2f} {csv_size / parquet_size:>7.1f}x")
+    return 1 if failures else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
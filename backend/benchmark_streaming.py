@@ -0,0 +1,87 @@
+"""Benchmark the streaming review pipeline against the staged extract-then-process flow.
+
+Serves --pages synthetic review pages (fixture_store.synthesize) from a local
+fixture_server.FixtureServer (with --latency-ms per response) and scrapes them twice:
+
+    staged     get_reviews -> DataFrame -> CSV -> preprocess_reviews (extractReviewsFromLink)
+    streaming  review_pipeline.stream_product_reviews
+
+Reports time to the first processed review, total time and peak Python heap
+(tracemalloc) for both, and checks they produce the same processed reviews.
+
+    python benchmark_streaming.py [--pages N] [--latency-ms MS] [--max-concurrency N]
+"""
+import argparse # Imports argparse for the command line options.
+import os # Imports os for the temp output paths.
+import sys # Imports sys to set the exit status.
+import tempfile # Imports tempfile for the raw review files.
+import time # Imports time for timing.
+import tracemalloc # Imports tracemalloc for peak heap use.
+import pandas as pd # Imports pandas for the staged flow.
+
+from fixture_server import FixtureServer # Imports the local stand-in.
+from fixture_store import FixtureStore, synthesize # Imports the synthetic Flipkart pages.
+from Review_Extractor import get_reviews, modify_reviews_url, preprocess_reviews # Imports the staged flow.
+from review_pipeline import stream_product_reviews # Imports the streaming flow.
+from review_storage import CsvStorage # Imports the CSV writer used by both flows.
+from page_fetcher import reset_host_limiters # Imports the limiter reset between runs.
+from pipeline_metrics import quiet # Imports the block muting the scraper's log records and prints.
+
+def staged(link, max_pages, raw_path, limits):
+    reviews = get_reviews(modify_reviews_url(link), max_pages, **limits)
+    df_reviews = pd.DataFrame(reviews).replace("N/A", pd.NA).dropna().drop_duplicates()
+    df_reviews.to_csv(raw_path, index=False)
+    yield from preprocess_reviews(df_reviews['Description'].tolist()) # Nothing is available before this point.
+
+def streaming(link, max_pages, raw_path, limits):
+    storage = CsvStorage(os.path.dirname(raw_path))
+    for review in stream_product_reviews(link, max_pages, storage=storage, raw_path=raw_path, **limits):
+        yield review['Processed_Review']
+
+def measure(flow, *args):
+    reset_host_limiters() # Both runs start with full token buckets.
+    tracemalloc.start()
+    start = time.perf_counter()
+    first, results = None, []
+    for result in flow(*args):
+        if first is None:
+            first = time.perf_counter() - start
+        results.append(result)
+    total = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return first, total, peak, results
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    arg_parser.add_argument('--pages', type=int, default=30, help='review pages to scrape')
+    arg_parser.add_argument('--latency-ms', type=float, default=50, help='server delay per page')
+    arg_parser.add_argument('--rate', type=float, default=20, help='requests per second per host')
+    arg_parser.add_argument('--max-concurrency', type=int, default=4, help='requests in flight per host')
+    args = arg_parser.parse_args()
+
+    limits = {'rate': args.rate, 'burst': args.max_concurrency, 'max_concurrency': args.max_concurrency}
+
+    with tempfile.TemporaryDirectory() as tmp:
+        store = FixtureStore(os.path.join(tmp, 'fixtures'))
+        product_url = synthesize(store, pages=args.pages)
+        with FixtureServer(store, args.latency_ms) as server:
+            link = server.url_for(product_url)
+            results = {}
+            with quiet(): # The scraper logs every page; warnings still get through.
+                for name, flow in (('staged', staged), ('streaming', streaming)):
+                    results[name] = measure(flow, link, args.pages + 1, os.path.join(tmp, f"{name}.csv"), limits)
+
+    print(f"{args.pages} pages, {args.latency_ms:.0f} ms latency, {args.rate:g} req/s, "
+          f"{args.max_concurrency} in flight\n")
+    print(f"{'':<10} {'first result s':>15} {'total s':>8} {'peak heap MB':>13} {'reviews':>8}")
+    for name, (first, total, peak, processed) in results.items():
+        print(f"{name:<10} {first:>15.3f} {total:>8.3f} {peak / 2**20:>13.2f} {len(processed):>8}")
+    if results['staged'][3] != results['streaming'][3]:
+        print("\nProcessed reviews differ!")
+        return 1
+    print("\nProcessed reviews identical.")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,88 +1,443 @@
+import argparse
+import hashlib
+import json
+import logging
 import os
+import shutil
+import sys
+import numpy as np
 import pandas as pd
-import re
-import nltk
+import nlp_resources
+from near_duplicates import DEFAULT_THRESHOLD, NearDuplicateDetector
+from pipeline_metrics import export_metrics, get_metrics, profiled, setup_logging
+from product_index import INDEX_PATH, ProductIndex
+from review_storage import BACKENDS, CLEANED_DIR, REVIEWS_DIR, STORAGE_ENV, get_storage, product_for_file
+from text_normalizer import DEFAULT_CHUNK_SIZE, create_pool, preprocess_parallel
 
-from nltk.corpus import stopwords
-from nltk.stem import WordNetLemmatizer
+try:  # resource (POSIX) reports the peak RSS; psutil is the fallback elsewhere.
+    import resource
+except ImportError:
+    resource = None
 
-# Download required resources
-nltk.download('stopwords')
-nltk.download('wordnet')
+logger = logging.getLogger(__name__)  # Progress messages; silence with REVIEW_LOG_LEVEL=WARNING.
+metrics = get_metrics()  # Read/clean/preprocess/write timers and row counters.
 
-# 📁 Input and Output folders
-csv_folder = "C:/Users/eapen/OneDrive/Desktop/automated-review-rating-system/data/reviews"
-output_folder = "C:/Users/eapen/OneDrive/Desktop/automated-review-rating-system/data/cleaned_dataset"
-os.makedirs(output_folder, exist_ok=True)
-output_file = os.path.join(output_folder, "cleaned_data.csv")
-
-# 🧠 NLP setup
-stop_words = set(stopwords.words('english'))
-lemmatizer = WordNetLemmatizer()
-import re
-import emoji
+# NLTK stopwords and WordNet are loaded by nlp_resources on first use and downloaded
+# only when missing (set REVIEW_NLP_OFFLINE=1 to fail fast instead).
 
-def remove_emojis(text):
-    return emoji.replace_emoji(str(text), replace='')
+# 📁 Input and Output folders (the repository's data/ folders, shared with the scraper, storage and product index)
+csv_folder = REVIEWS_DIR
+output_folder = CLEANED_DIR
+output_file = os.path.join(output_folder, "cleaned_data.csv")
+# Incremental runs: which input files are already in the dataset, and the fingerprints of its rows.
+manifest_file = os.path.join(output_folder, "manifest.json")
+dedupe_index_file = os.path.join(output_folder, "dedupe_index.npy")
+# Per-product rating histograms and top terms, updated with every chunk written.
+product_index_file = INDEX_PATH
+# MinHash signatures of the kept reviews, so incremental runs also drop near-duplicates of earlier rows.
+near_duplicates_file = os.path.join(output_folder, "near_duplicates.npz")
 
+READ_CHUNK_SIZE = 50_000  # Rows read from a CSV at a time; bounds memory regardless of corpus size.
+# The scraped CSVs' columns, in the scraper's order (review_parser.REVIEW_FIELDS).
+RAW_COLUMNS = ['Name', 'Rating', 'Title', 'Description', 'Date', 'Certified_Buyer', 'Helpful_Votes']
+ESSENTIAL_COLUMNS = ['Description', 'Rating', 'Title']
+COLUMNS_TO_DROP = ['Name', 'Date', 'Helpful_Votes', 'Certified_Buyer']
+OUTPUT_COLUMNS = ['Product', 'Rating', 'Title', 'Description', 'Cleaned_Description']
 
 
 def clean_text(text):
-    if pd.isnull(text):
-        return ""
-    text = text.lower()
-    text = remove_emojis(text)
-    text = re.sub(r'READ MORE', '', text, flags=re.IGNORECASE)
-    text = re.sub(r'<[^>]+>', '', text)
-    text = re.sub(r'[^a-zA-Z0-9\s.,!?]', '', text)  # Remove all odd characters
-    text = ' '.join(text.split())  # Normalize whitespace
-    return text.strip().strip('.')  # Remove trailing dots
+    # Lower-case, remove emojis, READ MORE, HTML tags and odd characters, normalize
+    # whitespace and remove trailing dots (shared implementation in nlp_resources).
+    return nlp_resources.clean_text(text, lowercase=True, strip_emojis=True, strip_dots=True, tags_first=False)
 
 
 def preprocess_text(text):
     """Clean + remove stopwords + lemmatize."""
-    text = clean_text(text)
-    words = [lemmatizer.lemmatize(w) for w in text.split() if w.lower() not in stop_words]
-    return ' '.join(words)
+    return nlp_resources.remove_stopwords_and_lemmatize(clean_text(text))
 
-# 📥 Step 1: Load CSV files
-all_files = [f for f in os.listdir(csv_folder) if f.endswith(".csv")]
-df_list = []
 
-for file in all_files:
+def peak_rss_mb():
+    """Peak resident memory of this process (and of its largest child process) in MB."""
+    if resource is not None:
+        scale = 1024 * 1024 if sys.platform == 'darwin' else 1024  # ru_maxrss is bytes on macOS, KB on Linux.
+        own = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / scale
+        children = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss / scale
+        return own, children
     try:
-        path = os.path.join(csv_folder, file)
-        df = pd.read_csv(path)
-        print(f"✅ Loaded {file} with {len(df)} rows")
-        df_list.append(df)
-    except Exception as e:
-        print(f"⚠️ Skipped {file}: {e}")
-
-if not df_list:
-    print("❌ No valid CSV files found. Exiting.")
-    exit()
-
-# 🧩 Step 2: Combine and basic cleaning
-df = pd.concat(df_list, ignore_index=True)
-df = df.replace("N/A", pd.NA).dropna()
-df = df.drop_duplicates()
-
-# ❌ Step 3: Drop rows with empty essential fields
-df = df[
-    (df['Description'].astype(str).str.strip() != '') &
-    (df['Rating'].astype(str).str.strip() != '') &
-    (df['Title'].astype(str).str.strip() != '')
-]
-
-
-# ❌ Step 4: Drop unnecessary columns (if present)
-columns_to_drop = ['Name', 'Date', 'Helpful_Votes', 'Certified_Buyer']
-existing_columns_to_drop = [col for col in columns_to_drop if col in df.columns]
-df = df.drop(columns=existing_columns_to_drop)
-
-# 🧹 Step 5: Preprocess the Description
-print("🔄 Preprocessing review descriptions...")
-df['Cleaned_Description'] = df['Description'].apply(preprocess_text)
-# 💾 Step 6: Save final cleaned data
-df.to_csv(output_file, index=False)
-print(f"\n✅ Cleaned dataset saved to: {output_file}")
+        import psutil
+        info = psutil.Process().memory_info()
+        return getattr(info, 'peak_wset', info.rss) / 2**20, 0.0  # peak_wset is the Windows peak.
+    except ImportError:
+        return None, None
+
+
+def iter_review_chunks(files, chunk_size=READ_CHUNK_SIZE, storage=None, failed=None):
+    """Yield (file, DataFrame chunk) for every input file, reading at most chunk_size rows at a time.
+
+    `files` are relative to the storage backend's raw reviews folder (CSV by default).
+    Files that cannot be read are skipped with a warning and added to the `failed` set.
+    """
+    storage = storage or get_storage('csv', csv_folder, output_folder)
+    for file in files:
+        rows = 0
+        try:
+            path = os.path.join(storage.reviews_root, file)
+            # Everything is read as text: no per-chunk type inference, and identical
+            # values always get the same fingerprint.
+            # Only the time spent reading counts towards 'read', not the consumer's work between chunks.
+            for chunk in metrics.timed_iter('read', storage.iter_file_chunks(path, chunk_size)):
+                rows += len(chunk)
+                metrics.inc('rows_read', len(chunk))
+                yield file, chunk
+            logger.info("✅ Loaded %s with %d rows", file, rows)
+            metrics.inc('files_read')
+        except Exception as e:
+            logger.warning("⚠️ Skipped %s%s: %s", file, f' after {rows} rows' if rows else '', e)
+            metrics.inc('files_skipped')
+            if failed is not None:
+                failed.add(file)
+
+
+def drop_seen_rows(df, seen):
+    """Drop rows whose fingerprint is in `seen` (or repeats within df) and remember the rest."""
+    fingerprints = pd.util.hash_pandas_object(df, index=False).tolist()  # One 64-bit hash per row.
+    keep = []
+    for fingerprint in fingerprints:
+        keep.append(fingerprint not in seen)
+        seen.add(fingerprint)
+    return df[np.array(keep, dtype=bool)]  # A mask, so an empty chunk keeps its columns.
+
+
+def clean_chunk(df, seen):
+    """Steps 2-4 on one chunk: basic cleaning, streaming dedupe, empty fields, unused columns."""
+    # 🧩 Step 2: Basic cleaning and dedupe against every row seen so far
+    # Every chunk gets the same columns in the same order, as the old concat of all files
+    # did: missing columns become NaN (those rows are dropped below, not the whole run),
+    # and identical rows get the same fingerprint whatever a file's column order.
+    df = df.reindex(columns=RAW_COLUMNS)
+    df = df.replace("N/A", pd.NA).dropna()
+    df = drop_seen_rows(df, seen)
+
+    # ❌ Step 3: Drop rows with empty essential fields
+    df = df[(df[ESSENTIAL_COLUMNS].apply(lambda column: column.str.strip()) != '').all(axis=1)]
+
+    # ❌ Step 4: Drop unnecessary columns (if present)
+    df = df.drop(columns=[col for col in COLUMNS_TO_DROP if col in df.columns])
+    try:
+        df['Rating'] = df['Rating'].astype(float)  # Ratings are written as 5.0, as before.
+    except ValueError:
+        pass  # Leaves unusual rating text as it is.
+    return df
+
+
+# -------------------- MANIFEST --------------------
+
+def file_sha256(path):
+    """Content hash of a file, read in 1 MB blocks."""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def file_entry(path, sha256=None):
+    stat = os.stat(path)
+    return {'size': stat.st_size, 'mtime': stat.st_mtime, 'sha256': sha256 or file_sha256(path)}
+
+
+def load_manifest(dataset=output_file, storage='csv', near_duplicates=None):
+    """The manifest of the current dataset, or None when an incremental run is not possible.
+
+    `near_duplicates` is the near-duplicate threshold of this run (None when they are kept).
+    """
+    required = [manifest_file, dedupe_index_file, product_index_file, dataset]
+    if near_duplicates is not None:
+        required.append(near_duplicates_file)
+    if not all(os.path.exists(path) for path in required):
+        return None
+    with open(manifest_file, encoding='utf-8') as f:
+        manifest = json.load(f)
+    if manifest.get('storage', 'csv') != storage:  # Built from the other backend: rebuild.
+        logger.info("🔁 Dataset was built with --storage %s; rebuilding", manifest.get('storage', 'csv'))
+        return None
+    if manifest.get('columns') != OUTPUT_COLUMNS:  # Written before the Product column existed: rebuild.
+        logger.info("🔁 Dataset has different columns; rebuilding")
+        return None
+    if manifest.get('near_duplicates') != near_duplicates:  # Other near-duplicate setting: rebuild.
+        logger.info("🔁 Dataset was built with a different near-duplicate setting; rebuilding")
+        return None
+    if manifest.get('dataset') != dataset_state(dataset):  # Changed after the state was saved (e.g. a crash in between).
+        logger.info("🔁 Dataset does not match the saved dedupe state; rebuilding")
+        return None
+    return manifest
+
+
+def dataset_state(dataset):
+    """What the dataset looks like on disk: the CSV's size and mtime, or the names of the Parquet part files."""
+    if os.path.isdir(dataset):
+        return sorted(os.path.relpath(os.path.join(root, file), dataset)
+                      for root, _, files in os.walk(dataset) for file in files)
+    stat = os.stat(dataset)
+    return {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns}
+
+
+def save_state(manifest, seen, near_duplicates=None, dataset=output_file):
+    """Persist the manifest, the dedupe index and the near-duplicate signatures (written to temp files, then swapped in).
+
+    The manifest, written last, records the state of `dataset` it describes: if the
+    dataset was swapped in but the run stopped before this, or the dataset changed
+    since, load_manifest sees the mismatch and the next run rebuilds instead of
+    appending rows the saved dedupe index does not know about.
+    """
+    manifest['dataset'] = dataset_state(dataset)
+    np.save(dedupe_index_file + ".tmp.npy", np.fromiter(seen, dtype=np.uint64, count=len(seen)))
+    os.replace(dedupe_index_file + ".tmp.npy", dedupe_index_file)
+    if near_duplicates is not None:
+        near_duplicates.save(near_duplicates_file)
+    with open(manifest_file + ".tmp", 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=1, sort_keys=True)
+    os.replace(manifest_file + ".tmp", manifest_file)
+
+
+def files_to_process(all_files, manifest, root=None):
+    """Return {file: sha256} for new/changed input files and update the manifest for unchanged ones.
+
+    Size and mtime are checked first; only files whose size or mtime differ are hashed,
+    so an unchanged corpus costs one stat() per file.
+    """
+    pending = {}
+    for file in all_files:
+        path = os.path.join(root or csv_folder, file)
+        stat = os.stat(path)
+        entry = manifest['files'].get(file)
+        if entry and entry['size'] == stat.st_size and entry['mtime'] == stat.st_mtime:
+            continue  # Unchanged.
+        sha256 = file_sha256(path)
+        if entry and entry['sha256'] == sha256:  # Touched but identical content.
+            manifest['files'][file] = file_entry(path, sha256)
+            continue
+        pending[file] = sha256
+    removed = set(manifest['files']) - set(all_files)
+    if removed:  # Their rows stay in the dataset until a --full rebuild.
+        logger.warning("⚠️ %d input files were removed since the last run; use --full to drop their rows.", len(removed))
+    return pending
+
+
+# -------------------- OUTPUT --------------------
+
+class CsvDatasetWriter:
+    """Writes the cleaned dataset as one CSV.
+
+    A full run writes a temp file that replaces the old dataset only once it is complete;
+    an incremental run appends, and on failure truncates the file back to its old size
+    (and mtime) so it never holds rows the saved dedupe index does not know about.
+    """
+
+    def __init__(self, path, append):
+        self.path = path
+        self.append = append
+
+    def __enter__(self):
+        if self.append:
+            self.stat_before = os.stat(self.path)
+            self.out = open(self.path, 'a', newline='', encoding='utf-8')
+        else:
+            self.out = open(self.path + ".tmp", 'w', newline='', encoding='utf-8')
+        self.write_header = not self.append
+        return self
+
+    def write(self, df):
+        df.to_csv(self.out, header=self.write_header, index=False)
+        self.write_header = False
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None and self.write_header:  # Nothing survived cleaning: still write the header.
+            self.out.write(",".join(OUTPUT_COLUMNS) + "\n")
+        self.out.close()
+        if exc_type is not None:
+            if self.append:
+                with open(self.path, 'r+b') as out:
+                    out.truncate(self.stat_before.st_size)
+                os.utime(self.path, ns=(self.stat_before.st_atime_ns, self.stat_before.st_mtime_ns))
+            else:
+                os.remove(self.path + ".tmp")
+        elif not self.append:
+            os.replace(self.path + ".tmp", self.path)
+
+
+class ParquetDatasetWriter:
+    """Writes the cleaned dataset as Parquet part files (one per chunk).
+
+    A full run writes into a temp folder that is swapped in once complete; an
+    incremental run adds parts, and removes them again on failure.
+    """
+
+    def __init__(self, storage, append):
+        self.storage = storage
+        self.append = append
+
+    def __enter__(self):
+        self.root = self.storage.cleaned_root if self.append else self.storage.cleaned_root + ".tmp"
+        if not self.append:
+            shutil.rmtree(self.root, ignore_errors=True)
+        self.parts = []
+        return self
+
+    def write(self, df):
+        self.parts.append(self.storage.append_cleaned(df, self.root))
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is not None:
+            if self.append:
+                for part in self.parts:
+                    os.remove(part)
+            else:
+                shutil.rmtree(self.root, ignore_errors=True)
+            return
+        if not self.parts:  # Nothing survived cleaning: still write the schema.
+            self.write(pd.DataFrame(columns=OUTPUT_COLUMNS))
+        if not self.append:
+            self.storage.replace_cleaned(self.root)
+
+
+def dataset_writer(storage, append):
+    if storage.name == 'parquet':
+        return ParquetDatasetWriter(storage, append)
+    return CsvDatasetWriter(output_file, append)
+
+
+# -------------------- PIPELINE --------------------
+
+@profiled('combine_files')
+def combine_files(files, writer, seen, args, pool, storage=None, index=None, near_duplicates=None, failed=None):
+    """Stream `files` through steps 2-6 into the dataset `writer` (and the product `index`). Returns rows written.
+
+    With a NearDuplicateDetector, reviews nearly identical to one already kept are dropped as well.
+    Files that could not be read are added to `failed`.
+    """
+    written = 0
+    for file, chunk in iter_review_chunks(files, args.read_chunk_size, storage, failed):
+        # Steps 2-4: clean, dedupe and trim the chunk
+        with metrics.timer('clean'):
+            df = clean_chunk(chunk, seen)
+        metrics.inc('rows_dropped', len(chunk) - len(df))  # Incomplete, empty or duplicate rows.
+        # The product the file was scraped for; added after the dedupe so that the same
+        # review under two products is still only kept once.
+        df.insert(0, 'Product', product_for_file(file))
+
+        # 🧹 Step 5: Preprocess the Description
+        # Vectorised cleaning + cached lemmatization; same output as df['Description'].apply(preprocess_text).
+        # With --workers > 1 the rows are sharded across the process pool and reassembled in order.
+        with metrics.timer('preprocess'):
+            df['Cleaned_Description'] = preprocess_parallel(df['Description'], args.workers, args.chunk_size, pool)
+
+        # 🧬 Step 5b: Drop near-duplicates ("...READ MORE" copies, whitespace or one-word edits) of kept reviews
+        if near_duplicates is not None and len(df):
+            rows = len(df)
+            with metrics.timer('near_dedupe'):
+                df = df[near_duplicates.filter(df['Cleaned_Description'])]
+            metrics.inc('rows_near_duplicate', rows - len(df))
+
+        # 💾 Step 6: Append to the cleaned dataset
+        if len(df):
+            with metrics.timer('write'):
+                writer.write(df)
+            written += len(df)
+            metrics.inc('rows_written', len(df))
+            if index is not None:
+                with metrics.timer('index'):
+                    index.update(df)
+    return written
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Combine the scraped review CSVs into the cleaned dataset.")
+    parser.add_argument('--workers', type=int, default=1,
+                        help="processes used for preprocessing (default: 1, no pool)")
+    parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE,
+                        help=f"rows per shard sent to a worker (default: {DEFAULT_CHUNK_SIZE})")
+    parser.add_argument('--read-chunk-size', type=int, default=READ_CHUNK_SIZE,
+                        help=f"rows read from a CSV at a time (default: {READ_CHUNK_SIZE})")
+    parser.add_argument('--full', action='store_true',
+                        help="rebuild the dataset from every input file instead of only new/changed ones")
+    parser.add_argument('--storage', choices=sorted(BACKENDS), default=os.environ.get(STORAGE_ENV, 'csv'),
+                        help=f"read raw reviews and write the dataset as CSV or Parquet (default: ${STORAGE_ENV} or csv)")
+    parser.add_argument('--near-duplicate-threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help=f"estimated similarity from which a review is dropped as a near-duplicate "
+                             f"(default: {DEFAULT_THRESHOLD})")
+    parser.add_argument('--keep-near-duplicates', action='store_true',
+                        help="only drop exact duplicates, as before")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    setup_logging()
+
+    storage = get_storage(args.storage, csv_folder, output_folder)
+    dataset = storage.cleaned_root if storage.name == 'parquet' else output_file
+
+    # 📥 Step 1: Find the input files; an incremental run only streams the new or changed ones.
+    all_files = [os.path.relpath(path, storage.reviews_root) for path in storage.review_files()]
+    if not all_files:
+        logger.error("❌ No valid %s files found. Exiting.", storage.name.upper())
+        return
+
+    os.makedirs(output_folder, exist_ok=True)
+    threshold = None if args.keep_near_duplicates else args.near_duplicate_threshold
+    manifest = None if args.full else load_manifest(dataset, storage.name, threshold)
+    hashes = {}
+    near_duplicates = None
+    if manifest is not None:
+        hashes = files_to_process(all_files, manifest, storage.reviews_root)
+        files = list(hashes)
+        seen = set(np.load(dedupe_index_file).tolist())  # Fingerprints of every row already in the dataset.
+        if threshold is not None:
+            near_duplicates = NearDuplicateDetector.load(near_duplicates_file)
+        logger.info("🔁 Incremental run: %d new or changed of %d files", len(files), len(all_files))
+    else:
+        files = all_files
+        manifest = {'storage': storage.name, 'columns': OUTPUT_COLUMNS, 'near_duplicates': threshold, 'files': {}}
+        seen = set()  # Fingerprints of every row kept so far (8-byte hashes, not the rows themselves).
+        if threshold is not None:
+            near_duplicates = NearDuplicateDetector(threshold)
+
+    if not files:
+        save_state(manifest, seen, near_duplicates, dataset)  # Records refreshed mtimes of touched-but-identical files.
+        logger.info("✅ Cleaned dataset is up to date: %s", dataset)
+        return
+
+    incremental = bool(manifest['files'])
+    failed = set()  # Skipped files stay out of the manifest, so the next run tries them again.
+    pool = create_pool(args.workers) if args.workers > 1 else None  # One pool for the whole run.
+    try:
+        # Incremental runs append to the dataset, full runs replace it once complete. The
+        # product index is committed after the dataset is in place (rolled back on failure).
+        with ProductIndex(product_index_file) as index, dataset_writer(storage, append=incremental) as writer:
+            if not incremental:
+                index.clear()
+            written = combine_files(files, writer, seen, args, pool, storage, index, near_duplicates, failed)
+    finally:
+        if pool is not None:
+            pool.shutdown()
+
+    for file in files:
+        if file not in failed:
+            manifest['files'][file] = file_entry(os.path.join(storage.reviews_root, file), hashes.get(file))
+    save_state(manifest, seen, near_duplicates, dataset)
+
+    logger.info("✅ Cleaned dataset saved to: %s (%d %srows)", dataset, written, 'new ' if incremental else '')
+    if near_duplicates is not None:
+        spam = near_duplicates.spam_clusters()
+        logger.info("🧬 %d near-duplicates dropped%s", near_duplicates.duplicates,
+                    f"; {len(spam)} reviews were copied 5+ times (likely spam)" if spam else "")
+    own, children = peak_rss_mb()
+    if own is not None:
+        logger.info("📈 Peak RSS: %.1f MB%s", own, f" (largest worker: {children:.1f} MB)" if pool is not None else "")
+    metrics.log_summary(logger)
+    export_metrics('combine')
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,186 @@
+"""Local HTTP stand-in that replays a FixtureStore with injected latency, jitter and errors.
+
+Pages are served at http://127.0.0.1:<port>/<original host><original path>?<query>
+(FixtureServer.url_for rewrites a real URL), so the scraper runs unchanged against
+it: review pages, product pages and, through FixtureDriver, Google searches.
+
+Every response waits latency_ms plus a uniform 0..jitter_ms, and a share
+`error_rate` of requests is answered with `error_status` (503 by default, which
+HttpSession retries) instead of the page. Unknown URLs get a 404.
+
+    python fixture_server.py [--port 8000] [--latency-ms 200] [--jitter-ms 100] [--error-rate 0.02]
+"""
+import argparse # Imports argparse for the command line.
+import random # Imports random for jitter and error injection.
+import threading # Imports threading to run the server in the background and guard counters.
+import time # Imports time for the injected latency.
+from collections import Counter # Imports Counter for the request counters.
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer # Imports the local HTTP server.
+from urllib.parse import urlsplit # Imports URL parsing for the rewrites.
+import requests # Imports requests for FixtureDriver page loads.
+from bs4 import BeautifulSoup # Imports BeautifulSoup for FixtureDriver's CSS selectors.
+
+from fixture_store import FIXTURES_DIR, FixtureStore # Imports the recorded pages.
+
+class FixtureServer:
+    """Serve `store` on a background thread. Use as a context manager, or call close()."""
+
+    def __init__(self, store, latency_ms=0, jitter_ms=0, error_rate=0.0, error_status=503, seed=None,
+                 host='127.0.0.1', port=0):
+        self.store = store
+        self.latency = latency_ms / 1000
+        self.jitter = jitter_ms / 1000
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.random = random.Random(seed)
+        self.lock = threading.Lock()
+        self.counts = Counter() # 'requests', 'served', 'errors', 'not_found'.
+        self.server = ThreadingHTTPServer((host, port), self._handler())
+        self.server.daemon_threads = True
+        self.base_url = f"http://{host}:{self.server.server_port}"
+        self.thread = threading.Thread(target=self.server.serve_forever, name='fixture-server', daemon=True)
+        self.thread.start()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def url_for(self, url):
+        """The stand-in URL serving the page recorded for `url`."""
+        parts = urlsplit(url)
+        return f"{self.base_url}/{parts.netloc}{parts.path}" + (f"?{parts.query}" if parts.query else "")
+
+    def original_url(self, path):
+        """Inverse of url_for for a request path (/<host>/<path>?<query>)."""
+        return "https:/" + path
+
+    def _count(self, key):
+        with self.lock:
+            self.counts[key] += 1
+
+    def _respond(self, path):
+        """(status, content type, body) for a request, after the injected delay."""
+        with self.lock: # random.Random is shared by the handler threads.
+            delay = self.latency + self.random.uniform(0, self.jitter)
+            fail = self.random.random() < self.error_rate
+        self._count('requests')
+        time.sleep(delay)
+        if fail:
+            self._count('errors')
+            return self.error_status, 'text/plain', b'injected error'
+        response = self.store.get(self.original_url(path))
+        if response is None:
+            self._count('not_found')
+            return 404, 'text/plain', b'no fixture for this URL'
+        self._count('served')
+        return response
+
+    def _handler(self):
+        server = self
+
+        class FixtureHandler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1' # Keep-alive, as the pooled HttpSession expects.
+            disable_nagle_algorithm = True # Headers and body go out as separate writes.
+
+            def do_GET(self):
+                status, content_type, body = server._respond(self.path)
+                self.send_response(status)
+                self.send_header('Content-Type', content_type)
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args): # Keeps the console quiet; counts has the numbers.
+                pass
+
+        return FixtureHandler
+
+    def stats(self):
+        with self.lock:
+            return dict(self.counts)
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+# -------------------- WEBDRIVER STAND-IN --------------------
+
+class FixtureElement:
+    """The slice of a Selenium WebElement get_product_links uses."""
+
+    def __init__(self, tag):
+        self.tag = tag
+
+    @property
+    def text(self):
+        return self.tag.get_text()
+
+    def get_attribute(self, name):
+        return self.tag.get(name)
+
+    def find_element(self, by, value):
+        elements = self.find_elements(by, value)
+        if not elements:
+            raise LookupError(f"no element matches {value!r}")
+        return elements[0]
+
+    def find_elements(self, by, value): # Only CSS selectors are supported, the only kind the scraper uses.
+        return [FixtureElement(tag) for tag in self.tag.select(value)]
+
+class FixtureDriver(FixtureElement):
+    """WebDriver replacement that loads pages from a FixtureServer, for DriverPool(factory=...).
+
+    get_product_links runs unchanged on it, so Google lookups can be replayed
+    with the same latency and errors as the review pages.
+    """
+
+    def __init__(self, server):
+        super().__init__(BeautifulSoup('', 'html.parser'))
+        self.server = server
+        self.http = requests.Session()
+        self.current_url = None
+        self.page_source = ''
+
+    def get(self, url):
+        response = self.http.get(self.server.url_for(url), timeout=30)
+        if response.status_code != 200: # A browser would show an error page without results; fail fast instead.
+            raise RuntimeError(f"fixture server answered {response.status_code} for {url}")
+        self.current_url = url
+        self.page_source = response.text
+        self.tag = BeautifulSoup(response.content, 'html.parser')
+
+    def set_page_load_timeout(self, seconds):
+        pass
+
+    def quit(self):
+        self.http.close()
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve recorded fixtures with injected latency and errors.")
+    parser.add_argument('--dir', default=FIXTURES_DIR, help="fixture store directory")
+    parser.add_argument('--port', type=int, default=8000)
+    parser.add_argument('--latency-ms', type=float, default=0)
+    parser.add_argument('--jitter-ms', type=float, default=0)
+    parser.add_argument('--error-rate', type=float, default=0.0, help="share of requests answered with an error")
+    parser.add_argument('--error-status', type=int, default=503)
+    parser.add_argument('--seed', type=int)
+    args = parser.parse_args()
+
+    store = FixtureStore(args.dir)
+    if not len(store):
+        parser.error("the fixture store is empty; run fixture_store.py record or synthesize first")
+    with FixtureServer(store, args.latency_ms, args.jitter_ms, args.error_rate, args.error_status, args.seed,
+                       port=args.port) as server:
+        print(f"🚀 Serving {len(store)} fixtures on {server.base_url}")
+        for product in store.products:
+            print(f"  {server.url_for(product)}")
+        try:
+            server.thread.join()
+        except KeyboardInterrupt:
+            pass
+        print(f"📊 {server.stats()}")
+
+if __name__ == "__main__":
+    main()
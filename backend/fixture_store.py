@@ -0,0 +1,218 @@
+"""Recorded HTTP fixtures for replaying scrapes offline.
+
+A FixtureStore keeps fetched pages (status, content type and body) keyed on their
+normalised URL, plus the product links and search names they belong to, so that
+fixture_server can serve them back without touching Flipkart or Google.
+
+Pages get into a store by recording a real scrape (the shared HttpSession is
+swapped for a RecordingSession, and ChromeDrivers are wrapped in RecordingDriver)
+or by synthesising Flipkart-like pages from the scraped review CSVs.
+
+    python fixture_store.py record <product link>... [--search NAME]... [--max-pages N]
+    python fixture_store.py synthesize [--pages N]
+    python fixture_store.py list
+"""
+import argparse # Imports argparse for the command line.
+import hashlib # Imports hashlib to name the body files.
+import json # Imports json for the store index.
+import os # Imports os for path handling.
+import threading # Imports threading to guard the index while scraper threads record.
+from urllib.parse import parse_qsl, urlencode, urlsplit # Imports URL parsing for the fixture keys.
+
+from html_fixtures import REVIEWS_PER_PAGE, load_review_rows, render_product_page, render_review_page # Imports the page renderers.
+from http_session import HttpSession # Imports the session the recorder extends.
+from page_fetcher import page_url_for # Imports the review page URL scheme.
+
+# Repository-relative data folders.
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'data')
+FIXTURES_DIR = os.path.join(DATA_DIR, 'fixtures', 'http') # index.json plus bodies/<sha1>.html.
+
+SYNTHETIC_PRODUCT_URL = "https://www.flipkart.com/synthetic-phone/p/itmsynthetic0001?pid=SYNTHETIC0001"
+SYNTHETIC_SEARCH = "synthetic phone"
+
+def fixture_key(url):
+    """Normalised URL a page is stored under: lower-case host, path and sorted query, scheme ignored."""
+    parts = urlsplit(url)
+    query = urlencode(sorted(parse_qsl(parts.query, keep_blank_values=True)))
+    return f"{parts.netloc.lower()}{parts.path or '/'}" + (f"?{query}" if query else "")
+
+def google_search_url(product_name):
+    """The Google search URL get_product_links opens for `product_name`."""
+    search_query = f"{product_name} site:flipkart.com"
+    return f"https://www.google.com/search?q={search_query.replace(' ', '+')}"
+
+def reviews_url(product_url):
+    return product_url.replace("/p/", "/product-reviews/") # Same as Review_Extractor.modify_reviews_url.
+
+class FixtureStore:
+    """Directory of recorded responses. Call save() to write the index after adding pages."""
+
+    def __init__(self, directory=FIXTURES_DIR):
+        self.directory = directory
+        self.bodies_dir = os.path.join(directory, 'bodies')
+        self.index_path = os.path.join(directory, 'index.json')
+        self.lock = threading.Lock()
+        index = {}
+        if os.path.exists(self.index_path):
+            with open(self.index_path, encoding='utf-8') as f:
+                index = json.load(f)
+        self.pages = index.get('pages', {}) # key -> {url, status, content_type, body}
+        self.products = index.get('products', []) # Product links with recorded review pages.
+        self.searches = index.get('searches', {}) # Search name -> links found for it.
+
+    def __len__(self):
+        return len(self.pages)
+
+    def add(self, url, body, status=200, content_type='text/html; charset=utf-8'):
+        """Store one response; identical bodies share a file."""
+        name = hashlib.sha1(body).hexdigest() + '.html'
+        path = os.path.join(self.bodies_dir, name)
+        os.makedirs(self.bodies_dir, exist_ok=True)
+        if not os.path.exists(path):
+            with open(path, 'wb') as f:
+                f.write(body)
+        with self.lock:
+            self.pages[fixture_key(url)] = {'url': url, 'status': status, 'content_type': content_type, 'body': name}
+
+    def get(self, url):
+        """(status, content type, body bytes) recorded for `url`, or None."""
+        entry = self.pages.get(fixture_key(url))
+        if entry is None:
+            return None
+        with open(os.path.join(self.bodies_dir, entry['body']), 'rb') as f:
+            return entry['status'], entry['content_type'], f.read()
+
+    def add_product(self, product_url):
+        with self.lock:
+            if product_url not in self.products:
+                self.products.append(product_url)
+
+    def add_search(self, product_name, links):
+        with self.lock:
+            self.searches[product_name] = list(links)
+
+    def review_pages(self, product_url):
+        """Bodies of the product's recorded review pages (status 200), in page order."""
+        pages = []
+        page = 1
+        while True:
+            response = self.get(page_url_for(reviews_url(product_url), page))
+            if response is None or response[0] != 200:
+                return pages
+            pages.append(response[2])
+            page += 1
+
+    def save(self):
+        """Write the index atomically."""
+        os.makedirs(self.directory, exist_ok=True)
+        with self.lock:
+            index = {'pages': self.pages, 'products': self.products, 'searches': self.searches}
+            tmp_path = self.index_path + '.tmp'
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(index, f, indent=1, ensure_ascii=False)
+            os.replace(tmp_path, self.index_path)
+
+# -------------------- RECORDING --------------------
+
+class RecordingSession(HttpSession):
+    """HttpSession that also stores every response it returns in a FixtureStore."""
+
+    def __init__(self, store, **kwargs):
+        super().__init__(**kwargs)
+        self.store = store
+
+    def get(self, url, **kwargs):
+        response = super().get(url, **kwargs)
+        self.store.add(url, response.content, response.status_code,
+                       response.headers.get('Content-Type', 'text/html; charset=utf-8'))
+        return response
+
+class RecordingDriver:
+    """Wraps a WebDriver and stores the page source once its search results are present."""
+
+    def __init__(self, driver, store):
+        self.driver = driver
+        self.store = store
+        self.requested_url = None # Stored under the URL asked for, not where Google redirected to.
+
+    def __getattr__(self, name):
+        return getattr(self.driver, name)
+
+    def get(self, url):
+        self.requested_url = url
+        self.driver.get(url)
+
+    def find_elements(self, by, value):
+        elements = self.driver.find_elements(by, value)
+        if elements and self.requested_url: # WebDriverWait polls until results appear; the page is complete from then on.
+            self.store.add(self.requested_url, self.driver.page_source.encode('utf-8'))
+            self.requested_url = None
+        return elements
+
+def record(store, links, searches=(), max_pages=15):
+    """Scrape `links` (review pages and product page) and Google `searches` into `store`."""
+    # Imported here: the scraper pulls in Selenium and NLTK, which synthesising does not need.
+    from http_session import set_session
+    from Link_Extractor import DriverPool, create_chrome_driver, get_product_links
+    from Review_Extractor import get_product_details, get_reviews
+
+    previous = set_session(RecordingSession(store))
+    try:
+        for link in links:
+            get_reviews(reviews_url(link), max_pages)
+            get_product_details(link)
+            store.add_product(link)
+        if searches:
+            with DriverPool(factory=lambda: RecordingDriver(create_chrome_driver(), store)) as pool:
+                for name in searches:
+                    store.add_search(name, get_product_links(name, pool=pool, use_cache=False))
+    finally:
+        set_session(previous)
+    store.save()
+
+# -------------------- SYNTHETIC PAGES --------------------
+
+def render_search_page(links):
+    """Google results page with one result block per link, as get_product_links reads it."""
+    results = ''.join(f'<div class="g"><div class="tF2Cxc"><a href="{link}"><h3>Result {i}</h3></a></div></div>'
+                      for i, link in enumerate(links, 1))
+    return f'<!doctype html><html><head><title>Search</title></head><body><div id="search">{results}</div></body></html>'.encode('utf-8')
+
+def synthesize(store, rows=None, pages=20, product_url=SYNTHETIC_PRODUCT_URL, search=SYNTHETIC_SEARCH):
+    """Add a product built from the scraped review CSVs: `pages` review pages, its product page and a search."""
+    rows = load_review_rows() if rows is None else rows
+    base_url = reviews_url(product_url)
+    for page in range(1, pages + 1):
+        start = (page - 1) * REVIEWS_PER_PAGE
+        store.add(page_url_for(base_url, page), render_review_page(rows[start:start + REVIEWS_PER_PAGE]))
+    store.add(page_url_for(base_url, pages + 1), render_review_page([])) # The listing ends with an empty page.
+    store.add(product_url, render_product_page())
+    store.add(google_search_url(search), render_search_page([product_url]))
+    store.add_product(product_url)
+    store.add_search(search, [product_url])
+    store.save()
+    return product_url
+
+def main():
+    parser = argparse.ArgumentParser(description="Record or synthesise HTTP fixtures for offline scraping.")
+    parser.add_argument('command', choices=['record', 'synthesize', 'list'])
+    parser.add_argument('links', nargs='*', help="product links to record")
+    parser.add_argument('--search', action='append', default=[], help="product name to record a Google search for")
+    parser.add_argument('--max-pages', type=int, default=15)
+    parser.add_argument('--pages', type=int, default=20, help="review pages to synthesise")
+    parser.add_argument('--dir', default=FIXTURES_DIR, help="fixture store directory")
+    args = parser.parse_args()
+
+    store = FixtureStore(args.dir)
+    if args.command == 'record':
+        if not args.links and not args.search:
+            parser.error("record needs product links and/or --search names")
+        record(store, args.links, args.search, args.max_pages)
+    elif args.command == 'synthesize':
+        print(f"🔁 Synthesised {synthesize(store, pages=args.pages)}")
+    print(f"📋 {len(store)} pages, {len(store.products)} products, {len(store.searches)} searches in {args.dir}")
+    for product in store.products:
+        print(f"  {product}: {len(store.review_pages(product))} review pages")
+
+if __name__ == "__main__":
+    main()
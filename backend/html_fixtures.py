@@ -0,0 +1,81 @@
+import csv # Imports csv to read scraped reviews without pulling in pandas.
+import glob # Imports glob to list fixture and review files.
+import html # Imports html to escape review text when rendering pages.
+import os # Imports os for path handling.
+
+# Repository-relative data folders.
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'data')
+REVIEWS_DIR = os.path.join(DATA_DIR, 'reviews') # Scraped review CSVs.
+HTML_FIXTURES_DIR = os.path.join(DATA_DIR, 'fixtures', 'html') # Saved Flipkart review pages (*.html).
+
+REVIEWS_PER_PAGE = 10 # Flipkart shows ten reviews per review page.
+
+def load_html_fixtures(directory=HTML_FIXTURES_DIR):
+    """Return {file name: page bytes} for every saved .html page in `directory`."""
+    pages = {}
+    for path in sorted(glob.glob(os.path.join(directory, '*.html'))):
+        with open(path, 'rb') as f:
+            pages[os.path.basename(path)] = f.read()
+    return pages
+
+def load_review_rows(directory=REVIEWS_DIR):
+    """Read every scraped review CSV in `directory` as a list of dicts, skipping empty rows."""
+    rows = []
+    for path in sorted(glob.glob(os.path.join(directory, '*.csv'))):
+        with open(path, newline='', encoding='utf-8') as f:
+            rows.extend(row for row in csv.DictReader(f) if row.get('Description', 'N/A') != 'N/A')
+    return rows
+
+def render_review(review):
+    """Render one review with the markup Flipkart uses for a review container."""
+    e = lambda key, default='': html.escape(str(review.get(key, default))) # noqa: E731
+    description = str(review.get('Description', ''))
+    if description.endswith('READ MORE'): # Scraped text already carries the link label rendered below.
+        description = description[:-len('READ MORE')]
+    certified = '<p class="MztJPv"><span>Certified Buyer</span></p>' if review.get('Certified_Buyer') == 'Yes' else ''
+    return (
+        '<div class="col EPCmJX Ma1fCG"><div class="cPHDOP col-12-12"><div class="row">'
+        f'<div class="XQDdHH Ga3i8K">{e("Rating")}<img class="Rza2QY" src="data:image/svg+xml;base64,"></div>'
+        f'<p class="z9E0IG">{e("Title")}</p></div>'
+        f'<div class="row"><div class="ZmyHeo"><div><div class="">{html.escape(description)}</div>'
+        '<span class="wTYmpv"><span>READ MORE</span></span></div></div></div>'
+        '<div class="row gHqwa8"><div class="row">'
+        f'<p class="_2NsDsF AwS1CA">{e("Name")}</p>{certified}'
+        f'<p class="_2NsDsF">{e("Date")}</p></div>'
+        f'<div class="_1e9_Zu"><div class="qhmk-f"><span class="tl9VpF">{e("Helpful_Votes", "0")}</span></div></div>'
+        '</div></div></div>'
+    )
+
+def render_review_page(reviews):
+    """Render a review listing page around `reviews`, with page chrome similar in size to Flipkart's."""
+    # Navigation, filters and scripts make up most of a real page; they are included so
+    # that parse timings reflect whole-document cost, not just the review markup.
+    chrome = ''.join(f'<li class="_1jKL3b"><a href="/c/{i}">Category {i}</a></li>' for i in range(150))
+    script = '<script>window.__INITIAL_STATE__ = {' + ','.join(f'"k{i}": {i}' for i in range(2000)) + '};</script>'
+    body = ''.join(render_review(review) for review in reviews)
+    return (
+        '<!doctype html><html lang="en"><head><meta charset="utf-8"><title>Reviews</title>'
+        f'{script}</head><body><div id="container"><header><ul>{chrome}</ul></header>'
+        f'<div class="DOjaWF gdgoEp col-9-12">{body}</div></div></body></html>'
+    ).encode('utf-8')
+
+def render_product_page(price='₹19,999', image_url='https://rukminim2.flixcart.com/image/synthetic.jpeg'):
+    """Render a product page with the price and image markup get_product_details reads."""
+    return (
+        '<!doctype html><html lang="en"><head><meta charset="utf-8"><title>Product</title></head><body>'
+        f'<div class="Nx9bqj CxhGGd">{html.escape(price)}</div>'
+        f'<img class="DByuf4 IZexXJ jLEJ7H" src="{html.escape(image_url)}" alt="product">'
+        '</body></html>'
+    ).encode('utf-8')
+
+def build_synthetic_pages(rows=None, per_page=REVIEWS_PER_PAGE):
+    """Render the scraped CSV reviews into Flipkart-like review pages ({name: bytes})."""
+    rows = load_review_rows() if rows is None else rows
+    return {
+        f'synthetic_{start // per_page + 1:04d}.html': render_review_page(rows[start:start + per_page])
+        for start in range(0, len(rows), per_page)
+    }
+
+def load_benchmark_pages(directory=HTML_FIXTURES_DIR):
+    """Saved fixtures when there are any, otherwise pages synthesised from the scraped CSVs."""
+    return load_html_fixtures(directory) or build_synthetic_pages()
@@ -0,0 +1,167 @@
+import random # Imports random for jittered backoff delays.
+import threading # Imports threading to guard the shared statistics and session creation.
+import time # Imports time for measuring latency and sleeping between retries.
+from collections import deque # Imports deque for the bounded latency window.
+import requests # Imports requests, whose Session provides connection pooling and keep-alive.
+from requests.adapters import HTTPAdapter # Imports HTTPAdapter to size the connection pool.
+from pipeline_metrics import get_metrics # Imports the pipeline-wide counters.
+
+try: # brotli is optional; requests/urllib3 only decode 'br' responses when it is installed.
+    import brotli  # noqa: F401
+    ACCEPT_ENCODING = 'gzip, deflate, br'
+except ImportError:
+    ACCEPT_ENCODING = 'gzip, deflate'
+
+# Headers to avoid request blocking
+DEFAULT_HEADERS = {
+    # A browser User-Agent makes the request look like it comes from a web browser,
+    # which helps with basic bot detection. Accept-Encoding asks for compressed pages.
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
+    'Accept-Encoding': ACCEPT_ENCODING,
+    'Connection': 'keep-alive',
+}
+
+RETRY_STATUSES = {429, 500, 502, 503, 504} # Status codes worth retrying (throttling and transient server errors).
+DEFAULT_TIMEOUT = (5, 20) # (connect, read) timeouts in seconds.
+DEFAULT_MAX_RETRIES = 3 # Retries after the first attempt.
+DEFAULT_BACKOFF = 1.0 # Base delay in seconds, doubled on every retry.
+MAX_BACKOFF = 30.0 # Upper bound for a single backoff delay.
+POOL_SIZE = 16 # Keep-alive connections kept per host; should cover the fetcher's concurrency cap.
+LATENCY_WINDOW = 10_000 # Latest request latencies kept for the percentiles.
+
+# -------------------- STATISTICS --------------------
+
+class RequestStats:
+    """Thread-safe counters and latency samples for every request made through a session."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        """Clear all counters."""
+        with self.lock:
+            self.requests = 0 # Logical requests (one per call to get()).
+            self.attempts = 0 # HTTP attempts including retries.
+            self.retries = 0 # Attempts beyond the first.
+            self.failures = 0 # Requests that ended with an exception or a retryable status.
+            self.retries_by_reason = {} # e.g. {'429': 3, 'ConnectionError': 1}.
+            self.latencies = deque(maxlen=LATENCY_WINDOW) # Seconds per request, including retries and backoff.
+            self.latency_max = 0.0 # Slowest request ever, also outside the window.
+
+    def record(self, latency, attempts, reasons, failed):
+        with self.lock:
+            self.requests += 1
+            self.attempts += attempts
+            self.retries += attempts - 1
+            self.failures += int(failed)
+            for reason in reasons: # Counts why each retry happened.
+                self.retries_by_reason[reason] = self.retries_by_reason.get(reason, 0) + 1
+            self.latencies.append(latency)
+            self.latency_max = max(self.latency_max, latency)
+        metrics = get_metrics() # The same counts, pipeline-wide, for the metric exporters.
+        metrics.inc('http_requests')
+        metrics.inc('http_retries', attempts - 1)
+        metrics.inc('http_failures', int(failed))
+        metrics.add_time('http', latency)
+
+    def summary(self):
+        """Return the counters plus latency percentiles (in milliseconds, over the latest LATENCY_WINDOW requests) as a dict."""
+        with self.lock:
+            latencies = sorted(self.latencies)
+            latency_max = self.latency_max
+            summary = {
+                'requests': self.requests,
+                'attempts': self.attempts,
+                'retries': self.retries,
+                'failures': self.failures,
+                'retries_by_reason': dict(self.retries_by_reason),
+            }
+        if latencies:
+            def percentile(q):
+                return round(latencies[min(len(latencies) - 1, int(q * len(latencies)))] * 1000, 1)
+            summary.update({
+                'latency_mean_ms': round(sum(latencies) / len(latencies) * 1000, 1),
+                'latency_p50_ms': percentile(0.50),
+                'latency_p95_ms': percentile(0.95),
+                'latency_max_ms': round(latency_max * 1000, 1),
+            })
+        return summary
+
+# -------------------- SESSION --------------------
+
+class HttpSession:
+    """Pooled keep-alive HTTP session with timeouts, bounded jittered retries and statistics."""
+
+    def __init__(self, headers=None, timeout=DEFAULT_TIMEOUT, max_retries=DEFAULT_MAX_RETRIES,
+                 backoff=DEFAULT_BACKOFF, pool_size=POOL_SIZE):
+        self.session = requests.Session() # One Session reuses TCP/TLS connections across requests.
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size) # Retries are handled below, not by urllib3.
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+        self.session.headers.update(headers or DEFAULT_HEADERS)
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.stats = RequestStats()
+
+    def _delay(self, attempt, response=None):
+        """Backoff before retry number `attempt` (1-based), honouring Retry-After when given."""
+        if response is not None:
+            retry_after = response.headers.get('Retry-After')
+            if retry_after and retry_after.isdigit(): # Server told us how long to wait.
+                return min(MAX_BACKOFF, float(retry_after))
+        # Full jitter: a random delay between 0 and the exponential cap spreads retries out.
+        return random.uniform(0, min(MAX_BACKOFF, self.backoff * 2 ** (attempt - 1)))
+
+    def get(self, url, **kwargs):
+        """GET `url`, retrying connection errors, timeouts and 429/5xx responses.
+
+        Returns the last response (which may still carry an error status once the
+        retries are used up) or raises the last exception if no response was received.
+        """
+        kwargs.setdefault('timeout', self.timeout)
+        start = time.perf_counter()
+        reasons = [] # Why each retry happened, for the statistics.
+        attempt = 0
+        while True:
+            attempt += 1
+            response, error = None, None
+            try:
+                response = self.session.get(url, **kwargs)
+                if response.status_code not in RETRY_STATUSES: # Success or a non-retryable error.
+                    self.stats.record(time.perf_counter() - start, attempt, reasons, failed=False)
+                    return response
+                reason = str(response.status_code)
+            except (requests.ConnectionError, requests.Timeout) as e: # Network-level failures are retryable.
+                error = e
+                reason = type(e).__name__
+            if attempt > self.max_retries: # Retries exhausted, give the caller the last outcome.
+                self.stats.record(time.perf_counter() - start, attempt, reasons, failed=True)
+                if error is not None:
+                    raise error
+                return response
+            reasons.append(reason)
+            time.sleep(self._delay(attempt, response))
+
+    def close(self):
+        self.session.close()
+
+
+_session = None # Shared session used by every Flipkart request in the process.
+_session_lock = threading.Lock()
+
+def get_session():
+    """Return the process-wide HttpSession, creating it on first use."""
+    global _session
+    with _session_lock:
+        if _session is None:
+            _session = HttpSession()
+        return _session
+
+def set_session(session):
+    """Replace the process-wide HttpSession (e.g. with a recording one); returns the previous one."""
+    global _session
+    with _session_lock:
+        previous, _session = _session, session
+        return previous
@@ -0,0 +1,115 @@
+import json # Imports json to store link lists in a single column.
+import os # Imports os for the cache file location.
+import re # Imports re to normalise product names.
+import sqlite3 # Imports sqlite3 for the on-disk cache.
+import threading # Imports threading because the cache is shared by batch lookup threads.
+import time # Imports time for TTL and LRU timestamps.
+
+# Repository-relative default location of the cache database.
+DEFAULT_CACHE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'data', 'cache', 'product_links.sqlite')
+DEFAULT_TTL = 7 * 24 * 3600 # Resolved links are trusted for a week.
+DEFAULT_NEGATIVE_TTL = 6 * 3600 # "No links found" is retried after six hours; it is often a transient Google failure.
+DEFAULT_MAX_ENTRIES = 10000 # Least recently used entries beyond this are evicted.
+
+def normalize_product_name(name):
+    """Cache key for a product name: lower-case, single-spaced, trimmed."""
+    return re.sub(r'\s+', ' ', str(name)).strip().lower()
+
+class LinkCache:
+    """SQLite cache of product name -> Flipkart links with TTL, LRU eviction and negative caching."""
+
+    def __init__(self, path=DEFAULT_CACHE_PATH, ttl=DEFAULT_TTL, negative_ttl=DEFAULT_NEGATIVE_TTL,
+                 max_entries=DEFAULT_MAX_ENTRIES):
+        if path != ':memory:':
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.max_entries = max_entries
+        self.lock = threading.Lock() # One connection shared between threads, serialised by this lock.
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS product_links ("
+            " name TEXT PRIMARY KEY,"  # Normalised product name.
+            " links TEXT NOT NULL,"  # JSON list; '[]' is a negative entry.
+            " stored_at REAL NOT NULL,"  # When the links were resolved (TTL).
+            " accessed_at REAL NOT NULL)"  # Last hit (LRU).
+        )
+        self.conn.execute("CREATE INDEX IF NOT EXISTS product_links_accessed ON product_links (accessed_at)")
+        self.conn.commit()
+        self.hits = 0 # Lookups answered with links.
+        self.negative_hits = 0 # Lookups answered with a cached "no links".
+        self.misses = 0 # Lookups that need a Google search.
+
+    def get(self, name):
+        """Return the cached links for `name` ([] for a cached miss) or None when not cached/expired."""
+        key = normalize_product_name(name)
+        now = time.time()
+        with self.lock:
+            row = self.conn.execute("SELECT links, stored_at FROM product_links WHERE name = ?", (key,)).fetchone()
+            if row is not None:
+                links = json.loads(row[0])
+                ttl = self.ttl if links else self.negative_ttl
+                if now - row[1] <= ttl: # Still fresh: count the hit and refresh its LRU position.
+                    self.conn.execute("UPDATE product_links SET accessed_at = ? WHERE name = ?", (now, key))
+                    self.conn.commit()
+                    if links:
+                        self.hits += 1
+                    else:
+                        self.negative_hits += 1
+                    return links
+                self.conn.execute("DELETE FROM product_links WHERE name = ?", (key,)) # Expired.
+                self.conn.commit()
+            self.misses += 1
+            return None
+
+    def put(self, name, links):
+        """Store the links found for `name`; an empty list records a negative result."""
+        key = normalize_product_name(name)
+        now = time.time()
+        with self.lock:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO product_links (name, links, stored_at, accessed_at) VALUES (?, ?, ?, ?)",
+                (key, json.dumps(list(links)), now, now),
+            )
+            # LRU eviction: keep only the max_entries most recently used names.
+            self.conn.execute(
+                "DELETE FROM product_links WHERE name NOT IN "
+                "(SELECT name FROM product_links ORDER BY accessed_at DESC LIMIT ?)",
+                (self.max_entries,),
+            )
+            self.conn.commit()
+
+    def invalidate(self, name):
+        """Drop the entry for `name` so the next lookup searches again."""
+        with self.lock:
+            self.conn.execute("DELETE FROM product_links WHERE name = ?", (normalize_product_name(name),))
+            self.conn.commit()
+
+    def stats(self):
+        """Hit/miss counters for this process plus the number of stored entries."""
+        with self.lock:
+            entries = self.conn.execute("SELECT COUNT(*) FROM product_links").fetchone()[0]
+        lookups = self.hits + self.negative_hits + self.misses
+        return {
+            'hits': self.hits,
+            'negative_hits': self.negative_hits,
+            'misses': self.misses,
+            'hit_rate': round((self.hits + self.negative_hits) / lookups, 3) if lookups else 0.0,
+            'entries': entries,
+        }
+
+    def close(self):
+        with self.lock:
+            self.conn.close()
+
+
+_default_cache = None # Shared cache used by get_product_links.
+_default_cache_lock = threading.Lock()
+
+def get_default_cache():
+    """Return the process-wide LinkCache, opening it on first use."""
+    global _default_cache
+    with _default_cache_lock:
+        if _default_cache is None:
+            _default_cache = LinkCache()
+        return _default_cache
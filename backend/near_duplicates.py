@@ -0,0 +1,278 @@
+"""Near-duplicate and spam review detection with MinHash signatures and LSH banding.
+
+Exact dedupe (drop_duplicates, the combine fingerprints) misses reviews that differ
+only by a "...READ MORE" tail, whitespace or a word or two. Each review's text is
+turned into a set of character 5-gram shingles, summarised by a MinHash signature
+(`num_perm` hash minima, whose agreement estimates the Jaccard similarity of two
+shingle sets) and split into `bands` bands. Reviews sharing a band land in the same
+bucket and become candidates; a candidate is a duplicate when its estimated
+similarity reaches `threshold`.
+
+A review cut off by "...READ MORE" (or its full version, when the cut one came
+first) can be far below `threshold` in Jaccard terms, since the cut loses most of
+the text. Every kept review is therefore also indexed by the signature of its first
+PREFIX_SIZE bytes, and a review that shares an opening with a kept one is a
+duplicate when the smaller of the two shingle sets is at least `threshold`
+contained in the larger. Containment is estimated from the same signatures: where
+one review's minimum is strictly below the other's, its minimum shingle is missing
+from the other review, so a strict subset never has a lower entry.
+
+Every review is compared only with the few kept reviews in its buckets, so time and
+memory grow linearly with the number of reviews instead of quadratically: about
+2.5 KB per kept review (a 256-byte signature and one bucket entry per band and
+prefix band), and ~17k reviews/s on one core (benchmark_near_duplicates.py).
+
+The first review of a group is kept. Groups with many copies (`spam_clusters`) are
+likely template or paid reviews. Reviews of fewer than `min_tokens` words ("good
+product") are never treated as duplicates: identical short praise from different
+buyers is normal.
+
+    detector = NearDuplicateDetector()
+    keep = detector.filter(df['Cleaned_Description'])     # batch: boolean mask per row
+    detector.check(text)                                   # streaming: id of the kept original, or None
+"""
+import os # Imports os for the saved index path.
+import numpy as np # Imports numpy for vectorised shingling and MinHash.
+
+DEFAULT_THRESHOLD = 0.8 # Estimated Jaccard similarity from which reviews are near-duplicates.
+DEFAULT_NUM_PERM = 64 # Hash functions per signature.
+DEFAULT_BANDS = 16 # LSH bands (4 rows each): pairs at 0.8 similarity share a band with ~99.9% probability.
+DEFAULT_MIN_TOKENS = 5 # Shorter reviews are never near-duplicates.
+SHINGLE_SIZE = 5 # Characters per shingle.
+PREFIX_SIZE = 40 # Opening bytes indexed to find truncated copies (and originals of truncated reviews).
+PREFIX_BANDS = 8 # LSH bands of the opening's signature (8 rows each): truncated copies share it exactly.
+SEED = 20250710 # Fixed, so signatures saved by one run match those of the next.
+TRUNCATION_MARKERS = ('...read more', 'read more', '...') # Flipkart's cut-off tail on long reviews.
+
+def normalize_text(text):
+    """Lower-case, single-spaced text without the READ MORE tail."""
+    text = ' '.join(str(text).lower().split())
+    for marker in TRUNCATION_MARKERS:
+        if text.endswith(marker):
+            text = text[:-len(marker)].rstrip()
+    return text
+
+def _pack(data, size):
+    """Every run of `size` bytes in `data` (uint64 array) packed into one uint64."""
+    count = len(data) - size + 1
+    packed = data[:count].copy()
+    for i in range(1, size): # Byte i of the shingle goes to bits 8i..8i+7.
+        packed |= data[i:i + count] << np.uint64(8 * i)
+    return packed
+
+def shingles(text, size=SHINGLE_SIZE):
+    """Character `size`-grams of normalised text, each packed into one uint64 (repeats included)."""
+    data = text.encode('utf-8').ljust(size, b'\0')
+    return _pack(np.frombuffer(data, dtype=np.uint8).astype(np.uint64), size)
+
+def batch_shingles(texts, size=SHINGLE_SIZE):
+    """Shingles of many texts at once: (packed shingles, offset of each text's first shingle)."""
+    encoded = [text.encode('utf-8').ljust(size, b'\0') for text in texts]
+    starts = np.cumsum([0] + [len(data) for data in encoded[:-1]])
+    packed = _pack(np.frombuffer(b''.join(encoded), dtype=np.uint8).astype(np.uint64), size)
+    valid = np.ones(len(packed), dtype=bool)
+    valid[(starts[1:, None] - np.arange(1, size)).ravel()] = False # Shingles straddling two texts.
+    return packed[valid], starts - np.arange(len(starts)) * (size - 1)
+
+class NearDuplicateDetector:
+    """MinHash/LSH index of kept reviews. Feed it with filter() (batches) or check() (one at a time)."""
+
+    BATCH = 256 # Texts hashed together by filter(): bounds the num_perm x shingles matrix to a few MB.
+    MAX_BUCKET = 32 # Ids kept per bucket; a review in a crowded bucket is still found through its other bands.
+
+    def __init__(self, threshold=DEFAULT_THRESHOLD, num_perm=DEFAULT_NUM_PERM, bands=DEFAULT_BANDS,
+                 min_tokens=DEFAULT_MIN_TOKENS):
+        if num_perm % bands:
+            raise ValueError(f"num_perm ({num_perm}) must be a multiple of bands ({bands})")
+        self.threshold = threshold
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.min_tokens = min_tokens
+        self.min_agreement = int(np.ceil(threshold * num_perm - 1e-9)) # Equal signature entries needed.
+        # Multiply-shift hash family: h(x) = (a * x + b) mod 2**64 >> 32, with odd a.
+        rng = np.random.default_rng(SEED)
+        self.a = rng.integers(1, 2**63, size=num_perm, dtype=np.uint64) | np.uint64(1)
+        self.b = rng.integers(0, 2**63, size=num_perm, dtype=np.uint64)
+        self.band_weights = rng.integers(1, 2**63, size=self.rows, dtype=np.uint64) | np.uint64(1)
+        self.prefix_bands = PREFIX_BANDS if num_perm % PREFIX_BANDS == 0 else bands
+        self.prefix_weights = rng.integers(1, 2**63, size=num_perm // self.prefix_bands, dtype=np.uint64) | np.uint64(1)
+        # Per band: band hash -> id of the kept review in that bucket, or a list of up to MAX_BUCKET ids.
+        self.buckets = [{} for _ in range(bands)]
+        self.prefix_buckets = [{} for _ in range(self.prefix_bands)] # The same, for the openings' signatures.
+        self.kept_signatures = np.empty((1024, num_perm), dtype=np.uint32) # Kept reviews' signatures (grows).
+        self.kept_prefix_keys = np.empty((1024, self.prefix_bands), dtype=np.uint64) # Saved to rebuild prefix_buckets.
+        self.copies = np.zeros(1024, dtype=np.int64) # Near-duplicates seen per kept review.
+        self.kept = 0
+        self.checked = 0
+        self.duplicates = 0
+
+    # -------------------- SIGNATURES --------------------
+
+    def _minhash(self, packed):
+        with np.errstate(over='ignore'): # The products wrap around 2**64 on purpose.
+            return (self.a[:, None] * packed[None, :] + self.b[:, None]) >> np.uint64(32)
+
+    def signature(self, text):
+        """MinHash signature (uint32[num_perm]) of a normalised text."""
+        return self._minhash(shingles(text)).min(axis=1).astype(np.uint32)
+
+    def signatures(self, texts):
+        """MinHash signatures (uint32[len(texts), num_perm]) of normalised texts, hashed in one pass."""
+        return self._signatures(texts)[0]
+
+    def _signatures(self, texts):
+        """(signatures, signatures of the first PREFIX_SIZE bytes) of normalised texts, from one hash matrix."""
+        if not texts:
+            empty = np.empty((0, self.num_perm), dtype=np.uint32)
+            return empty, empty
+        packed, starts = batch_shingles(texts)
+        counts = np.diff(np.append(starts, len(packed)))
+        prefix_counts = np.minimum(counts, PREFIX_SIZE - SHINGLE_SIZE + 1)
+        # Minima over each opening and over the rest of its text, alternately.
+        bounds = np.column_stack([starts, starts + prefix_counts]).ravel()
+        if bounds[-1] == len(packed): # The last text has no rest.
+            bounds = bounds[:-1]
+        minima = np.minimum.reduceat(self._minhash(packed), bounds, axis=1)
+        prefixes = minima[:, 0::2]
+        full = prefixes.copy()
+        rest = np.flatnonzero(prefix_counts < counts) # Texts longer than their opening.
+        full[:, rest] = np.minimum(prefixes[:, rest], minima[:, 2 * rest + 1])
+        return full.T.astype(np.uint32), prefixes.T.astype(np.uint32)
+
+    def band_keys(self, signatures, prefix=False):
+        """One 64-bit key per band (hashing the band's rows together) for one or many signatures."""
+        signatures = np.atleast_2d(signatures)
+        bands, weights = (self.prefix_bands, self.prefix_weights) if prefix else (self.bands, self.band_weights)
+        with np.errstate(over='ignore'):
+            rows = signatures.reshape(len(signatures), bands, len(weights)).astype(np.uint64) * weights
+        return rows.sum(axis=2, dtype=np.uint64).tolist()
+
+    # -------------------- DETECTION --------------------
+
+    def is_short(self, text):
+        return text.count(' ') + 1 < self.min_tokens
+
+    def check(self, text, add=True):
+        """Id of the kept review `text` nearly duplicates, or None; new texts are kept (added) unless add=False."""
+        self.checked += 1
+        text = normalize_text(text)
+        if self.is_short(text):
+            return None
+        hashes = self._minhash(shingles(text))
+        signature = hashes.min(axis=1).astype(np.uint32)
+        prefix = hashes[:, :PREFIX_SIZE - SHINGLE_SIZE + 1].min(axis=1).astype(np.uint32)
+        return self._check(signature, self.band_keys(signature)[0], self.band_keys(prefix, prefix=True)[0], add)
+
+    def filter(self, texts):
+        """Boolean numpy mask over `texts`: True for reviews to keep, False for near-duplicates of earlier ones.
+
+        Same result as calling check() on each text in order, with the signatures
+        of BATCH texts computed together.
+        """
+        texts = [normalize_text(text) for text in texts]
+        self.checked += len(texts)
+        keep = np.ones(len(texts), dtype=bool)
+        candidates = [i for i, text in enumerate(texts) if not self.is_short(text)]
+        for first in range(0, len(candidates), self.BATCH):
+            batch = candidates[first:first + self.BATCH]
+            signatures, prefixes = self._signatures([texts[i] for i in batch])
+            for i, signature, keys, prefix_keys in zip(batch, signatures, self.band_keys(signatures),
+                                                       self.band_keys(prefixes, prefix=True)):
+                keep[i] = self._check(signature, keys, prefix_keys) is None
+        return keep
+
+    def _check(self, signature, keys, prefix_keys, add=True):
+        original = self._match(signature, self._candidates(self.buckets, keys), self._similar)
+        if original is None: # A truncated copy, or the full text of a truncated review, shares the opening.
+            original = self._match(signature, self._candidates(self.prefix_buckets, prefix_keys), self._contained)
+        if original is not None:
+            self.duplicates += 1
+            self.copies[original] += 1
+            return original
+        if add:
+            self._add(signature, keys, prefix_keys)
+        return None
+
+    @staticmethod
+    def _candidates(buckets, keys):
+        candidates = set()
+        for bucket, key in zip(buckets, keys):
+            entry = bucket.get(key)
+            if isinstance(entry, list):
+                candidates.update(entry)
+            elif entry is not None:
+                candidates.add(entry)
+        return candidates
+
+    def _match(self, signature, candidates, test):
+        """The earliest kept review among `candidates` passing test(their signatures, signature), or None."""
+        if not candidates:
+            return None
+        ids = np.fromiter(candidates, dtype=np.int64, count=len(candidates))
+        matches = ids[test(self.kept_signatures[ids], signature)]
+        return int(matches.min()) if len(matches) else None
+
+    def _similar(self, kept, signature):
+        """Estimated Jaccard similarity of each kept review with the new one at least threshold."""
+        return np.count_nonzero(kept == signature, axis=1) >= self.min_agreement
+
+    def _contained(self, kept, signature):
+        """Estimated containment of the smaller shingle set in the larger at least threshold, per kept review.
+
+        Entries where one side is lower count shingles of that side missing from the other;
+        the side with fewer of them is the one contained.
+        """
+        equal = np.count_nonzero(kept == signature, axis=1)
+        missing = np.minimum(np.count_nonzero(kept < signature, axis=1), np.count_nonzero(signature < kept, axis=1))
+        return (equal > 0) & (equal >= self.threshold * (equal + missing))
+
+    def _add(self, signature, keys, prefix_keys):
+        if self.kept == len(self.kept_signatures): # Amortised doubling, like a list.
+            self.kept_signatures = np.concatenate([self.kept_signatures, np.empty_like(self.kept_signatures)])
+            self.kept_prefix_keys = np.concatenate([self.kept_prefix_keys, np.empty_like(self.kept_prefix_keys)])
+            self.copies = np.concatenate([self.copies, np.zeros_like(self.copies)])
+        review_id = self.kept
+        self.kept_signatures[review_id] = signature
+        self.kept_prefix_keys[review_id] = prefix_keys
+        for buckets, band_keys in ((self.buckets, keys), (self.prefix_buckets, prefix_keys)):
+            for bucket, key in zip(buckets, band_keys):
+                entry = bucket.get(key)
+                if entry is None: # Most buckets hold one review: a plain int, not a list.
+                    bucket[key] = review_id
+                elif not isinstance(entry, list):
+                    bucket[key] = [entry, review_id]
+                elif len(entry) < self.MAX_BUCKET:
+                    entry.append(review_id)
+        self.kept += 1
+
+    def spam_clusters(self, min_copies=5):
+        """[(kept review id, near-duplicates seen)] for reviews copied at least `min_copies` times, largest first."""
+        ids = np.flatnonzero(self.copies[:self.kept] >= min_copies)
+        return sorted(((int(i), int(self.copies[i])) for i in ids), key=lambda item: -item[1])
+
+    def stats(self):
+        return {'checked': self.checked, 'kept': self.kept, 'near_duplicates': self.duplicates,
+                'spam_clusters': len(self.spam_clusters())}
+
+    # -------------------- PERSISTENCE --------------------
+
+    def save(self, path):
+        """Write the kept signatures and opening keys (the buckets are rebuilt from them on load), atomically."""
+        tmp_path = path + ".tmp.npz"
+        np.savez(tmp_path, signatures=self.kept_signatures[:self.kept], prefix_keys=self.kept_prefix_keys[:self.kept],
+                 copies=self.copies[:self.kept],
+                 settings=np.array([self.threshold, self.num_perm, self.bands, self.min_tokens], dtype=np.float64))
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path) as saved:
+            threshold, num_perm, bands, min_tokens = saved['settings']
+            detector = cls(float(threshold), int(num_perm), int(bands), int(min_tokens))
+            signatures = saved['signatures']
+            for signature, keys, prefix_keys in zip(signatures, detector.band_keys(signatures),
+                                                    saved['prefix_keys'].tolist()):
+                detector._add(signature, keys, prefix_keys)
+            detector.copies[:detector.kept] = saved['copies']
+        return detector
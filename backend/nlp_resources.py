@@ -0,0 +1,116 @@
+import os # Imports os to read the offline-mode environment variable.
+import re # Imports re for the cleaning patterns.
+import threading # Imports threading so concurrent first uses load each corpus only once.
+from functools import lru_cache # Imports lru_cache for load-once resources and the token cache.
+import nltk # Imports NLTK for corpus lookup and downloads.
+
+# Shared NLP resources for Review_Extractor and combine_preprocess_reviews.
+# Nothing is loaded or downloaded at import time: stopwords and WordNet are loaded on
+# first use, downloaded only when they are not installed yet, and in offline mode a
+# missing corpus raises immediately instead of touching the network.
+
+OFFLINE_ENV = 'REVIEW_NLP_OFFLINE' # Set to 1 to forbid downloads.
+CORPORA = {'stopwords': 'corpora/stopwords', 'wordnet': 'corpora/wordnet'} # Corpus name -> nltk.data path.
+LEMMA_CACHE_SIZE = 200_000 # Distinct tokens remembered by the lemma cache.
+
+_offline = os.environ.get(OFFLINE_ENV, '').lower() not in ('', '0', 'false', 'no')
+_download_lock = threading.Lock()
+
+def set_offline(offline=True):
+    """Turn offline mode on or off for this process."""
+    global _offline
+    _offline = offline
+
+def is_offline():
+    return _offline
+
+def ensure_corpus(name):
+    """Make sure an NLTK corpus is installed, downloading it only if it is missing."""
+    try:
+        nltk.data.find(CORPORA[name]) # Also finds zipped corpora; no network involved.
+        return
+    except LookupError:
+        pass
+    if _offline:
+        raise LookupError(f"NLTK corpus '{name}' is not installed and {OFFLINE_ENV} is set; "
+                          f"install it with nltk.download('{name}')")
+    with _download_lock:
+        if not nltk.download(name, quiet=True):
+            raise LookupError(f"Could not download NLTK corpus '{name}'")
+
+@lru_cache(maxsize=1)
+def get_stop_words():
+    """English stopwords, loaded once."""
+    ensure_corpus('stopwords')
+    from nltk.corpus import stopwords
+    return frozenset(stopwords.words('english'))
+
+@lru_cache(maxsize=1)
+def get_lemmatizer():
+    """WordNet lemmatizer, created once."""
+    ensure_corpus('wordnet')
+    from nltk.stem import WordNetLemmatizer
+    return WordNetLemmatizer()
+
+def load():
+    """Load every resource up front (e.g. in a worker process initializer)."""
+    get_stop_words()
+    get_lemmatizer().lemmatize('reviews') # WordNet itself is read lazily on the first lemmatize call.
+
+# -------------------- CLEANING --------------------
+
+# The removals of the dataset cleaning in a single pass, in its order: "READ MORE" (any
+# case), then HTML tags, then every character except letters, digits, whitespace and
+# basic punctuation. One alternation gives the same result as removing them one after
+# another in that order: removing a tag or a character can join "READ" and "MORE"
+# (e.g. "READ <b>MORE</b>"), but by then the old code had already removed READ MORE too.
+CLEAN_PATTERN = re.compile(r'(?i:read more)|<[^>]+>|[^a-zA-Z0-9\s.,!?]')
+# The scraper's cleaning removed tags first, so "READ <b>MORE</b>" became "READ MORE"
+# and was then removed; it strips tags before the single pass.
+TAG_PATTERN = re.compile(r'<[^>]+>')
+
+def remove_emojis(text):
+    import emoji # Only needed by the dataset cleaning profile.
+    return emoji.replace_emoji(str(text), replace='')
+
+def clean_text(text, lowercase=False, strip_emojis=False, strip_dots=False, tags_first=True):
+    """Clean a review text.
+
+    The defaults are the scraper's cleaning (Review_Extractor.clean_text); the dataset
+    cleaning in combine_preprocess_reviews also lower-cases, removes emojis first,
+    removes READ MORE before tags (tags_first=False) and strips leading/trailing dots.
+    """
+    if text is None or (isinstance(text, float) and text != text): # None/NaN.
+        return ""
+    if lowercase:
+        text = text.lower()
+    if strip_emojis:
+        text = remove_emojis(text)
+    if tags_first:
+        text = TAG_PATTERN.sub('', text)
+    text = CLEAN_PATTERN.sub('', text)
+    text = ' '.join(text.split()) # Normalize whitespace.
+    return text.strip('.') if strip_dots else text
+
+# -------------------- STOPWORDS AND LEMMAS --------------------
+
+@lru_cache(maxsize=LEMMA_CACHE_SIZE)
+def normalize_token(word):
+    """Lemma of `word`, or None when it is a stopword. Memoised: review vocabulary repeats a lot."""
+    if word.lower() in get_stop_words():
+        return None
+    return get_lemmatizer().lemmatize(word)
+
+def remove_stopwords(text):
+    """Remove stopwords from text."""
+    stop_words = get_stop_words()
+    return ' '.join(word for word in text.split() if word.lower() not in stop_words)
+
+def lemmatize_text(text):
+    """Lemmatize words in text."""
+    lemmatizer = get_lemmatizer()
+    return ' '.join(lemmatizer.lemmatize(word) for word in text.split())
+
+def remove_stopwords_and_lemmatize(text):
+    """remove_stopwords followed by lemmatize_text, through the token cache."""
+    return ' '.join(filter(None, map(normalize_token, text.split())))
@@ -0,0 +1,211 @@
+import logging # Imports logging to report failed pages.
+import threading # Imports threading for locks and semaphores shared between worker threads.
+import time # Imports the time module for the monotonic clock and sleeping.
+from concurrent.futures import ThreadPoolExecutor # Imports the thread pool used to fetch pages concurrently.
+from contextlib import contextmanager # Imports contextmanager to build the per-host slot helper.
+from urllib.parse import urlparse # Imports urlparse to extract the host from a page URL.
+
+logger = logging.getLogger(__name__)
+
+# Default politeness settings applied to every host unless overridden.
+# The old sequential loop slept 2-4 s after every page; a token bucket refilling at
+# one page per second with a small burst keeps a comparable average request rate
+# while letting several pages be in flight at the same time.
+DEFAULT_RATE = 1.0 # Average number of requests per second allowed per host.
+DEFAULT_BURST = 2 # Number of requests that may be sent back-to-back before throttling kicks in.
+DEFAULT_MAX_CONCURRENCY = 4 # Maximum number of requests in flight per host.
+
+# -------------------- RATE LIMITING --------------------
+
+class TokenBucket:
+    """Thread-safe token bucket that releases `rate` tokens per second up to `capacity`."""
+
+    def __init__(self, rate, capacity=None):
+        if rate <= 0: # A non-positive rate would block forever.
+            raise ValueError(f"rate must be positive, got {rate}")
+        self.rate = float(rate) # Tokens added per second.
+        self.capacity = float(capacity if capacity is not None else max(1.0, rate)) # Maximum tokens the bucket can hold.
+        self.tokens = self.capacity # Starts full so the first burst goes out immediately.
+        self.updated = time.monotonic() # Timestamp of the last refill.
+        self.lock = threading.Lock() # Guards tokens/updated between threads.
+
+    def acquire(self):
+        """Block until a token is available and consume it."""
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                # Refills the bucket with the tokens earned since the last call.
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1: # A token is available, take it and return.
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate # Time until the next full token is earned.
+            time.sleep(wait) # Sleeps outside the lock so other threads can refill/check.
+
+    def configure(self, rate=None, capacity=None):
+        """Change the rate and/or capacity in place; tokens earned so far are kept (up to the new capacity)."""
+        if rate is not None and rate <= 0:
+            raise ValueError(f"rate must be positive, got {rate}")
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate) # Earned at the old rate.
+            self.updated = now
+            if rate is not None:
+                self.rate = float(rate)
+            if capacity is not None:
+                self.capacity = float(capacity)
+            self.tokens = min(self.tokens, self.capacity)
+
+
+class HostLimiter:
+    """Combines a token bucket (request rate) and a concurrency cap for one host."""
+
+    def __init__(self, rate=DEFAULT_RATE, burst=DEFAULT_BURST, max_concurrency=DEFAULT_MAX_CONCURRENCY):
+        if max_concurrency < 1: # Nothing could ever run.
+            raise ValueError(f"max_concurrency must be at least 1, got {max_concurrency}")
+        self.bucket = TokenBucket(rate, burst) # Limits how often requests start.
+        # Limits how many requests run at once. A condition rather than a semaphore, so the cap can be changed.
+        self.max_concurrency = max_concurrency
+        self.in_flight = 0
+        self.condition = threading.Condition()
+
+    def settings(self):
+        return {'rate': self.bucket.rate, 'burst': self.bucket.capacity, 'max_concurrency': self.max_concurrency}
+
+    def configure(self, rate=None, burst=None, max_concurrency=None):
+        """Change the limits in place (None keeps a setting); requests in flight keep their slots."""
+        if max_concurrency is not None and max_concurrency < 1:
+            raise ValueError(f"max_concurrency must be at least 1, got {max_concurrency}")
+        self.bucket.configure(rate, burst)
+        if max_concurrency is not None:
+            with self.condition:
+                self.max_concurrency = max_concurrency
+                self.condition.notify_all() # A higher cap lets waiting requests start.
+
+    @contextmanager
+    def slot(self):
+        """Hold a concurrency slot and a rate token for the duration of one request."""
+        with self.condition:
+            self.condition.wait_for(lambda: self.in_flight < self.max_concurrency)
+            self.in_flight += 1
+        try:
+            self.bucket.acquire()
+            yield
+        finally:
+            with self.condition:
+                self.in_flight -= 1
+                self.condition.notify()
+
+
+_host_limiters = {} # Registry of limiters keyed by host, shared by every caller in the process.
+_host_limiters_lock = threading.Lock() # Guards the registry.
+
+def get_host_limiter(url, rate=None, burst=None, max_concurrency=None):
+    """Return the shared limiter for the host of `url`, creating it on first use.
+
+    Settings passed explicitly are applied to the host's limiter, also when it already
+    exists (the latest caller's settings win); None keeps the host's current setting,
+    or the default for a new host.
+    """
+    host = urlparse(url).netloc.lower() # Limits are applied per host (e.g. www.flipkart.com or 127.0.0.1:8000).
+    with _host_limiters_lock:
+        limiter = _host_limiters.get(host)
+        if limiter is None:
+            limiter = HostLimiter(DEFAULT_RATE if rate is None else rate, DEFAULT_BURST if burst is None else burst,
+                                  DEFAULT_MAX_CONCURRENCY if max_concurrency is None else max_concurrency)
+            _host_limiters[host] = limiter
+            return limiter
+        requested = {'rate': rate, 'burst': burst, 'max_concurrency': max_concurrency}
+        current = limiter.settings()
+        changed = {name: value for name, value in requested.items() if value is not None and value != current[name]}
+        if changed:
+            limiter.configure(**changed)
+            logger.info("Changed the limits of %s: %s", host, changed)
+        return limiter
+
+def reset_host_limiters():
+    """Forget all per-host limiters (e.g. between benchmark runs with different settings)."""
+    with _host_limiters_lock:
+        _host_limiters.clear()
+
+# -------------------- CONCURRENT PAGE FETCHING --------------------
+
+def page_url_for(base_url, page):
+    """Build the URL of a review page; page 1 is the base URL itself."""
+    return f"{base_url}&page={page}" if page > 1 else base_url
+
+def iter_pages(base_url, max_pages, fetch_page, rate=None, burst=None, max_concurrency=None, stop_when=None,
+               start_page=1, prefetch=None):
+    """Fetch pages start_page..max_pages concurrently and yield (page, items) in page order.
+
+    `fetch_page(page_url, page)` returns the list of items found on a page. An empty
+    list, `None` or an exception marks the end of the pages: nothing from that page
+    or any later page is yielded, and later pages that have not started yet are
+    never requested. `stop_when(items)` can end the pages early in the same way,
+    e.g. when a page only holds reviews that were already scraped.
+
+    Each page is yielded as soon as it and the pages before it are done. At most
+    `prefetch` pages (default: twice max_concurrency) are requested ahead of the one
+    being consumed, so a slow consumer holds fetching back and only that many parsed
+    pages are ever buffered. Closing the generator early cancels the pages not started.
+
+    `rate`, `burst` and `max_concurrency` set the host's shared limits (see
+    get_host_limiter); left as None, the host keeps its current ones.
+    """
+    limiter = get_host_limiter(base_url, rate, burst, max_concurrency) # Shared per-host politeness limits.
+    stop_at = [max_pages + 1] # First page known to be empty/failed; boxed so workers can read updates.
+    stop_lock = threading.Lock() # Guards stop_at.
+
+    def worker(page):
+        if page >= stop_at[0]: # An earlier page already ended the listing, skip the request.
+            return None
+        with limiter.slot():
+            if page >= stop_at[0]: # Re-checks after waiting for a slot, the listing may have ended meanwhile.
+                return None
+            try:
+                items = fetch_page(page_url_for(base_url, page), page)
+            except Exception as e: # Treats any failure like the old loop did: the listing ends here.
+                logger.warning("Error processing page %d: %s", page, e)
+                items = None
+        if items and stop_when is not None and stop_when(items): # The caller says nothing useful follows.
+            items = None
+        if not items: # Records the earliest empty page so later pages are skipped.
+            with stop_lock:
+                stop_at[0] = min(stop_at[0], page)
+        return items
+
+    pages = range(start_page, max_pages + 1)
+    if not pages:
+        return
+    prefetch = max(1, min(prefetch or 2 * limiter.max_concurrency, len(pages)))
+    workers = max(1, min(limiter.max_concurrency, prefetch)) # No point starting more threads than pages in flight.
+    executor = ThreadPoolExecutor(max_workers=workers)
+    futures = {} # Page number -> future of the pages requested but not yielded yet.
+    next_page = start_page
+    try:
+        for page in pages:
+            while next_page < min(page + prefetch, stop_at[0]): # Tops the window up to `prefetch` pages.
+                futures[next_page] = executor.submit(worker, next_page)
+                next_page += 1
+            if page >= stop_at[0]: # Everything from the first empty page onwards is discarded.
+                return
+            items = futures.pop(page).result() # Waits in page order so pages come out in order.
+            if not items:
+                return
+            yield page, items
+    finally:
+        executor.shutdown(wait=True, cancel_futures=True) # Pages that have not started are dropped without a request.
+
+def fetch_pages(base_url, max_pages, fetch_page, rate=None, burst=None, max_concurrency=None, stop_when=None,
+                start_page=1):
+    """Fetch pages start_page..max_pages concurrently and return their items in page order.
+
+    Same rules as iter_pages, with every page requested up front; the items of all
+    pages up to the first empty one are concatenated into one list.
+    """
+    all_items = []
+    for _, items in iter_pages(base_url, max_pages, fetch_page, rate, burst, max_concurrency, stop_when, start_page,
+                               prefetch=max_pages):
+        all_items.extend(items)
+    return all_items
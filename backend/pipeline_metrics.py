@@ -0,0 +1,306 @@
+"""Pipeline-wide stage timers, counters, metric exporters, an opt-in profiler and logging setup.
+
+Every stage records into the process-wide Metrics registry (get_metrics()):
+
+    metrics = get_metrics()
+    with metrics.timer('parse'):      # or @metrics.timed('parse'), or metrics.add_time('parse', seconds)
+        ...
+    metrics.inc('pages_fetched')
+
+export_metrics(job) writes a snapshot with the exporter chosen by environment:
+
+    REVIEW_METRICS=jsonl        append one JSON line per snapshot (data/metrics/metrics.jsonl)
+    REVIEW_METRICS=prometheus   rewrite a Prometheus text file (data/metrics/metrics.prom)
+    REVIEW_METRICS_FILE=path    write somewhere else
+
+Functions decorated with @profiled(name) run under cProfile when REVIEW_PROFILE=1
+(or a directory); the statistics of all calls are written to data/metrics/profiles/
+at exit. setup_logging() configures the leveled logging that replaced the prints
+(REVIEW_LOG_LEVEL=WARNING silences the progress messages); `with quiet():` mutes them
+and stdout for a block.
+
+    python pipeline_metrics.py show <file.prof> [--limit 25]
+"""
+import argparse # Imports argparse for the command line.
+import atexit # Imports atexit to write the profiles when the program exits.
+import cProfile # Imports cProfile for the opt-in profiling hook.
+import functools # Imports functools to keep the wrapped functions' names.
+import json # Imports json for the JSON lines exporter.
+import logging # Imports logging for the leveled log setup.
+import os # Imports os for paths and the environment switches.
+import pstats # Imports pstats to print saved profiles.
+import threading # Imports threading to guard the registry.
+import time # Imports time for the timers.
+from contextlib import contextmanager, redirect_stdout # Imports contextmanager for the timer and quiet blocks.
+from datetime import datetime # Imports datetime for snapshot and profile timestamps.
+
+# Repository-relative data folders.
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'data')
+METRICS_DIR = os.path.join(DATA_DIR, 'metrics')
+PROFILES_DIR = os.path.join(METRICS_DIR, 'profiles')
+
+METRICS_ENV = 'REVIEW_METRICS' # Exporter name; unset means no export.
+METRICS_FILE_ENV = 'REVIEW_METRICS_FILE'
+PROFILE_ENV = 'REVIEW_PROFILE' # 1 for PROFILES_DIR, or a directory.
+LOG_LEVEL_ENV = 'REVIEW_LOG_LEVEL'
+PROMETHEUS_PREFIX = 'review_pipeline'
+
+logger = logging.getLogger(__name__)
+
+# -------------------- REGISTRY --------------------
+
+class Metrics:
+    """Thread-safe named counters and stage timers (calls, total and max seconds)."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self.lock:
+            self.counters = {}
+            self.timers = {} # stage -> [calls, total seconds, max seconds]
+
+    def inc(self, name, value=1):
+        with self.lock:
+            self.counters[name] = self.counters.get(name, 0) + value
+
+    def add_time(self, stage, seconds):
+        with self.lock:
+            timer = self.timers.get(stage)
+            if timer is None:
+                self.timers[stage] = [1, seconds, seconds]
+            else:
+                timer[0] += 1
+                timer[1] += seconds
+                timer[2] = max(timer[2], seconds)
+
+    @contextmanager
+    def timer(self, stage):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add_time(stage, time.perf_counter() - start)
+
+    def timed(self, stage):
+        """Decorator form of timer()."""
+        def decorator(func):
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                start = time.perf_counter()
+                try:
+                    return func(*args, **kwargs)
+                finally:
+                    self.add_time(stage, time.perf_counter() - start)
+            return wrapper
+        return decorator
+
+    def timed_iter(self, stage, iterable):
+        """Yield from `iterable`, timing only the time spent producing each item (e.g. file reads)."""
+        iterator = iter(iterable)
+        while True:
+            start = time.perf_counter()
+            try:
+                item = next(iterator)
+            except StopIteration: # Exhaustion is not a call: the stage's count matches the items produced.
+                return
+            except BaseException:
+                self.add_time(stage, time.perf_counter() - start)
+                raise
+            self.add_time(stage, time.perf_counter() - start)
+            yield item
+
+    def snapshot(self):
+        """{'counters': {...}, 'timers': {stage: {calls, total_s, mean_ms, max_ms}}}"""
+        with self.lock:
+            counters = dict(self.counters)
+            timers = {stage: list(timer) for stage, timer in self.timers.items()}
+        return {
+            'counters': dict(sorted(counters.items())),
+            'timers': {stage: {'calls': calls, 'total_s': round(total, 6), 'mean_ms': round(total / calls * 1000, 3),
+                               'max_ms': round(longest * 1000, 3)}
+                       for stage, (calls, total, longest) in sorted(timers.items())},
+        }
+
+    def log_summary(self, log=logger, level=logging.INFO):
+        """Log one line per stage timer, slowest first, then the counters."""
+        if not log.isEnabledFor(level):
+            return
+        snapshot = self.snapshot()
+        for stage, timer in sorted(snapshot['timers'].items(), key=lambda item: -item[1]['total_s']):
+            log.log(level, "⏱️ %-18s %8.3f s over %d calls (mean %.2f ms, max %.2f ms)", stage, timer['total_s'],
+                    timer['calls'], timer['mean_ms'], timer['max_ms'])
+        if snapshot['counters']:
+            log.log(level, "📊 %s", ", ".join(f"{name}={value}" for name, value in snapshot['counters'].items()))
+
+
+_metrics = Metrics() # Shared by every stage in the process.
+
+def get_metrics():
+    """Return the process-wide Metrics registry."""
+    return _metrics
+
+# -------------------- EXPORTERS --------------------
+
+class JsonLinesExporter:
+    """Appends each snapshot as one JSON object per line."""
+    name = 'jsonl'
+    default_file = 'metrics.jsonl'
+
+    def __init__(self, path):
+        self.path = path
+
+    def export(self, snapshot, job):
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        with open(self.path, 'a', encoding='utf-8') as f:
+            f.write(json.dumps({'time': datetime.now().isoformat(timespec='seconds'), 'job': job, **snapshot}) + "\n")
+
+class PrometheusExporter:
+    """Rewrites a Prometheus text exposition file (e.g. for node_exporter's textfile collector)."""
+    name = 'prometheus'
+    default_file = 'metrics.prom'
+
+    def __init__(self, path):
+        self.path = path
+
+    @staticmethod
+    def metric_name(name):
+        return f"{PROMETHEUS_PREFIX}_" + ''.join(c if c.isalnum() else '_' for c in name)
+
+    def render(self, snapshot, job):
+        lines = []
+        for name, value in snapshot['counters'].items():
+            metric = self.metric_name(name) + '_total'
+            lines += [f"# TYPE {metric} counter", f'{metric}{{job="{job}"}} {value}']
+        series = (('stage_calls_total', 'counter', 'calls'), ('stage_seconds_total', 'counter', 'total_s'),
+                  ('stage_max_seconds', 'gauge', None))
+        for suffix, kind, key in series:
+            if not snapshot['timers']:
+                break
+            metric = f"{PROMETHEUS_PREFIX}_{suffix}"
+            lines.append(f"# TYPE {metric} {kind}")
+            for stage, timer in snapshot['timers'].items():
+                value = timer[key] if key else timer['max_ms'] / 1000
+                lines.append(f'{metric}{{job="{job}",stage="{stage}"}} {value}')
+        return "\n".join(lines) + "\n"
+
+    def export(self, snapshot, job):
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        with open(self.path + ".tmp", 'w', encoding='utf-8') as f: # Scrapers never see a half-written file.
+            f.write(self.render(snapshot, job))
+        os.replace(self.path + ".tmp", self.path)
+
+EXPORTERS = {exporter.name: exporter for exporter in (JsonLinesExporter, PrometheusExporter)}
+
+def get_exporter(name=None, path=None):
+    """The exporter named by `name` (default: $REVIEW_METRICS), or None when metrics export is off."""
+    name = name or os.environ.get(METRICS_ENV)
+    if not name:
+        return None
+    if name not in EXPORTERS:
+        raise ValueError(f"Unknown metrics exporter {name!r}; expected one of {sorted(EXPORTERS)}")
+    exporter = EXPORTERS[name]
+    return exporter(path or os.environ.get(METRICS_FILE_ENV) or os.path.join(METRICS_DIR, exporter.default_file))
+
+def export_metrics(job, exporter=None):
+    """Write the current snapshot with `exporter` (default: from the environment); returns the path or None."""
+    exporter = exporter or get_exporter()
+    if exporter is None:
+        return None
+    exporter.export(get_metrics().snapshot(), job)
+    logger.debug("Exported metrics to %s", exporter.path)
+    return exporter.path
+
+# -------------------- PROFILING --------------------
+
+_profiles = {} # name -> cProfile.Profile accumulating every profiled call.
+_profile_lock = threading.Lock() # Only one cProfile can be active in a process at a time.
+
+def _profile_dir():
+    setting = os.environ.get(PROFILE_ENV, '')
+    if setting.lower() in ('', '0', 'false', 'no'):
+        return None
+    return PROFILES_DIR if setting.lower() in ('1', 'true', 'yes') else setting
+
+PROFILE_DIR = _profile_dir() # Read once: the disabled hook costs one global lookup per call.
+
+def enable_profiling(directory=PROFILES_DIR):
+    """Turn the @profiled hooks on from code (e.g. a benchmark) instead of REVIEW_PROFILE."""
+    global PROFILE_DIR
+    PROFILE_DIR = directory
+
+def profiled(name):
+    """Run the decorated function under cProfile when profiling is enabled.
+
+    cProfile follows only the calling thread, and only one profile runs at a time:
+    calls that overlap a profiled one (from other threads) run unprofiled.
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if PROFILE_DIR is None or not _profile_lock.acquire(blocking=False):
+                return func(*args, **kwargs)
+            try:
+                profile = _profiles.get(name)
+                if profile is None:
+                    profile = _profiles[name] = cProfile.Profile()
+                profile.enable()
+                try:
+                    return func(*args, **kwargs)
+                finally:
+                    profile.disable()
+            finally:
+                _profile_lock.release()
+        return wrapper
+    return decorator
+
+def dump_profiles(directory=None):
+    """Write every collected profile to <directory>/<name>_<timestamp>.prof; returns the paths."""
+    directory = directory or PROFILE_DIR or PROFILES_DIR
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    paths = []
+    with _profile_lock:
+        for name, profile in _profiles.items():
+            os.makedirs(directory, exist_ok=True)
+            path = os.path.join(directory, f"{name}_{timestamp}.prof")
+            profile.dump_stats(path)
+            paths.append(path)
+            logger.info("📋 Profile of %s written to %s", name, path)
+        _profiles.clear()
+    return paths
+
+atexit.register(dump_profiles)
+
+# -------------------- LOGGING --------------------
+
+def setup_logging(level=None):
+    """Configure the root logger for the command line scripts (level from $REVIEW_LOG_LEVEL, INFO by default).
+
+    Messages keep the plain look of the old prints. Debug messages (per page and
+    per result) use lazy %-formatting, so a disabled level costs a level check only.
+    """
+    level = level or os.environ.get(LOG_LEVEL_ENV, 'INFO')
+    logging.basicConfig(level=level.upper() if isinstance(level, str) else level, format='%(message)s')
+
+@contextmanager
+def quiet(level=logging.INFO):
+    """Drop log records up to `level` and stdout, e.g. so benchmarks do not time the per-page messages."""
+    logging.disable(level)
+    try:
+        with open(os.devnull, 'w') as devnull, redirect_stdout(devnull):
+            yield
+    finally:
+        logging.disable(logging.NOTSET)
+
+def main():
+    parser = argparse.ArgumentParser(description="Inspect saved pipeline profiles.")
+    parser.add_argument('command', choices=['show'])
+    parser.add_argument('profile', help=".prof file written by a @profiled function")
+    parser.add_argument('--sort', default='cumulative')
+    parser.add_argument('--limit', type=int, default=25)
+    args = parser.parse_args()
+    pstats.Stats(args.profile).sort_stats(args.sort).print_stats(args.limit)
+
+if __name__ == "__main__":
+    main()
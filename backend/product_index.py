@@ -0,0 +1,253 @@
+"""Per-product aggregate index over the cleaned dataset.
+
+For every product key it keeps the review count, rating histogram and average, the
+most frequent terms (unigrams and bigrams of Cleaned_Description), the most frequent
+terms of 1-2 star reviews ("top complaints") and mentions/average rating per aspect
+(battery, camera, display, ...). combine_preprocess_reviews updates it chunk by chunk
+as rows are written, so incremental runs only add the new reviews, and a lookup is a
+single primary-key read: the top lists are refreshed when a product changes, not
+computed when it is queried.
+
+    python product_index.py show <product> [--top N]
+    python product_index.py list
+    python product_index.py build [--storage csv|parquet]   # rebuild from the cleaned dataset
+"""
+import argparse # Imports argparse for the command line.
+import json # Imports json to store the precomputed top lists.
+import os # Imports os for the index location.
+import sqlite3 # Imports sqlite3 for the on-disk index.
+import threading # Imports threading because one connection may be shared between threads.
+from collections import Counter, defaultdict # Imports the per-chunk accumulators.
+
+from review_storage import BACKENDS, CLEANED_DIR, STORAGE_ENV, get_storage, product_key # Imports the cleaned dataset backends.
+
+INDEX_PATH = os.path.join(CLEANED_DIR, 'product_index.sqlite')
+RATINGS = (1, 2, 3, 4, 5)
+NEGATIVE_RATING = 2 # Reviews rated at most this count towards complaints.
+TOP_TERMS = 25 # Terms kept in each precomputed top list.
+
+# Aspect -> lemmatised words that mention it (Cleaned_Description is lower-case and lemmatised).
+ASPECTS = {
+    'battery': {'battery', 'charge', 'charging', 'charger', 'backup', 'drain'},
+    'camera': {'camera', 'photo', 'picture', 'video', 'lens', 'selfie', 'zoom'},
+    'display': {'display', 'screen', 'brightness', 'resolution', 'amoled'},
+    'sound': {'sound', 'audio', 'speaker', 'bass', 'volume', 'mic', 'noise'},
+    'performance': {'performance', 'speed', 'lag', 'processor', 'gaming', 'heat', 'heating', 'hang'},
+    'build': {'build', 'design', 'body', 'weight', 'look', 'finish'},
+    'price': {'price', 'money', 'value', 'cost', 'worth', 'budget'},
+    'delivery': {'delivery', 'packaging', 'package', 'seller', 'shipping'},
+    'software': {'software', 'update', 'ui', 'app', 'bug', 'android', 'io'},
+}
+ASPECT_OF = {word: aspect for aspect, words in ASPECTS.items() for word in words}
+
+def review_terms(text):
+    """Distinct unigrams and bigrams of a cleaned description (each counted once per review)."""
+    tokens = str(text).split()
+    return set(tokens) | {f"{a} {b}" for a, b in zip(tokens, tokens[1:])}
+
+def star_rating(value):
+    """1-5 star rating from the dataset's Rating value ('5', '5.0', 4.0), or None."""
+    try:
+        star = int(round(float(value)))
+    except (TypeError, ValueError):
+        return None
+    return star if star in RATINGS else None
+
+class ProductIndex:
+    """SQLite product aggregates. Use as a context manager: changes are committed on a clean exit."""
+
+    def __init__(self, path=INDEX_PATH, top_terms=TOP_TERMS):
+        if path != ':memory:':
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.path = path
+        self.top_terms = top_terms
+        self.lock = threading.Lock() # One connection shared between threads, serialised by this lock.
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        histogram = ", ".join(f"r{star} INTEGER NOT NULL DEFAULT 0" for star in RATINGS)
+        self.conn.executescript(
+            "CREATE TABLE IF NOT EXISTS products ("
+            " product TEXT PRIMARY KEY,"
+            " reviews INTEGER NOT NULL DEFAULT 0,"
+            " rating_sum INTEGER NOT NULL DEFAULT 0," # Sum of the star ratings counted in the histogram.
+            f" {histogram},"
+            " top_terms TEXT NOT NULL DEFAULT '[]'," # JSON [[term, reviews], ...], refreshed on update.
+            " top_complaints TEXT NOT NULL DEFAULT '[]',"
+            " aspects TEXT NOT NULL DEFAULT '{}');"
+            "CREATE TABLE IF NOT EXISTS terms ("
+            " product TEXT NOT NULL, term TEXT NOT NULL,"
+            " reviews INTEGER NOT NULL," # Reviews mentioning the term.
+            " negative INTEGER NOT NULL," # ... of which rated NEGATIVE_RATING or lower.
+            " PRIMARY KEY (product, term)) WITHOUT ROWID;"
+            "CREATE INDEX IF NOT EXISTS terms_by_reviews ON terms (product, reviews);"
+            "CREATE INDEX IF NOT EXISTS terms_by_negative ON terms (product, negative);"
+            "CREATE TABLE IF NOT EXISTS aspects ("
+            " product TEXT NOT NULL, aspect TEXT NOT NULL,"
+            " mentions INTEGER NOT NULL, rating_sum INTEGER NOT NULL, rated INTEGER NOT NULL, negative INTEGER NOT NULL,"
+            " PRIMARY KEY (product, aspect)) WITHOUT ROWID;"
+        )
+        self.conn.commit()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        with self.lock:
+            if exc_type is None:
+                self.conn.commit()
+            else: # The dataset was not written either; keep the index as it was.
+                self.conn.rollback()
+        self.close()
+
+    def close(self):
+        self.conn.close()
+
+    # -------------------- UPDATES --------------------
+
+    def clear(self):
+        """Drop every product (e.g. before a full rebuild); takes effect on commit."""
+        with self.lock:
+            for table in ('products', 'terms', 'aspects'):
+                self.conn.execute(f"DELETE FROM {table}")
+
+    def update(self, df, product_column='Product', rating_column='Rating', text_column='Cleaned_Description'):
+        """Add the rows of a cleaned chunk to their products' aggregates. Returns the products touched."""
+        reviews = Counter()
+        histograms = defaultdict(Counter)
+        terms = defaultdict(Counter) # product -> term -> reviews mentioning it.
+        negative_terms = defaultdict(Counter) # ... among its 1-2 star reviews.
+        aspects = defaultdict(lambda: defaultdict(lambda: [0, 0, 0, 0])) # mentions, rating_sum, rated, negative
+        for product, rating, text in zip(df[product_column], df[rating_column], df[text_column]):
+            product = product_key(product)
+            star = star_rating(rating)
+            negative = star is not None and star <= NEGATIVE_RATING
+            reviews[product] += 1
+            if star is not None:
+                histograms[product][star] += 1
+            words = review_terms(text)
+            terms[product].update(words)
+            if negative:
+                negative_terms[product].update(words)
+            for aspect in {ASPECT_OF[word] for word in words if word in ASPECT_OF}:
+                totals = aspects[product][aspect]
+                totals[0] += 1
+                if star is not None:
+                    totals[1] += star
+                    totals[2] += 1
+                totals[3] += negative
+
+        columns = ", ".join(f"r{star}" for star in RATINGS)
+        increments = ", ".join(f"r{star} = r{star} + excluded.r{star}" for star in RATINGS)
+        with self.lock:
+            self.conn.executemany(
+                f"INSERT INTO products (product, reviews, rating_sum, {columns}) VALUES (?, ?, ?, {', '.join('?' * len(RATINGS))})"
+                f" ON CONFLICT (product) DO UPDATE SET reviews = reviews + excluded.reviews,"
+                f" rating_sum = rating_sum + excluded.rating_sum, {increments}",
+                [(product, count, sum(star * n for star, n in histograms[product].items()),
+                  *(histograms[product][star] for star in RATINGS)) for product, count in reviews.items()])
+            self.conn.executemany(
+                "INSERT INTO terms (product, term, reviews, negative) VALUES (?, ?, ?, ?)"
+                " ON CONFLICT (product, term) DO UPDATE SET reviews = reviews + excluded.reviews,"
+                " negative = negative + excluded.negative",
+                ((product, term, count, negative_terms[product][term])
+                 for product, counts in terms.items() for term, count in counts.items()))
+            self.conn.executemany(
+                "INSERT INTO aspects (product, aspect, mentions, rating_sum, rated, negative) VALUES (?, ?, ?, ?, ?, ?)"
+                " ON CONFLICT (product, aspect) DO UPDATE SET mentions = mentions + excluded.mentions,"
+                " rating_sum = rating_sum + excluded.rating_sum, rated = rated + excluded.rated,"
+                " negative = negative + excluded.negative",
+                ((product, aspect, *totals) for product, by_aspect in aspects.items() for aspect, totals in by_aspect.items()))
+            for product in reviews:
+                self._refresh(product)
+        return list(reviews)
+
+    def _refresh(self, product):
+        """Recompute a product's stored top lists (index scans of its own terms only)."""
+        top_terms = self.conn.execute(
+            "SELECT term, reviews FROM terms WHERE product = ? ORDER BY reviews DESC, term LIMIT ?",
+            (product, self.top_terms)).fetchall()
+        top_complaints = self.conn.execute(
+            "SELECT term, negative FROM terms WHERE product = ? AND negative > 0 ORDER BY negative DESC, term LIMIT ?",
+            (product, self.top_terms)).fetchall()
+        aspects = {
+            aspect: {'mentions': mentions, 'average_rating': round(rating_sum / rated, 2) if rated else None,
+                     'negative': negative}
+            for aspect, mentions, rating_sum, rated, negative in self.conn.execute(
+                "SELECT aspect, mentions, rating_sum, rated, negative FROM aspects WHERE product = ?"
+                " ORDER BY mentions DESC", (product,))
+        }
+        self.conn.execute("UPDATE products SET top_terms = ?, top_complaints = ?, aspects = ? WHERE product = ?",
+                          (json.dumps(top_terms), json.dumps(top_complaints), json.dumps(aspects), product))
+
+    # -------------------- QUERIES --------------------
+
+    def get(self, product, top=10):
+        """Aggregates of one product (by name or key), or None when it has no reviews indexed."""
+        with self.lock:
+            row = self.conn.execute(
+                f"SELECT product, reviews, rating_sum, {', '.join(f'r{star}' for star in RATINGS)},"
+                " top_terms, top_complaints, aspects FROM products WHERE product = ?", (product_key(product),)).fetchone()
+        if row is None:
+            return None
+        key, count, rating_sum, *rest = row
+        histogram = dict(zip(RATINGS, rest[:len(RATINGS)]))
+        top_terms, top_complaints, aspects = rest[len(RATINGS):]
+        rated = sum(histogram.values())
+        return {
+            'product': key,
+            'reviews': count,
+            'average_rating': round(rating_sum / rated, 2) if rated else None,
+            'rating_histogram': histogram,
+            'top_terms': [tuple(item) for item in json.loads(top_terms)[:top]],
+            'top_complaints': [tuple(item) for item in json.loads(top_complaints)[:top]],
+            'aspects': json.loads(aspects),
+        }
+
+    def products(self):
+        """[(product key, review count)], most reviewed first."""
+        with self.lock:
+            return self.conn.execute("SELECT product, reviews FROM products ORDER BY reviews DESC, product").fetchall()
+
+def build(storage, path=INDEX_PATH, chunk_size=50_000):
+    """Rebuild the index from a cleaned dataset that has the Product column. Returns the product count."""
+    with ProductIndex(path) as index:
+        index.clear()
+        for chunk in storage.iter_cleaned(['Product', 'Rating', 'Cleaned_Description'], chunk_size):
+            index.update(chunk.dropna(subset=['Product']))
+        return len(index.products())
+
+def main():
+    parser = argparse.ArgumentParser(description="Query or rebuild the per-product aggregate index.")
+    parser.add_argument('command', choices=['show', 'list', 'build'])
+    parser.add_argument('product', nargs='?', help="product name or key (show)")
+    parser.add_argument('--top', type=int, default=10, help="terms to show per list")
+    parser.add_argument('--index', default=INDEX_PATH)
+    parser.add_argument('--storage', choices=sorted(BACKENDS), default=os.environ.get(STORAGE_ENV, 'csv'))
+    args = parser.parse_args()
+
+    if args.command == 'build':
+        print(f"✅ Indexed {build(get_storage(args.storage), args.index)} products into {args.index}")
+        return
+    index = ProductIndex(args.index)
+    try:
+        if args.command == 'list':
+            for product, count in index.products():
+                print(f"{count:>8}  {product}")
+            return
+        if not args.product:
+            parser.error("show needs a product")
+        result = index.get(args.product, args.top)
+        if result is None:
+            print(f"❌ No reviews indexed for {args.product!r}")
+            return
+        print(f"📊 {result['product']}: {result['reviews']} reviews, average {result['average_rating']}⭐")
+        print("   " + "  ".join(f"{star}⭐ {n}" for star, n in result['rating_histogram'].items()))
+        print("📋 Top terms: " + ", ".join(f"{term} ({n})" for term, n in result['top_terms']))
+        print("⚠️ Top complaints: " + ", ".join(f"{term} ({n})" for term, n in result['top_complaints']))
+        for aspect, stats in result['aspects'].items():
+            print(f"   {aspect:<12} {stats['mentions']:>6} mentions, average {stats['average_rating']}⭐, "
+                  f"{stats['negative']} negative")
+    finally:
+        index.close()
+
+if __name__ == "__main__":
+    main()
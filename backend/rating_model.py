@@ -0,0 +1,199 @@
+"""Predict a review's star rating from its text.
+
+A HashingVectorizer (word 1-2 grams, no vocabulary to fit or store) feeds a linear
+SGD classifier over the ratings 1-5. Both work on chunks, so training streams the
+cleaned dataset with partial_fit and can continue later on new data. predict() takes
+raw review text through the same preprocessing as combine_preprocess_reviews
+(preprocess_text, or text_normalizer.preprocess_series for larger batches), so the
+model sees the text it was trained on.
+
+    python rating_model.py train [--epochs N] [--storage csv|parquet] [--model PATH]
+    python rating_model.py predict "Great phone, battery lasts two days" ...
+"""
+import argparse # Imports argparse for the command line.
+import copy # Imports copy to pickle the classifier without its weights.
+import os # Imports os for the model path.
+import time # Imports time to report training time.
+import numpy as np # Imports numpy for the holdout split and metrics.
+import pandas as pd # Imports pandas for the training chunks.
+
+from combine_preprocess_reviews import preprocess_text # Imports the per-text dataset preprocessing.
+from text_normalizer import preprocess_series # Imports the batched version of the same preprocessing.
+from review_storage import BACKENDS, STORAGE_ENV, get_storage # Imports the cleaned dataset backends.
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'data')
+MODEL_PATH = os.path.join(DATA_DIR, 'models', 'rating_model.joblib')
+RATINGS = np.arange(1, 6) # Every class must be known up front for partial_fit.
+N_FEATURES = 2 ** 18 # Hashed feature space; collisions are rare at this size for review vocabulary.
+TRAIN_CHUNK_SIZE = 10_000 # Rows per partial_fit call.
+HOLDOUT_PERCENT = 20 # Share of distinct texts kept out of training for evaluation.
+SMALL_BATCH = 32 # Below this many texts, preprocessing one by one beats the vectorised Series path.
+
+def _require_sklearn():
+    try:
+        import joblib
+        from sklearn.feature_extraction.text import HashingVectorizer
+        from sklearn.linear_model import SGDClassifier
+    except ImportError as e:
+        raise ImportError("The rating model needs scikit-learn: pip install scikit-learn") from e
+    return joblib, HashingVectorizer, SGDClassifier
+
+class RatingModel:
+    """Hashing vectorizer + linear classifier predicting ratings 1-5 from review text."""
+
+    def __init__(self, n_features=N_FEATURES, ngram_range=(1, 2), alpha=1e-5, classifier=None):
+        _, HashingVectorizer, SGDClassifier = _require_sklearn()
+        self.params = {'n_features': n_features, 'ngram_range': tuple(ngram_range), 'alpha': alpha}
+        # Stateless: nothing to fit, so any chunk can be transformed on its own.
+        self.vectorizer = HashingVectorizer(n_features=n_features, ngram_range=tuple(ngram_range),
+                                            alternate_sign=False, norm='l2', dtype=np.float32)
+        self.classifier = classifier or SGDClassifier(loss='log_loss', alpha=alpha, random_state=0)
+        self.trained_rows = 0
+        self._weights = None # coef_ transposed (features x ratings), the layout prediction needs.
+
+    # -------------------- TRAINING --------------------
+
+    def partial_fit(self, cleaned_texts, ratings):
+        """One pass over a chunk of preprocessed texts (Cleaned_Description) and their ratings."""
+        # A memory-mapped artifact leaves coef_ (a transposed view), intercept_ and any other
+        # fitted array read-only; training updates them in place, so they are copied first.
+        for name, value in list(vars(self.classifier).items()):
+            if isinstance(value, np.ndarray) and not (value.flags.c_contiguous and value.flags.writeable):
+                setattr(self.classifier, name, np.array(value, order='C'))
+        self._weights = None
+        self.classifier.partial_fit(self.vectorizer.transform(cleaned_texts), np.asarray(ratings, dtype=int),
+                                    classes=RATINGS)
+        self.trained_rows += len(ratings)
+        return self
+
+    # -------------------- INFERENCE --------------------
+
+    @property
+    def weights(self):
+        if self._weights is None:
+            self._weights = np.ascontiguousarray(self.classifier.coef_.T)
+        return self._weights
+
+    def decision_function(self, cleaned_texts):
+        # Sparse rows times a features x ratings matrix only reads the weights of the
+        # n-grams present, instead of the whole coef_ as classifier.predict does.
+        return self.vectorizer.transform(cleaned_texts) @ self.weights + self.classifier.intercept_
+
+    def predict_cleaned(self, cleaned_texts):
+        """Ratings for already preprocessed texts."""
+        return self.classifier.classes_[self.decision_function(cleaned_texts).argmax(axis=1)]
+
+    def predict_proba_cleaned(self, cleaned_texts):
+        """Probability of each rating (columns in RATINGS order) for preprocessed texts."""
+        # Same as SGDClassifier.predict_proba for log loss: one-vs-rest sigmoids, normalised.
+        probabilities = 1 / (1 + np.exp(-self.decision_function(cleaned_texts)))
+        return probabilities / probabilities.sum(axis=1, keepdims=True)
+
+    def predict(self, texts):
+        """Ratings (1-5) for a batch of raw review texts."""
+        return self.predict_cleaned(preprocess_texts(texts))
+
+    def predict_proba(self, texts):
+        return self.predict_proba_cleaned(preprocess_texts(texts))
+
+    # -------------------- ARTIFACT --------------------
+
+    def save(self, path=MODEL_PATH):
+        """Write the model atomically; the weights are stored uncompressed so load() can memory-map them."""
+        joblib, _, _ = _require_sklearn()
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        # The weights are stored once, in prediction layout; the classifier is pickled without them.
+        classifier = copy.copy(self.classifier)
+        classifier.coef_ = None
+        artifact = {'params': self.params, 'classifier': classifier, 'weights': self.weights,
+                    'trained_rows': self.trained_rows}
+        joblib.dump(artifact, path + '.tmp')
+        os.replace(path + '.tmp', path)
+        return path
+
+    @classmethod
+    def load(cls, path=MODEL_PATH, mmap=True):
+        """Load a saved model; with mmap the weight matrix is mapped instead of read into memory."""
+        joblib, _, _ = _require_sklearn()
+        artifact = joblib.load(path, mmap_mode='r' if mmap else None)
+        model = cls(classifier=artifact['classifier'], **artifact['params'])
+        model._weights = artifact['weights']
+        model.classifier.coef_ = model._weights.T # A view; copied only if training resumes.
+        model.trained_rows = artifact['trained_rows']
+        return model
+
+def preprocess_texts(texts):
+    """The dataset preprocessing for raw texts; small batches skip the Series overhead."""
+    texts = list(texts)
+    if len(texts) < SMALL_BATCH:
+        return [preprocess_text(text) for text in texts]
+    return preprocess_series(texts)
+
+# -------------------- DATASET --------------------
+
+def in_holdout(texts):
+    """Deterministic holdout mask: a text is always on the same side, however often it occurs."""
+    return (pd.util.hash_pandas_object(texts, index=False).to_numpy() % 100) < HOLDOUT_PERCENT
+
+def iter_training_chunks(storage, chunk_size=TRAIN_CHUNK_SIZE):
+    """Yield (cleaned texts, ratings) chunks of the cleaned dataset, skipping unusable rows."""
+    for chunk in storage.iter_cleaned(['Rating', 'Cleaned_Description'], chunk_size):
+        chunk = chunk.dropna()
+        ratings = pd.to_numeric(chunk['Rating'], errors='coerce')
+        keep = ratings.isin(RATINGS) & (chunk['Cleaned_Description'].str.strip() != '')
+        yield chunk['Cleaned_Description'][keep].astype(str), ratings[keep].astype(int)
+
+def evaluate(model, texts, ratings):
+    """Accuracy and mean absolute error (in stars) of the predictions."""
+    predicted = model.predict_cleaned(texts)
+    return {'rows': len(ratings), 'accuracy': float(np.mean(predicted == ratings)),
+            'mae': float(np.mean(np.abs(predicted - ratings)))}
+
+def train(storage=None, epochs=5, chunk_size=TRAIN_CHUNK_SIZE, model=None):
+    """Train (or keep training) a model on the cleaned dataset; returns (model, holdout metrics)."""
+    storage = storage or get_storage()
+    model = model or RatingModel()
+    rng = np.random.default_rng(0)
+    holdout_texts, holdout_ratings = [], []
+    for epoch in range(epochs):
+        for texts, ratings in iter_training_chunks(storage, chunk_size):
+            test = in_holdout(texts)
+            if epoch == 0:
+                holdout_texts.append(texts[test])
+                holdout_ratings.append(ratings[test])
+            order = rng.permutation(int((~test).sum())) # SGD converges better on shuffled rows.
+            if len(order):
+                model.partial_fit(texts[~test].iloc[order], ratings[~test].iloc[order])
+    metrics = evaluate(model, pd.concat(holdout_texts), pd.concat(holdout_ratings).to_numpy()) if holdout_texts else {}
+    return model, metrics
+
+def main():
+    parser = argparse.ArgumentParser(description="Train or run the review rating model.")
+    commands = parser.add_subparsers(dest='command', required=True)
+    train_parser = commands.add_parser('train', help="train on the cleaned dataset")
+    train_parser.add_argument('--epochs', type=int, default=5)
+    train_parser.add_argument('--chunk-size', type=int, default=TRAIN_CHUNK_SIZE)
+    train_parser.add_argument('--storage', choices=sorted(BACKENDS), default=os.environ.get(STORAGE_ENV, 'csv'))
+    train_parser.add_argument('--resume', action='store_true', help="continue training the saved model")
+    train_parser.add_argument('--model', default=MODEL_PATH)
+    predict_parser = commands.add_parser('predict', help="predict ratings for review texts")
+    predict_parser.add_argument('texts', nargs='+')
+    predict_parser.add_argument('--model', default=MODEL_PATH)
+    args = parser.parse_args()
+
+    if args.command == 'train':
+        start = time.perf_counter()
+        model = RatingModel.load(args.model, mmap=False) if args.resume else None
+        model, metrics = train(get_storage(args.storage), args.epochs, args.chunk_size, model)
+        model.save(args.model)
+        print(f"✅ Trained for {args.epochs} epochs ({model.trained_rows} rows in total) in "
+              f"{time.perf_counter() - start:.1f}s, saved to {args.model}")
+        if metrics:
+            print(f"📊 Holdout: {metrics['rows']} rows, accuracy {metrics['accuracy']:.3f}, MAE {metrics['mae']:.2f} stars")
+    else:
+        model = RatingModel.load(args.model)
+        for text, rating in zip(args.texts, model.predict(args.texts)):
+            print(f"{rating} ⭐  {text}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,284 @@
+"""Rating inference service: micro-batched predictions with a result cache.
+
+Callers submit one review text at a time (from scraper threads, asyncio code or
+over HTTP); a single worker thread groups queued texts into batches of up to
+`max_batch_size`, waiting at most `max_wait_ms` for a batch to fill, and runs
+them through RatingModel.predict in one call. Results are cached in an LRU keyed
+on a hash of the normalised text, so repeated reviews skip the model entirely.
+
+    python rating_service.py serve [--port 8080] [--max-batch-size 64] [--max-wait-ms 2]
+
+    POST /predict  {"texts": ["Great phone", ...]}  ->  {"ratings": [5, ...]}
+    GET  /stats    latency percentiles, batch-size histogram, cache counters
+"""
+import argparse # Imports argparse for the command line.
+import asyncio # Imports asyncio for the awaitable API.
+import hashlib # Imports hashlib for the cache keys.
+import json # Imports json for the HTTP API.
+import queue # Imports queue for the request queue.
+import threading # Imports threading for the batching worker.
+import time # Imports time for deadlines and latencies.
+from collections import Counter, OrderedDict, deque # Imports the histogram, LRU and latency window containers.
+from concurrent.futures import Future, InvalidStateError # Imports Future for results handed back to callers.
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer # Imports the local HTTP server.
+
+from rating_model import MODEL_PATH, RatingModel # Imports the rating model.
+
+DEFAULT_MAX_BATCH_SIZE = 64 # Texts per model call.
+DEFAULT_MAX_WAIT_MS = 2 # How long the first text of a batch may wait for others.
+DEFAULT_CACHE_SIZE = 50_000 # Distinct texts whose rating is remembered.
+LATENCY_WINDOW = 100_000 # Latest request latencies kept for the percentiles.
+
+def cache_key(text):
+    """Hash of the text with case and whitespace normalised (both are removed by preprocessing)."""
+    return hashlib.sha1(' '.join(str(text).lower().split()).encode('utf-8')).digest()
+
+class LRUCache:
+    """Thread-safe least-recently-used mapping with hit/miss counters."""
+
+    def __init__(self, max_entries=DEFAULT_CACHE_SIZE):
+        self.max_entries = max_entries
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+        self.hits = self.misses = 0
+
+    def get(self, key):
+        with self.lock:
+            if key in self.entries:
+                self.entries.move_to_end(key)
+                self.hits += 1
+                return self.entries[key]
+            self.misses += 1
+            return None
+
+    def put(self, key, value):
+        if self.max_entries <= 0:
+            return
+        with self.lock:
+            self.entries[key] = value
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+
+class RatingService:
+    """Micro-batching front end for a RatingModel. Use as a context manager, or call close()."""
+
+    def __init__(self, model=None, max_batch_size=DEFAULT_MAX_BATCH_SIZE, max_wait_ms=DEFAULT_MAX_WAIT_MS,
+                 cache_size=DEFAULT_CACHE_SIZE):
+        self.model = model or RatingModel.load(MODEL_PATH)
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000
+        self.cache = LRUCache(cache_size)
+        self.requests = queue.Queue() # (text, key, future, submitted at) tuples; None stops the worker.
+        self.stats_lock = threading.Lock()
+        self.submit_lock = threading.Lock() # Orders submit() against close(), so nothing is queued after the sentinel.
+        self.latencies = deque(maxlen=LATENCY_WINDOW) # Seconds from submit to result, for requests the model answered.
+        self.batch_sizes = Counter() # Batch size -> number of model calls.
+        self.errors = 0
+        self.closed = False
+        self.worker = threading.Thread(target=self._run, name='rating-service', daemon=True)
+        self.worker.start()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    # -------------------- API --------------------
+
+    def submit(self, text):
+        """Queue one text; returns a Future resolving to its rating."""
+        future = Future()
+        key = cache_key(text)
+        rating = self.cache.get(key)
+        with self.submit_lock:
+            if self.closed:
+                raise RuntimeError("RatingService is closed")
+            if rating is None:
+                self.requests.put((text, key, future, time.perf_counter()))
+                return future
+        future.set_result(rating) # Answered without queueing; counted in cache.hits, not in the latencies.
+        return future
+
+    def predict(self, text, timeout=None):
+        """Rating of one text, blocking until its batch has run."""
+        return self.submit(text).result(timeout)
+
+    def predict_many(self, texts, timeout=None):
+        """Ratings of several texts; they are batched together with everyone else's."""
+        futures = [self.submit(text) for text in texts]
+        return [future.result(timeout) for future in futures]
+
+    async def apredict(self, text):
+        """Awaitable rating of one text, for asyncio callers."""
+        return await asyncio.wrap_future(self.submit(text))
+
+    def score_reviews(self, reviews, field='Description', key='Predicted_Rating'):
+        """Add a predicted rating to each scraped review dict (e.g. the output of get_reviews)."""
+        for review, rating in zip(reviews, self.predict_many([review.get(field, '') for review in reviews])):
+            review[key] = rating
+        return reviews
+
+    def close(self):
+        """Finish the queued requests and stop the worker."""
+        with self.submit_lock:
+            if self.closed:
+                return
+            self.closed = True
+            self.requests.put(None)
+        self.worker.join()
+
+    # -------------------- BATCHING --------------------
+
+    def _next_batch(self):
+        """Block for the first request, then take more until the batch is full or max_wait has passed."""
+        first = self.requests.get()
+        if first is None:
+            return None
+        batch = [first]
+        deadline = time.perf_counter() + self.max_wait
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.perf_counter()
+            try:
+                item = self.requests.get(timeout=remaining) if remaining > 0 else self.requests.get_nowait()
+            except queue.Empty:
+                break
+            if item is None: # Closing: run what we have, then stop.
+                self.requests.put(None)
+                break
+            batch.append(item)
+        return batch
+
+    def _run(self):
+        while True:
+            batch = self._next_batch()
+            if batch is None:
+                return
+            # Identical texts queued together are predicted once.
+            unique = {}
+            for text, key, _, _ in batch:
+                unique.setdefault(key, text)
+            try:
+                ratings = dict(zip(unique, (int(rating) for rating in self.model.predict(list(unique.values())))))
+            except Exception as e: # The callers get the error; the service keeps running.
+                with self.stats_lock:
+                    self.errors += 1
+                for _, _, future, _ in batch:
+                    self._resolve(future, exception=e)
+                continue
+            with self.stats_lock:
+                self.batch_sizes[len(unique)] += 1
+            now = time.perf_counter()
+            for _, key, future, submitted in batch:
+                self.cache.put(key, ratings[key])
+                if self._resolve(future, ratings[key]):
+                    self._record(now - submitted)
+
+    @staticmethod
+    def _resolve(future, result=None, exception=None):
+        """Hand a result or error to a future; False if the caller cancelled it meanwhile."""
+        if not future.set_running_or_notify_cancel():
+            return False
+        try:
+            if exception is not None:
+                future.set_exception(exception)
+            else:
+                future.set_result(result)
+        except InvalidStateError: # Resolved elsewhere; the other requests in the batch still get theirs.
+            return False
+        return True
+
+    # -------------------- METRICS --------------------
+
+    def _record(self, latency):
+        with self.stats_lock:
+            self.latencies.append(latency)
+
+    def stats(self):
+        """Latency percentiles (ms) of the queued requests, batch-size histogram and cache counters."""
+        with self.stats_lock:
+            latencies = sorted(self.latencies)
+            batch_sizes = dict(sorted(self.batch_sizes.items()))
+            errors = self.errors
+
+        def percentile(q):
+            return round(latencies[min(len(latencies) - 1, int(q * len(latencies)))] * 1000, 3) if latencies else None
+
+        batches = sum(batch_sizes.values())
+        return {
+            'requests': len(latencies),
+            'latency_ms': {'p50': percentile(0.50), 'p90': percentile(0.90), 'p99': percentile(0.99),
+                           'max': percentile(1.0)},
+            'batches': batches,
+            'mean_batch_size': round(sum(size * n for size, n in batch_sizes.items()) / batches, 2) if batches else None,
+            'batch_size_histogram': batch_sizes,
+            'cache': {'hits': self.cache.hits, 'misses': self.cache.misses, 'entries': len(self.cache.entries)},
+            'errors': errors,
+        }
+
+# -------------------- HTTP SERVER --------------------
+
+def make_handler(service):
+    class RatingHandler(BaseHTTPRequestHandler):
+        def _send(self, status, body):
+            data = json.dumps(body).encode('utf-8')
+            self.send_response(status)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def do_GET(self):
+            if self.path == '/stats':
+                self._send(200, service.stats())
+            else:
+                self._send(404, {'error': 'not found'})
+
+        def do_POST(self):
+            if self.path != '/predict':
+                self._send(404, {'error': 'not found'})
+                return
+            try:
+                body = json.loads(self.rfile.read(int(self.headers.get('Content-Length', 0))) or b'{}')
+                if not isinstance(body, dict):
+                    raise ValueError("the body must be a JSON object")
+                texts = body['texts'] if 'texts' in body else [body['text']]
+                if not isinstance(texts, list) or not all(isinstance(text, str) for text in texts):
+                    raise ValueError("'texts' must be a list of strings")
+            except (ValueError, KeyError) as e:
+                self._send(400, {'error': f"expected {{'texts': [...]}} or {{'text': ...}}: {e}"})
+                return
+            self._send(200, {'ratings': service.predict_many(texts)})
+
+        def log_message(self, format, *args): # Keeps the console quiet; /stats has the numbers.
+            pass
+
+    return RatingHandler
+
+def serve(service, host='127.0.0.1', port=8080):
+    server = ThreadingHTTPServer((host, port), make_handler(service))
+    print(f"🚀 Rating service on http://{host}:{port} (POST /predict, GET /stats)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        service.close()
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve rating predictions over HTTP with micro-batching.")
+    parser.add_argument('command', choices=['serve'])
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8080)
+    parser.add_argument('--model', default=MODEL_PATH)
+    parser.add_argument('--max-batch-size', type=int, default=DEFAULT_MAX_BATCH_SIZE)
+    parser.add_argument('--max-wait-ms', type=float, default=DEFAULT_MAX_WAIT_MS)
+    parser.add_argument('--cache-size', type=int, default=DEFAULT_CACHE_SIZE)
+    args = parser.parse_args()
+    service = RatingService(RatingModel.load(args.model), args.max_batch_size, args.max_wait_ms, args.cache_size)
+    serve(service, args.host, args.port)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+import hashlib # Imports hashlib to fingerprint a page of reviews.
+import re # Imports re to find listing ids in product URLs.
+import threading # Imports threading so concurrent scrapes can share one deduper.
+from urllib.parse import parse_qs, urlparse # Imports URL parsing for the pid query parameter.
+from review_watermarks import is_complete, review_fingerprint # Imports the review content hash.
+
+# get_product_links often returns colour/storage variants of one product, and
+# Flipkart shows the same reviews for all of them. ReviewSetDeduper recognises such
+# links before their reviews are fetched (same itm listing id or pid in the URL) or
+# after their first page (same reviews on page 1), and drops reviews that were
+# already collected from another link by their content hash.
+
+LISTING_ID_PATTERN = re.compile(r'/p/(itm[0-9a-z]+)', re.IGNORECASE) # .../p/itm6ac6485515ae4?pid=...
+
+def listing_id(link):
+    """Id of the review set behind a product link: the itm listing id, else the pid, else None."""
+    match = LISTING_ID_PATTERN.search(urlparse(link).path)
+    if match:
+        return match.group(1).lower()
+    pid = parse_qs(urlparse(link).query).get('pid')
+    return f"pid:{pid[0].upper()}" if pid else None
+
+def page_fingerprint(page_reviews):
+    """Order-independent hash of the complete reviews on a page, or None when it has none."""
+    fingerprints = sorted(review_fingerprint(review) for review in page_reviews if is_complete(review))
+    if not fingerprints:
+        return None
+    return hashlib.sha1(''.join(fingerprints).encode('ascii')).hexdigest()[:16]
+
+class ReviewSetDeduper:
+    """Tracks the review sets and reviews already collected for one product."""
+
+    def __init__(self):
+        self.listings = set() # Listing ids already scraped.
+        self.first_pages = set() # Page 1 fingerprints already scraped.
+        self.seen = set() # Content hashes of every review kept.
+        self.lock = threading.Lock()
+        self.skipped_links = 0 # Links whose review set was already scraped.
+        self.duplicates = 0 # Reviews dropped as already kept.
+
+    def claim_listing(self, link):
+        """True the first time a listing id is seen; links without an id are always claimed."""
+        key = listing_id(link)
+        with self.lock:
+            if key is None or key not in self.listings:
+                self.listings.add(key)
+                return True
+            self.skipped_links += 1
+            return False
+
+    def claim_first_page(self, page_reviews):
+        """True unless an earlier link had exactly the same page 1."""
+        fingerprint = page_fingerprint(page_reviews)
+        with self.lock:
+            if fingerprint is None or fingerprint not in self.first_pages:
+                self.first_pages.add(fingerprint)
+                return True
+            self.skipped_links += 1
+            return False
+
+    def new_reviews(self, reviews):
+        """The reviews not kept before, in order; they are remembered as kept."""
+        fresh = []
+        with self.lock:
+            for review in reviews:
+                fingerprint = review_fingerprint(review)
+                if fingerprint in self.seen:
+                    self.duplicates += 1
+                    continue
+                self.seen.add(fingerprint)
+                fresh.append(review)
+        return fresh
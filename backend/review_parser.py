@@ -0,0 +1,181 @@
+import logging # Imports logging to report reviews that could not be parsed.
+from collections import namedtuple # Imports namedtuple to declare the review field selectors.
+from bs4 import BeautifulSoup # Imports BeautifulSoup for the reference parser backend.
+from bs4.dammit import UnicodeDammit # Imports UnicodeDammit to decode bytes the same way BeautifulSoup does.
+from lxml import etree # Imports lxml's etree for compiled XPath selectors and incremental parsing.
+import lxml.html # Imports lxml's HTML parser for the full-document backend.
+
+logger = logging.getLogger(__name__)
+
+# -------------------- SELECTORS --------------------
+# Every Flipkart class name used to scrape a review is declared once here. The bs4
+# backend reads them directly and the lxml backends compile them into XPath once at
+# import time, so all backends are guaranteed to look for the same elements.
+
+# A review field: output column, tag and class to find inside the review container,
+# how to turn the element into a value, and the value used when it is missing.
+FieldSelector = namedtuple('FieldSelector', ['name', 'tag', 'css_class', 'extract', 'default'])
+
+CONTAINER_TAG = 'div' # Review containers are divs...
+CONTAINER_CLASS = 'cPHDOP' # ...with this class.
+
+# Fields in the column order of the scraped CSVs.
+REVIEW_FIELDS = [
+    FieldSelector('Name', 'p', '_2NsDsF AwS1CA', 'text', 'N/A'), # Reviewer name.
+    FieldSelector('Rating', 'div', 'XQDdHH Ga3i8K', 'text', 'N/A'), # Star rating.
+    FieldSelector('Title', 'p', 'z9E0IG', 'text', 'N/A'), # Review title.
+    FieldSelector('Description', 'div', 'ZmyHeo', 'first_div_text', 'N/A'), # Review text lives in the first div inside.
+    # Date: the first p whose classes include '_2NsDsF'. Flipkart gives the name the
+    # same class, and the original scraper's check against it never matched, so this
+    # picks up whichever comes first. Kept as-is so existing datasets stay comparable.
+    FieldSelector('Date', 'p', '_2NsDsF', 'text', 'N/A'),
+    FieldSelector('Certified_Buyer', 'p', 'MztJPv', 'certified', 'No'), # 'Yes' when the badge reads "Certified Buyer".
+    FieldSelector('Helpful_Votes', 'span', 'tl9VpF', 'text', '0'), # Helpful vote count.
+]
+
+def _finish(selector, text):
+    """Turn the raw text of a found element into the field value."""
+    if selector.extract == 'certified':
+        return 'Yes' if 'Certified Buyer' in text else 'No'
+    return text.strip()
+
+# -------------------- BS4 BACKEND (REFERENCE) --------------------
+
+def extract_reviews_from_soup(soup):
+    """Extract reviews from an already parsed BeautifulSoup document."""
+    reviews_data = [] # Initializes an empty list to store dictionaries of extracted review data.
+    for container in soup.find_all(CONTAINER_TAG, {'class': CONTAINER_CLASS}): # Loops through each review container.
+        try:
+            review = {}
+            for selector in REVIEW_FIELDS:
+                element = container.find(selector.tag, {'class': selector.css_class})
+                if element is not None and selector.extract == 'first_div_text':
+                    element = element.find('div') # The text sits in the first nested div.
+                review[selector.name] = _finish(selector, element.text) if element is not None else selector.default
+            reviews_data.append(review)
+        except Exception as e: # Catches any exception that occurs during the extraction of a single review.
+            logger.warning("Error processing review: %s", e)
+            continue
+    return reviews_data
+
+class Bs4Parser:
+    """Reference backend: full BeautifulSoup tree built with html.parser."""
+    name = 'bs4'
+
+    def parse(self, content):
+        return extract_reviews_from_soup(BeautifulSoup(content, 'html.parser'))
+
+# -------------------- LXML BACKENDS --------------------
+
+def _class_predicate(css_class):
+    """XPath predicate with BeautifulSoup's class semantics."""
+    if ' ' in css_class: # A multi-class string must equal the whole class attribute.
+        return f"normalize-space(@class)='{css_class}'"
+    # A single class matches when it is one of the element's classes.
+    return f"contains(concat(' ', normalize-space(@class), ' '), ' {css_class} ')"
+
+def _compile_field(selector):
+    # (...)[1] takes the first match in document order, like BeautifulSoup's find().
+    path = f"(.//{selector.tag}[{_class_predicate(selector.css_class)}])[1]"
+    if selector.extract == 'first_div_text':
+        path = f"({path}//div)[1]"
+    return selector, etree.XPath(path)
+
+CONTAINER_XPATH = etree.XPath(f"//{CONTAINER_TAG}[{_class_predicate(CONTAINER_CLASS)}]")
+FIELD_XPATHS = [_compile_field(selector) for selector in REVIEW_FIELDS]
+# Text of an element like BeautifulSoup's .text: descendant strings, minus comments and script/style contents.
+TEXT_XPATH = etree.XPath(".//text()[not(parent::script or parent::style or parent::template)]")
+
+def _is_container(element):
+    return CONTAINER_CLASS in (element.get('class') or '').split()
+
+def _extract_from_element(container):
+    """Extract one review from an lxml review container element."""
+    review = {}
+    for selector, xpath in FIELD_XPATHS:
+        found = xpath(container)
+        review[selector.name] = _finish(selector, ''.join(TEXT_XPATH(found[0]))) if found else selector.default
+    return review
+
+def _decode(content):
+    """Decode page bytes to text; UTF-8 first, then BeautifulSoup's encoding detection."""
+    if isinstance(content, str):
+        return content
+    try:
+        return content.decode('utf-8')
+    except UnicodeDecodeError:
+        return UnicodeDammit(content, is_html=True).unicode_markup
+
+class LxmlParser:
+    """Full-document lxml parse with the compiled XPath selectors."""
+    name = 'lxml'
+
+    def parse(self, content):
+        text = _decode(content)
+        if not text.strip(): # lxml refuses to parse an empty document.
+            return []
+        reviews_data = []
+        for container in CONTAINER_XPATH(lxml.html.document_fromstring(text)):
+            try:
+                reviews_data.append(_extract_from_element(container))
+            except Exception as e:
+                logger.warning("Error processing review: %s", e)
+                continue
+        return reviews_data
+
+class StreamingParser:
+    """Incremental lxml parse that only keeps review containers alive.
+
+    The page is fed to an HTMLPullParser in chunks; each review container is extracted
+    as soon as its closing tag is seen and then cleared, together with everything
+    parsed before it, so the tree never holds more than the current review.
+    """
+    name = 'stream'
+    chunk_size = 64 * 1024 # Bytes fed to the parser at a time.
+
+    def parse(self, content):
+        return list(self.iter_parse(content))
+
+    def iter_parse(self, content):
+        """Yield each review as soon as its container has been parsed."""
+        text = _decode(content)
+        parser = etree.HTMLPullParser(events=('end',), tag=CONTAINER_TAG)
+        for start in range(0, len(text), self.chunk_size):
+            parser.feed(text[start:start + self.chunk_size])
+            yield from self._drain(parser)
+        if text.strip():
+            parser.close()
+            yield from self._drain(parser)
+
+    def _drain(self, parser):
+        for _, element in parser.read_events():
+            if not _is_container(element):
+                continue
+            try:
+                review = _extract_from_element(element)
+            except Exception as e:
+                logger.warning("Error processing review: %s", e)
+                review = None
+            element.clear(keep_tail=True) # Frees the container's subtree.
+            for node in [element, *element.iterancestors()]: # Drops everything parsed before this container.
+                parent = node.getparent()
+                while parent is not None and node.getprevious() is not None:
+                    del parent[0]
+            if review is not None:
+                yield review
+
+# -------------------- BACKEND REGISTRY --------------------
+
+PARSERS = {parser.name: parser for parser in (Bs4Parser(), LxmlParser(), StreamingParser())}
+DEFAULT_PARSER = 'lxml'
+
+def get_parser(name=None):
+    """Return a parser backend by name ('bs4', 'lxml' or 'stream')."""
+    name = name or DEFAULT_PARSER
+    if name not in PARSERS:
+        raise ValueError(f"Unknown parser backend {name!r}; choose one of {sorted(PARSERS)}")
+    return PARSERS[name]
+
+def parse_reviews(content, backend=None):
+    """Extract the reviews from a review page's HTML (bytes or str)."""
+    return get_parser(backend).parse(content)
@@ -0,0 +1,131 @@
+"""Streaming scrape -> save -> preprocess (-> rate) pipeline for one product.
+
+extractReviews and extractReviewsFromLink collect every review, then save, then
+preprocess. Here each stage is a generator over pages of reviews, so a page is
+saved and preprocessed as soon as it has been parsed: the first processed review
+is available after one page, and memory holds only the pages in flight, not the
+whole product.
+
+    python review_pipeline.py <product link> [--max-pages N] [--drop-near-duplicates] [--predict]
+"""
+import argparse # Imports argparse for the command line.
+import hashlib # Imports hashlib for the duplicate check.
+import logging # Imports logging for the save message.
+import time # Imports time to report the time to first result.
+
+from Review_Extractor import (REVIEWS_DIR, iter_review_pages, modify_reviews_url, preprocess_batch,
+                              sanitize_filename) # Imports the page generator and batched preprocessing.
+from near_duplicates import NearDuplicateDetector # Imports the MinHash/LSH near-duplicate filter.
+from review_storage import get_storage # Imports the CSV/Parquet storage backends.
+from review_watermarks import is_complete # Imports the "no N/A field" check used before saving.
+from pipeline_metrics import get_metrics, setup_logging # Imports the stage metrics and log setup.
+
+logger = logging.getLogger(__name__)
+metrics = get_metrics()
+
+# -------------------- STAGES --------------------
+
+def save_stage(pages, writer):
+    """Write each page's complete, not yet seen reviews with `writer` and pass them on.
+
+    Same filtering as the DataFrame path (dropna + drop_duplicates): reviews with an
+    N/A field or identical to an earlier one are neither saved nor passed on. Only an
+    8-byte hash per review is kept to spot duplicates.
+    """
+    seen = set()
+    for page in pages:
+        kept = []
+        for review in page:
+            if not is_complete(review):
+                continue
+            key = hashlib.sha1('\x1f'.join(map(str, review.values())).encode('utf-8')).digest()[:8]
+            if key in seen:
+                continue
+            seen.add(key)
+            kept.append(review)
+        writer.write(kept)
+        yield kept
+
+def preprocess_stage(pages, field='Description', key='Processed_Review'):
+    """Add the preprocessed description to each review, dropping those under 3 words (as preprocess_reviews)."""
+    for page in pages:
+        texts = preprocess_batch([review[field] for review in page])
+        yield [{**review, key: text} for review, text in zip(page, texts) if text is not None]
+
+def near_duplicate_stage(pages, detector, key='Processed_Review'):
+    """Drop reviews whose processed text nearly duplicates an earlier one, through a near_duplicates.NearDuplicateDetector.
+
+    The detector remembers the reviews of every page, and of earlier products when it is shared.
+    """
+    for page in pages:
+        keep = detector.filter([review[key] for review in page])
+        metrics.inc('reviews_near_duplicate', len(page) - int(keep.sum()))
+        yield [review for review, kept in zip(page, keep) if kept]
+
+def rating_stage(pages, service):
+    """Add a Predicted_Rating to each review through a rating_service.RatingService (one batch per page)."""
+    for page in pages:
+        yield service.score_reviews(page)
+
+# -------------------- PIPELINE --------------------
+
+def stream_product_reviews(link, max_pages=15, product=None, storage=None, service=None, raw_path=None,
+                           near_duplicates=None, **fetch_options):
+    """Scrape a product link and yield its processed reviews as each page completes.
+
+    Raw reviews are saved page by page through `storage` (the REVIEW_STORAGE
+    backend by default, a new timestamped file per run as extractReviewsFromLink
+    writes). With a NearDuplicateDetector, near-duplicates of earlier reviews are
+    saved but not yielded. With a RatingService, reviews also get a predicted rating.
+    """
+    product = product or sanitize_filename(link.split("/")[-1])
+    storage = storage or get_storage(reviews_dir=REVIEWS_DIR)
+    with storage.open_review_writer(product, raw_path) as writer:
+        pages = iter_review_pages(modify_reviews_url(link), max_pages, **fetch_options)
+        pages = preprocess_stage(save_stage(pages, writer))
+        if near_duplicates is not None:
+            pages = near_duplicate_stage(pages, near_duplicates)
+        if service is not None:
+            pages = rating_stage(pages, service)
+        try:
+            for page in pages:
+                yield from page
+        finally:
+            pages.close() # Stops the scrape when the consumer stops early.
+            logger.info("Saved %d raw reviews to %s", writer.rows, writer.path)
+
+def main():
+    parser = argparse.ArgumentParser(description="Stream a product's reviews through scraping, saving and preprocessing.")
+    parser.add_argument('link', help="Flipkart product link")
+    parser.add_argument('--max-pages', type=int, default=15)
+    parser.add_argument('--drop-near-duplicates', action='store_true',
+                        help="skip reviews nearly identical to an earlier one (MinHash/LSH)")
+    parser.add_argument('--predict', action='store_true', help="also predict ratings with the saved rating model")
+    args = parser.parse_args()
+    setup_logging()
+
+    service = None
+    if args.predict:
+        from rating_service import RatingService # Loads scikit-learn and the model only when asked to.
+        service = RatingService()
+    near_duplicates = None
+    if args.drop_near_duplicates:
+        near_duplicates = NearDuplicateDetector()
+    start = time.perf_counter()
+    count = 0
+    try:
+        for review in stream_product_reviews(args.link, args.max_pages, service=service,
+                                             near_duplicates=near_duplicates):
+            if count == 0:
+                print(f"⏱️ First processed review after {time.perf_counter() - start:.2f}s")
+            count += 1
+            rating = f" (predicted {review['Predicted_Rating']}⭐)" if service else ""
+            print(f"{review['Rating']}⭐{rating} {review['Processed_Review'][:80]}")
+    finally:
+        if service is not None:
+            service.close()
+    print(f"✅ {count} processed reviews in {time.perf_counter() - start:.2f}s")
+    metrics.log_summary(logger)
+
+if __name__ == "__main__":
+    main()
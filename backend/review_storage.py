@@ -0,0 +1,267 @@
+"""Pluggable storage for raw and cleaned reviews: CSV files or a Parquet dataset.
+
+The CSV backend is the original layout (one timestamped CSV per scrape, one cleaned
+CSV). The Parquet backend stores raw reviews partitioned by product
+(reviews_parquet/product=<key>/<timestamp>.parquet) and the cleaned dataset as part
+files, so loads can skip other products and read only the columns they need.
+pyarrow is only needed for the Parquet backend.
+
+    python review_storage.py migrate [--reviews-dir DIR] [--cleaned-dir DIR]
+"""
+import argparse # Imports argparse for the migration command.
+import csv # Imports csv to append pages of reviews to a CSV.
+import glob # Imports glob to list stored files.
+import os # Imports os for path handling.
+import re # Imports re to derive product keys and parse file names.
+import shutil # Imports shutil to swap rebuilt Parquet folders.
+from datetime import datetime # Imports datetime for part-file timestamps.
+import pandas as pd # Imports pandas for DataFrames.
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'data')
+REVIEWS_DIR = os.path.join(DATA_DIR, 'reviews') # Raw scraped reviews (CSV backend).
+CLEANED_DIR = os.path.join(DATA_DIR, 'cleaned_dataset') # Cleaned dataset.
+STORAGE_ENV = 'REVIEW_STORAGE' # 'csv' (default) or 'parquet'.
+
+# Raw review CSVs are named "<product>_flipkart_reviews<YYYYmmdd_HHMMSS>.csv"
+# (incremental mode drops the timestamp).
+REVIEW_FILE_PATTERN = re.compile(r'^(?P<product>.*)_flipkart_reviews(?P<timestamp>\d{8}_\d{6})?\.csv$')
+
+def product_key(name):
+    """Partition key for a product name: lower-case, filesystem-safe."""
+    return re.sub(r'[^a-z0-9_-]+', '_', str(name).strip().lower()).strip('_') or 'unknown'
+
+def parse_review_filename(file):
+    """(product name, timestamp or None) of a raw review CSV, or None when it does not follow the pattern."""
+    match = REVIEW_FILE_PATTERN.match(os.path.basename(file))
+    return (match['product'], match['timestamp']) if match else None
+
+def product_for_file(path):
+    """Product key of a raw review file: its product=<key> partition (Parquet), else its file name."""
+    folder = os.path.basename(os.path.dirname(path))
+    if folder.startswith('product='):
+        return folder[len('product='):]
+    # Files not named <product>_flipkart_reviews<timestamp>.csv keep their name as the product.
+    product, _ = parse_review_filename(path) or (os.path.splitext(os.path.basename(path))[0], None)
+    return product_key(product)
+
+def _timestamp():
+    return datetime.now().strftime("%Y%m%d_%H%M%S_%f")
+
+# -------------------- CSV BACKEND --------------------
+
+class CsvStorage:
+    """One CSV per scrape in `reviews_dir`, one cleaned CSV in `cleaned_dir`."""
+    name = 'csv'
+
+    def __init__(self, reviews_dir=REVIEWS_DIR, cleaned_dir=CLEANED_DIR):
+        self.reviews_root = reviews_dir
+        self.cleaned_file = os.path.join(cleaned_dir, 'cleaned_data.csv')
+
+    def write_reviews(self, product, df):
+        os.makedirs(self.reviews_root, exist_ok=True)
+        path = os.path.join(self.reviews_root, f"{product}_flipkart_reviews{datetime.now():%Y%m%d_%H%M%S}.csv")
+        df.to_csv(path, index=False)
+        return path
+
+    def open_review_writer(self, product, path=None):
+        """Writer that appends a scrape's reviews page by page to a new CSV (or `path`)."""
+        os.makedirs(self.reviews_root, exist_ok=True)
+        return CsvReviewWriter(path or os.path.join(self.reviews_root, f"{product}_flipkart_reviews{datetime.now():%Y%m%d_%H%M%S}.csv"))
+
+    def review_files(self, product=None):
+        files = sorted(glob.glob(os.path.join(self.reviews_root, '*.csv')))
+        if product is not None:
+            files = [f for f in files if product_key((parse_review_filename(f) or ('',))[0]) == product_key(product)]
+        return files
+
+    def read_reviews(self, product=None, columns=None):
+        frames = [pd.read_csv(f, dtype=str, usecols=columns) for f in self.review_files(product)]
+        return pd.concat(frames, ignore_index=True) if frames else pd.DataFrame(columns=columns)
+
+    def iter_file_chunks(self, path, chunk_size):
+        return pd.read_csv(path, dtype=str, chunksize=chunk_size)
+
+    def write_cleaned(self, df):
+        os.makedirs(os.path.dirname(self.cleaned_file), exist_ok=True)
+        df.to_csv(self.cleaned_file, index=False)
+        return self.cleaned_file
+
+    def read_cleaned(self, columns=None):
+        return pd.read_csv(self.cleaned_file, usecols=columns)
+
+    def iter_cleaned(self, columns=None, chunk_size=50_000):
+        return pd.read_csv(self.cleaned_file, usecols=columns, chunksize=chunk_size)
+
+class CsvReviewWriter:
+    """Appends pages of review dicts to a CSV, writing the header with the first page."""
+
+    def __init__(self, path):
+        self.path = path
+        self.file = open(path, 'w', newline='', encoding='utf-8')
+        # The csv module is what DataFrame.to_csv uses underneath; same quoting and line endings.
+        self.writer = csv.writer(self.file, lineterminator=os.linesep)
+        self.rows = 0
+
+    def write(self, reviews):
+        if reviews:
+            if self.rows == 0:
+                self.writer.writerow(reviews[0].keys())
+            self.writer.writerows(review.values() for review in reviews)
+            self.file.flush() # Each page is on disk before the next one is fetched.
+            self.rows += len(reviews)
+
+    def close(self):
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+# -------------------- PARQUET BACKEND --------------------
+
+def _require_pyarrow():
+    try:
+        import pyarrow # noqa: F401
+        import pyarrow.dataset # noqa: F401
+        import pyarrow.parquet # noqa: F401
+    except ImportError as e:
+        raise ImportError("The Parquet storage backend needs pyarrow: pip install pyarrow") from e
+    return pyarrow
+
+class ParquetReviewWriter:
+    """Adds pages of review dicts to a Parquet file as row groups; the schema comes from the first page."""
+
+    def __init__(self, pa, path):
+        self.pa = pa
+        self.path = path
+        self.writer = None
+        self.rows = 0
+
+    def write(self, reviews):
+        if not reviews:
+            return
+        table = self.pa.Table.from_pandas(pd.DataFrame(reviews), preserve_index=False)
+        if self.writer is None:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            self.writer = self.pa.parquet.ParquetWriter(self.path, table.schema, compression='zstd')
+        self.writer.write_table(table.cast(self.writer.schema))
+        self.rows += len(reviews)
+
+    def close(self):
+        if self.writer is not None:
+            self.writer.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+class ParquetStorage:
+    """Raw reviews partitioned by product plus a cleaned dataset of part files, all Parquet."""
+    name = 'parquet'
+
+    def __init__(self, reviews_dir=REVIEWS_DIR, cleaned_dir=CLEANED_DIR):
+        self.pa = _require_pyarrow()
+        self.reviews_root = os.path.join(os.path.dirname(os.path.abspath(reviews_dir)), 'reviews_parquet')
+        self.cleaned_root = os.path.join(cleaned_dir, 'cleaned_parquet')
+
+    def _write(self, df, path):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        table = self.pa.Table.from_pandas(df, preserve_index=False)
+        self.pa.parquet.write_table(table, path, compression='zstd')
+        return path
+
+    def _read(self, root, columns=None, filter=None):
+        if not os.path.isdir(root) or not glob.glob(os.path.join(root, '**', '*.parquet'), recursive=True):
+            return pd.DataFrame(columns=columns)
+        dataset = self.pa.dataset.dataset(root, format='parquet', partitioning='hive')
+        return dataset.to_table(columns=columns, filter=filter).to_pandas()
+
+    def partition(self, product):
+        """Folder holding a product's raw review files."""
+        return os.path.join(self.reviews_root, f"product={product_key(product)}")
+
+    def write_reviews(self, product, df, timestamp=None):
+        return self._write(df, os.path.join(self.partition(product), f"{timestamp or _timestamp()}.parquet"))
+
+    def open_review_writer(self, product, path=None):
+        """Writer that adds a scrape's reviews page by page to one Parquet file (a row group per page)."""
+        return ParquetReviewWriter(self.pa, path or os.path.join(self.partition(product), f"{_timestamp()}.parquet"))
+
+    def review_files(self, product=None):
+        pattern = f"product={product_key(product)}" if product is not None else 'product=*'
+        return sorted(glob.glob(os.path.join(self.reviews_root, pattern, '*.parquet')))
+
+    def read_reviews(self, product=None, columns=None):
+        """Load raw reviews; `product` reads a single partition, `columns` only those columns."""
+        ds = self.pa.dataset
+        filter = ds.field('product') == product_key(product) if product is not None else None
+        df = self._read(self.reviews_root, columns, filter)
+        return df.drop(columns=['product']) if columns is None and 'product' in df.columns else df
+
+    def iter_file_chunks(self, path, chunk_size):
+        for batch in self.pa.parquet.ParquetFile(path).iter_batches(batch_size=chunk_size):
+            yield batch.to_pandas()
+
+    def write_cleaned(self, df):
+        """Replace the cleaned dataset with `df` (one part file)."""
+        tmp_root = self.cleaned_root + '.tmp'
+        shutil.rmtree(tmp_root, ignore_errors=True)
+        self._write(df, os.path.join(tmp_root, 'part-00000.parquet'))
+        self.replace_cleaned(tmp_root)
+        return self.cleaned_root
+
+    def append_cleaned(self, df, root=None):
+        """Add `df` to the cleaned dataset as a new part file."""
+        return self._write(df, os.path.join(root or self.cleaned_root, f"part-{_timestamp()}.parquet"))
+
+    def replace_cleaned(self, new_root):
+        """Swap a fully written cleaned dataset folder into place."""
+        shutil.rmtree(self.cleaned_root, ignore_errors=True)
+        os.replace(new_root, self.cleaned_root)
+
+    def read_cleaned(self, columns=None):
+        return self._read(self.cleaned_root, columns)
+
+    def iter_cleaned(self, columns=None, chunk_size=50_000):
+        for path in sorted(glob.glob(os.path.join(self.cleaned_root, '*.parquet'))):
+            for batch in self.pa.parquet.ParquetFile(path).iter_batches(batch_size=chunk_size, columns=columns):
+                yield batch.to_pandas()
+
+# -------------------- SELECTION AND MIGRATION --------------------
+
+BACKENDS = {'csv': CsvStorage, 'parquet': ParquetStorage}
+
+def get_storage(name=None, reviews_dir=REVIEWS_DIR, cleaned_dir=CLEANED_DIR):
+    """Storage backend by name, defaulting to the REVIEW_STORAGE environment variable (or 'csv')."""
+    name = name or os.environ.get(STORAGE_ENV, 'csv')
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown storage backend {name!r}; choose one of {sorted(BACKENDS)}")
+    return BACKENDS[name](reviews_dir, cleaned_dir)
+
+def migrate_csv_to_parquet(reviews_dir=REVIEWS_DIR, cleaned_dir=CLEANED_DIR):
+    """Copy every raw review CSV and the cleaned CSV into the Parquet backend. Returns files written."""
+    source = CsvStorage(reviews_dir, cleaned_dir)
+    target = ParquetStorage(reviews_dir, cleaned_dir)
+    written = 0
+    for path in source.review_files():
+        # Files not named <product>_flipkart_reviews<timestamp>.csv keep their name as the product.
+        product, timestamp = parse_review_filename(path) or (os.path.splitext(os.path.basename(path))[0], None)
+        target.write_reviews(product, pd.read_csv(path, dtype=str), timestamp or 'incremental')
+        written += 1
+    if os.path.exists(source.cleaned_file):
+        target.write_cleaned(pd.read_csv(source.cleaned_file))
+        written += 1
+    print(f"✅ Migrated {written} files to {target.reviews_root} and {target.cleaned_root}")
+    return written
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Review storage utilities.")
+    parser.add_argument('command', choices=['migrate'], help="migrate: copy the CSV data into the Parquet backend")
+    parser.add_argument('--reviews-dir', default=REVIEWS_DIR)
+    parser.add_argument('--cleaned-dir', default=CLEANED_DIR)
+    args = parser.parse_args()
+    migrate_csv_to_parquet(args.reviews_dir, args.cleaned_dir)
@@ -0,0 +1,64 @@
+import hashlib # Imports hashlib to fingerprint review contents.
+import json # Imports json to persist the watermark.
+import os # Imports os for file handling.
+
+# Fields that identify a review. Helpful_Votes keeps changing after a review is
+# posted, so it is left out; otherwise every re-scrape would look like a new review.
+FINGERPRINT_FIELDS = ('Name', 'Rating', 'Title', 'Description', 'Date')
+
+def review_fingerprint(review):
+    """Content hash of a scraped review dict (16 hex chars)."""
+    key = '\x1f'.join(str(review.get(field, '')) for field in FINGERPRINT_FIELDS)
+    return hashlib.sha1(key.encode('utf-8')).hexdigest()[:16]
+
+def is_complete(review):
+    """Reviews with any missing ('N/A') field are dropped before saving, so they never count."""
+    return all(value != 'N/A' for value in review.values())
+
+class ReviewWatermark:
+    """Set of fingerprints of the reviews already stored for one product, kept in a JSON file."""
+
+    def __init__(self, path):
+        self.path = path
+        self.known = set()
+        if os.path.exists(path):
+            with open(path, encoding='utf-8') as f:
+                self.known = set(json.load(f)['fingerprints'])
+
+    @classmethod
+    def for_product(cls, directory, product_key):
+        return cls(os.path.join(directory, f"{product_key}.json"))
+
+    def is_known(self, review):
+        return review_fingerprint(review) in self.known
+
+    def page_is_known(self, page_reviews):
+        """True when a page has complete reviews and all of them are already stored.
+
+        Pages without any complete review (Flipkart sometimes renders empty review
+        containers) say nothing about what is new, so they never end the scrape.
+        """
+        complete = [review for review in page_reviews if is_complete(review)]
+        return bool(complete) and all(self.is_known(review) for review in complete)
+
+    def new_reviews(self, reviews):
+        """The reviews not stored yet, without duplicates, in their original order."""
+        seen = set(self.known)
+        fresh = []
+        for review in reviews:
+            fingerprint = review_fingerprint(review)
+            if fingerprint not in seen:
+                seen.add(fingerprint)
+                fresh.append(review)
+        return fresh
+
+    def add(self, reviews):
+        self.known.update(review_fingerprint(review) for review in reviews)
+
+    def save(self):
+        """Write the watermark atomically so an interrupted run never corrupts it."""
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'fingerprints': sorted(self.known)}, f)
+        os.replace(tmp_path, self.path)
@@ -0,0 +1,103 @@
+"""Equivalence of the batched preprocessing with the original combine_preprocess_reviews code.
+
+The reference below is a frozen copy of the baseline clean_text/preprocess_text, so
+the refactored shared code (nlp_resources, text_normalizer) is checked against what
+the dataset used to be built with, not against itself. The NLTK corpora are stubbed
+so the test runs offline; both sides use the same stubs.
+
+    python -m pytest -q test_text_normalizer.py
+"""
+import glob # Imports glob to find the bundled review CSVs.
+import os # Imports os for the dataset path.
+import re # Imports re for the frozen baseline cleaning.
+
+import emoji # Imports emoji for the frozen baseline cleaning.
+import pandas as pd # Imports pandas to load the dataset.
+import pytest # Imports pytest for fixtures and parametrisation.
+
+import combine_preprocess_reviews # Imports the per-text dataset preprocessing.
+import nlp_resources # Imports the shared NLP resources, stubbed below.
+import text_normalizer # Imports the batched preprocessing under test.
+
+REVIEWS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'data', 'reviews')
+
+# A slice of NLTK's English stopwords and a suffix-stripping stand-in for WordNet.
+STOP_WORDS = frozenset(['i', 'me', 'my', 'the', 'a', 'an', 'is', 'it', 'this', 'and', 'to', 'of', 'very', 'for',
+                        'with', 'not', 'in', 'on', 'was', 'but', 'so', 'more', 'read'])
+
+class StubLemmatizer:
+    def lemmatize(self, word):
+        return word[:-1] if word.endswith('s') and len(word) > 3 else word
+
+EDGE_CASES = [
+    'Great phone READ MORE',
+    'Great READ <b>MORE</b> phone', # Removing the tag joins "READ MORE" only after it was already looked for.
+    'read more...READ MORE',
+    '<p>Battery</p> lasts <i>two</i> days',
+    'Awesome 😍🔥 camera 👍',
+    'Camera 👨‍👩‍👧 is superb',
+    'Très bon téléphone, qualité supérieure',
+    'बहुत अच्छा product hai',
+    '...Nice display...',
+    '.. . dots only . ..',
+    '   Spaces\tand\nnewlines   everywhere  ',
+    'Value for money!!! Good, fast, reliable?',
+    'THE PHONE IS VERY GOOD',
+    'ok',
+    '',
+    None,
+    float('nan'),
+]
+
+# -------------------- FROZEN BASELINE --------------------
+
+def baseline_clean_text(text):
+    if pd.isnull(text):
+        return ""
+    text = text.lower()
+    text = emoji.replace_emoji(str(text), replace='')
+    text = re.sub(r'READ MORE', '', text, flags=re.IGNORECASE)
+    text = re.sub(r'<[^>]+>', '', text)
+    text = re.sub(r'[^a-zA-Z0-9\s.,!?]', '', text)  # Remove all odd characters
+    text = ' '.join(text.split())  # Normalize whitespace
+    return text.strip().strip('.')  # Remove trailing dots
+
+def baseline_preprocess_text(text):
+    lemmatizer = StubLemmatizer()
+    text = baseline_clean_text(text)
+    words = [lemmatizer.lemmatize(w) for w in text.split() if w.lower() not in STOP_WORDS]
+    return ' '.join(words)
+
+# -------------------- TESTS --------------------
+
+@pytest.fixture(autouse=True)
+def stub_nltk(monkeypatch):
+    monkeypatch.setattr(nlp_resources, 'get_stop_words', lambda: STOP_WORDS)
+    monkeypatch.setattr(nlp_resources, 'get_lemmatizer', StubLemmatizer)
+    nlp_resources.normalize_token.cache_clear() # Drops lemmas of the real (or another stubbed) corpus.
+    yield
+    nlp_resources.normalize_token.cache_clear()
+
+def bundled_descriptions():
+    files = sorted(glob.glob(os.path.join(REVIEWS_DIR, '*.csv')))
+    if not files:
+        pytest.skip(f"no review CSVs in {REVIEWS_DIR}")
+    return pd.concat([pd.read_csv(file)['Description'] for file in files], ignore_index=True)
+
+@pytest.mark.parametrize('text', EDGE_CASES)
+def test_edge_cases_match_baseline(text):
+    expected = baseline_preprocess_text(text)
+    assert text_normalizer.preprocess_series([text]).tolist() == [expected]
+    assert combine_preprocess_reviews.preprocess_text(text) == expected
+
+def test_edge_cases_match_baseline_as_one_series():
+    expected = [baseline_preprocess_text(text) for text in EDGE_CASES]
+    assert text_normalizer.preprocess_series(pd.Series(EDGE_CASES, dtype=object)).tolist() == expected
+
+def test_bundled_dataset_matches_baseline():
+    descriptions = bundled_descriptions()
+    expected = descriptions.map(baseline_preprocess_text)
+    actual = text_normalizer.preprocess_series(descriptions)
+    mismatches = [(text, want, got) for text, want, got in zip(descriptions, expected, actual) if want != got]
+    assert not mismatches, f"{len(mismatches)} of {len(descriptions)} rows differ, e.g. {mismatches[:3]}"
+    assert [combine_preprocess_reviews.preprocess_text(text) for text in descriptions] == expected.tolist()
@@ -0,0 +1,77 @@
+import re # Imports re for the whitespace pattern.
+from concurrent.futures import ProcessPoolExecutor # Imports the process pool used for sharded preprocessing.
+import emoji # Imports emoji for emoji removal.
+import pandas as pd # Imports pandas for vectorised string operations.
+import nlp_resources # Imports the shared NLP resources (loaded once per worker process).
+from nlp_resources import CLEAN_PATTERN, normalize_token # Imports the shared cleaning pattern and cached token normaliser.
+
+# Batched version of combine_preprocess_reviews.preprocess_text. It produces exactly
+# the same strings, but cleans a whole Series with a handful of vectorised passes and
+# lemmatizes through a token cache, since review vocabulary is highly repetitive.
+
+NON_ASCII_PATTERN = r'[^\x00-\x7f]' # Every emoji contains a non-ASCII character.
+WHITESPACE_PATTERN = re.compile(r'\s+')
+
+def clean_series(texts):
+    """Vectorised clean_text over a Series of review texts."""
+    texts = texts.where(texts.notna(), '').astype(str).str.lower() # Missing text becomes "".
+    # emoji.replace_emoji is the slow part and can only change rows with non-ASCII characters.
+    has_emoji = texts.str.contains(NON_ASCII_PATTERN, regex=True)
+    if has_emoji.any():
+        texts = texts.copy()
+        texts[has_emoji] = texts[has_emoji].map(lambda text: emoji.replace_emoji(text, replace=''))
+    texts = texts.str.replace(CLEAN_PATTERN, '', regex=True) # READ MORE, HTML tags and odd characters.
+    texts = texts.str.replace(WHITESPACE_PATTERN, ' ', regex=True).str.strip() # Normalize whitespace.
+    return texts.str.strip('.') # Remove trailing dots.
+
+def lemmatize_series(cleaned):
+    """Remove stopwords and lemmatize a Series of cleaned texts through the token cache."""
+    return cleaned.map(lambda text: ' '.join(filter(None, map(normalize_token, text.split()))))
+
+def preprocess_series(texts):
+    """Clean + remove stopwords + lemmatize a whole Series of review texts."""
+    return lemmatize_series(clean_series(pd.Series(texts)))
+
+# -------------------- MULTIPROCESS SHARDING --------------------
+
+DEFAULT_CHUNK_SIZE = 10_000 # Rows per shard sent to a worker.
+
+def _init_worker(offline):
+    """Process pool initializer: load stopwords and WordNet once per worker."""
+    nlp_resources.set_offline(offline)
+    nlp_resources.load()
+
+def _preprocess_chunk(texts):
+    return preprocess_series(texts)
+
+def create_pool(workers):
+    """Process pool whose workers load the NLP resources once, for reuse across calls."""
+    return ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                               initargs=(nlp_resources.is_offline(),))
+
+def iter_preprocess_parallel(texts, workers, chunk_size=DEFAULT_CHUNK_SIZE, pool=None):
+    """Preprocess `texts` in shards of `chunk_size` rows on `workers` processes.
+
+    Yields the preprocessed shards (Series with the original index) in input order as
+    soon as each is ready, so callers can write results while later shards are still
+    being processed. Pass `pool` (see create_pool) to reuse workers across calls.
+    """
+    texts = pd.Series(texts)
+    chunks = (texts.iloc[start:start + chunk_size] for start in range(0, len(texts), chunk_size))
+    if pool is not None:
+        yield from pool.map(_preprocess_chunk, chunks)
+        return
+    with create_pool(workers) as pool:
+        # map() submits every shard up front and yields the results in submission order.
+        yield from pool.map(_preprocess_chunk, chunks)
+
+def preprocess_parallel(texts, workers, chunk_size=DEFAULT_CHUNK_SIZE, pool=None):
+    """preprocess_series on `workers` processes; workers <= 1 runs in this process."""
+    if workers <= 1 or (pool is None and len(texts) <= chunk_size): # Not worth starting a pool.
+        return preprocess_series(texts)
+    shards = list(iter_preprocess_parallel(texts, workers, chunk_size, pool))
+    return pd.concat(shards) if shards else pd.Series(texts, dtype=object)
+
+def cache_info():
+    """Hit/miss statistics of the lemma cache."""
+    return normalize_token.cache_info()